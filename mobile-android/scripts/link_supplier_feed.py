@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+Supplier Feed Linkage Script
+
+Matches the rows of a distributor price list / supplier feed against the
+existing equipment catalog without appending it and re-running the full
+self-dedup.
+
+This script:
+1. Indexes equipments.csv once with the catalog scripts' normalization
+2. Streams the feed, looking each row up by exact normalized key, then by
+   fuzzy match within the same (equipment type, manufacturer) block; a
+   manufacturer spelling with no match there (e.g. "SMA Inc.") is scored
+   against the whole equipment type instead and never auto-matched
+3. Writes every feed row back out as MATCHED / AMBIGUOUS / NEW with the
+   matched catalog ID and UUID
+
+Cost grows with the feed size; most fuzzy lookups only score one
+manufacturer's models, never the whole catalog. With --store the catalog
+is not loaded at all: blocks are queried from the SQLite catalog store
+(catalog_store.py) as the feed needs them.
+
+Usage:
+    python link_supplier_feed.py feed.csv [-o feed_linkage.csv] [--threshold 90] [--store]
+"""
+
+import argparse
+import csv
+import re
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+from pathlib import Path
+
+from normalize_equipment_catalog import (
+    create_comparison_key,
+    fuzz,
+    load_records,
+    normalize_manufacturer,
+    normalize_model,
+    process,
+    require_rapidfuzz,
+)
+
+DEFAULT_REVIEW_FLOOR = 80
+# A runner-up within this many points of the best match makes the row ambiguous
+DEFAULT_MARGIN = 2.0
+MAX_CANDIDATES = 3
+
+LINK_FIELDS = [
+    'link_status', 'confidence', 'catalog_id', 'catalog_uuid', 'catalog_equipment_type',
+    'catalog_manufacturer', 'catalog_model', 'candidates'
+]
+
+
+def _compact(value: str) -> str:
+    return re.sub(r'[^a-z0-9]', '', value.lower())
+
+
+def _key_tokens(key: str) -> str:
+    """Comparison key with manufacturer and model as separate tokens ("SMA INC|SB7.7" -> "SMA INC SB7.7")."""
+    return key.replace('|', ' ')
+
+
+class CatalogIndex:
+    """
+    Catalog records by normalized key, blocked by (equipment type, manufacturer).
+
+    A block with manufacturer None holds every manufacturer of the type; it is
+    the fallback for manufacturer spellings that normalize to no known block.
+    Its keys are stored tokenized (_key_tokens), so lookups score them as they are.
+    """
+
+    def __init__(self, records: List[Dict]):
+        # (equipment type or None, normalized manufacturer or None) -> {comparison key: canonical record}
+        # (tokenized comparison key when the manufacturer is None)
+        self.blocks = defaultdict(dict)
+        # compact spelling -> catalog spelling, e.g. "microinverter" -> "MicroInverter"
+        self.types = {}
+
+        # Lowest ID first, so the canonical record wins every key collision
+        for record in sorted(records, key=lambda r: int(r['id'])):
+            equipment_type = record.get('equipment_type', '')
+            manufacturer = normalize_manufacturer(record['manufacturer'])
+            key = create_comparison_key(manufacturer, normalize_model(record['model']))
+            tokens = _key_tokens(key)
+            self.types.setdefault(_compact(equipment_type), equipment_type)
+            self.blocks[(equipment_type, manufacturer)].setdefault(key, record)
+            self.blocks[(None, manufacturer)].setdefault(key, record)
+            self.blocks[(equipment_type, None)].setdefault(tokens, record)
+            self.blocks[(None, None)].setdefault(tokens, record)
+
+        # Keys per block as lists for rapidfuzz (built once, reused for every lookup)
+        self.block_keys = {block: list(keys) for block, keys in self.blocks.items()}
+
+    def block(self, block: Tuple[Optional[str], Optional[str]]) -> Tuple[Dict[str, Dict], List[str]]:
+        """({comparison key: canonical record}, keys) of one (type, normalized manufacturer) block.
+
+        Keys of a manufacturer None block are tokenized (see _key_tokens).
+        """
+        return self.blocks.get(block, {}), self.block_keys.get(block, [])
+
+    def equipment_type(self, value: str) -> Optional[str]:
+        """Catalog spelling of a feed's equipment type, or None if blank / unknown."""
+        return self.types.get(_compact(value or '')) if value else None
+
+    def lookup(self, equipment_type: Optional[str], manufacturer: str, model: str,
+               threshold: float, review_floor: float,
+               margin: float = DEFAULT_MARGIN) -> Tuple[str, Optional[Dict], float, List[Tuple[Dict, float]]]:
+        """
+        Link one feed row.
+
+        When the manufacturer's block has nothing within review_floor (or the
+        manufacturer normalizes to no block at all), the row is scored against
+        every manufacturer of the type, comparing the manufacturer fuzzily as
+        part of the key. Those links are at best AMBIGUOUS.
+
+        Args:
+            equipment_type: Catalog equipment type, or None to search every type
+            manufacturer: Feed manufacturer (raw)
+            model: Feed model (raw)
+            threshold: Fuzzy score needed for a MATCHED link (0-100)
+            review_floor: Lowest fuzzy score reported as AMBIGUOUS
+            margin: Runner-up distance below which a match is AMBIGUOUS
+
+        Returns:
+            Tuple of (status, best catalog record, confidence, candidates)
+        """
+        normalized_manufacturer = normalize_manufacturer(manufacturer)
+        key = create_comparison_key(normalized_manufacturer, normalize_model(model))
+        block = (equipment_type, normalized_manufacturer)
+
+        records, keys = self.block(block)
+        exact = records.get(key)
+        if exact is not None:
+            return 'MATCHED', exact, 100.0, [(exact, 100.0)]
+
+        candidates = self._candidates(key, records, keys, review_floor)
+        if not candidates:
+            records, keys = self.block((equipment_type, None))
+            # Tokenized so extra manufacturer words ("INC") don't shift the model
+            candidates = self._candidates(_key_tokens(key), records, keys, review_floor)
+            if not candidates:
+                return 'NEW', None, 0.0, []
+            best, confidence = candidates[0]
+            return 'AMBIGUOUS', best, confidence, candidates
+
+        best, confidence = candidates[0]
+
+        if confidence < threshold:
+            return 'AMBIGUOUS', best, confidence, candidates
+        if len(candidates) > 1 and candidates[1][1] >= confidence - margin:
+            return 'AMBIGUOUS', best, confidence, candidates
+        return 'MATCHED', best, confidence, candidates
+
+    @staticmethod
+    def _candidates(key: str, records: Dict[str, Dict], keys: List[str],
+                    review_floor: float) -> List[Tuple[Dict, float]]:
+        """
+        Best (record, similarity) pairs at or above review_floor, best first.
+
+        Keys are scored as they are: processor=None is passed explicitly
+        because rapidfuzz < 3 applies default_process in process.* otherwise.
+        """
+        if not keys:
+            return []
+        matches = process.extract(
+            key, keys,
+            scorer=fuzz.token_sort_ratio,
+            processor=None,
+            score_cutoff=review_floor,
+            limit=MAX_CANDIDATES,
+        )
+        return [(records[choice], similarity) for choice, similarity, _ in matches]
+
+
+class StoreCatalogIndex(CatalogIndex):
+    """CatalogIndex backed by the SQLite catalog store; blocks are queried on first use."""
+
+    def __init__(self, store):
+        self.store = store
+        self.blocks = {}
+        self.block_keys = {}
+        self.types = {_compact(t): t for t in store.equipment_types()}
+
+    def block(self, block: Tuple[Optional[str], Optional[str]]) -> Tuple[Dict[str, Dict], List[str]]:
+        if block not in self.blocks:
+            equipment_type, manufacturer = block
+            records = {}
+            # Rows come back in ID order, so the canonical record wins every key collision
+            for key, record in self.store.block(equipment_type, manufacturer):
+                records.setdefault(key if manufacturer is not None else _key_tokens(key), record)
+            self.blocks[block] = records
+            self.block_keys[block] = list(records)
+        return self.blocks[block], self.block_keys[block]
+
+
+def link_feed(index: CatalogIndex, feed_file: str, output_file: str, threshold: float = 90,
+              review_floor: float = DEFAULT_REVIEW_FLOOR, manufacturer_column: str = 'manufacturer',
+              model_column: str = 'model', type_column: str = 'equipment_type') -> Dict[str, int]:
+    """
+    Stream a supplier feed against the catalog index, writing one output row per feed row.
+
+    Returns:
+        Dict mapping link status to row count
+    """
+    counts = defaultdict(int)
+
+    with open(feed_file, 'r', encoding='utf-8-sig', newline='') as src, \
+            open(output_file, 'w', encoding='utf-8', newline='') as dst:
+        reader = csv.DictReader(src)
+        feed_fields = reader.fieldnames or []
+        for column in (manufacturer_column, model_column):
+            if column not in feed_fields:
+                raise ValueError(f"Feed has no '{column}' column (columns: {', '.join(feed_fields)})")
+
+        writer = csv.DictWriter(dst, fieldnames=feed_fields + LINK_FIELDS)
+        writer.writeheader()
+
+        for row in reader:
+            raw_type = row.get(type_column, '') if type_column in feed_fields else ''
+            equipment_type = index.equipment_type(raw_type)
+
+            if raw_type and equipment_type is None:
+                # A type the catalog has never seen can't link to anything in it
+                status, best, confidence, candidates = 'NEW', None, 0.0, []
+            else:
+                status, best, confidence, candidates = index.lookup(
+                    equipment_type, row[manufacturer_column] or '', row[model_column] or '',
+                    threshold, review_floor)
+
+            row.update({
+                'link_status': status,
+                'confidence': f"{confidence:.1f}" if best else '',
+                'catalog_id': best['id'] if best else '',
+                'catalog_uuid': best['uuid'] if best else '',
+                'catalog_equipment_type': best['equipment_type'] if best else '',
+                'catalog_manufacturer': best['manufacturer'] if best else '',
+                'catalog_model': best['model'] if best else '',
+                'candidates': '; '.join(
+                    f"{record['id']} {record['model']} ({similarity:.1f}%)"
+                    for record, similarity in candidates
+                ) if status == 'AMBIGUOUS' else '',
+            })
+            writer.writerow(row)
+            counts[status] += 1
+
+    return counts
+
+
+def main():
+    """Main execution function."""
+    # Set up paths
+    script_dir = Path(__file__).parent.parent
+    catalog_file = script_dir / "src" / "constants" / "equipments.csv"
+
+    parser = argparse.ArgumentParser(description="Match a supplier feed against the equipment catalog")
+    parser.add_argument('feed', type=Path, help="supplier feed CSV")
+    parser.add_argument('-o', '--output', type=Path,
+                        help="output CSV (default: <feed>_linkage.csv next to the feed)")
+    parser.add_argument('--catalog', type=Path, default=catalog_file,
+                        help="catalog CSV (default: src/constants/equipments.csv)")
+    parser.add_argument('--threshold', type=float, default=90,
+                        help="similarity needed for MATCHED (default: 90)")
+    parser.add_argument('--review-floor', type=float, default=DEFAULT_REVIEW_FLOOR,
+                        help=f"lowest similarity reported as AMBIGUOUS (default: {DEFAULT_REVIEW_FLOOR})")
+    parser.add_argument('--manufacturer-column', default='manufacturer')
+    parser.add_argument('--model-column', default='model')
+    parser.add_argument('--type-column', default='equipment_type',
+                        help="equipment type column; rows without one search every type")
+    parser.add_argument('--store', type=Path, nargs='?', const=script_dir / "catalog.sqlite",
+                        help="query the SQLite catalog store instead of loading the CSV (default: catalog.sqlite)")
+    args = parser.parse_args()
+    require_rapidfuzz()
+
+    for path in (args.catalog, args.feed):
+        if not path.exists():
+            print(f"Error: Input file not found: {path}")
+            sys.exit(1)
+    output_file = args.output or args.feed.with_name(f"{args.feed.stem}_linkage.csv")
+
+    print(f"Linking supplier feed: {args.feed}")
+    print("=" * 80)
+
+    start = time.time()
+    if args.store:
+        from catalog_store import open_store
+        store = open_store(args.store, args.catalog, args.catalog.with_name("batteryModelsData.json"))
+        index = StoreCatalogIndex(store)
+        print(f"Using catalog store {args.store}")
+    else:
+        store = None
+        index = CatalogIndex(load_records(str(args.catalog)))
+        print(f"Indexed catalog {args.catalog} ({len(index.blocks)} blocks) in {time.time() - start:.1f}s")
+
+    start = time.time()
+    try:
+        counts = link_feed(index, str(args.feed), str(output_file), args.threshold, args.review_floor,
+                           args.manufacturer_column, args.model_column, args.type_column)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    finally:
+        if store is not None:
+            store.close()
+    elapsed = time.time() - start
+    total = sum(counts.values())
+
+    # Print summary
+    print("\n" + "=" * 80)
+    print("SUMMARY")
+    print("=" * 80)
+    print(f"Feed rows linked: {total} ({total / max(elapsed, 1e-9):,.0f} rows/s)")
+    print(f"  - MATCHED (already in catalog): {counts['MATCHED']}")
+    print(f"  - AMBIGUOUS (review): {counts['AMBIGUOUS']}")
+    print(f"  - NEW (not in catalog): {counts['NEW']}")
+    print("\nOutput file:")
+    print(f"  - {output_file}")
+    print("\nReview AMBIGUOUS rows before importing the feed!")
+
+
+if __name__ == "__main__":
+    main()
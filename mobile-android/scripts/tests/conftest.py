@@ -0,0 +1,31 @@
+import csv
+import sys
+from pathlib import Path
+
+import pytest
+
+# The catalog scripts are flat modules that import each other by name
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+CATALOG_HEADER = ["id", "model", "status", "manufacturer", "equipment_type", "uuid", "created_at", "is_validated"]
+
+
+def catalog_row(row_id, manufacturer, model, equipment_type="Solar Panel", uuid=None):
+    return {
+        "id": str(row_id), "model": model, "status": "NULL", "manufacturer": manufacturer,
+        "equipment_type": equipment_type, "uuid": uuid or f"00000000-0000-0000-0000-{int(row_id):012d}",
+        "created_at": "2024-08-12 14:33:46.20281+00", "is_validated": "False",
+    }
+
+
+@pytest.fixture
+def write_catalog(tmp_path):
+    """Write catalog rows to equipments.csv in tmp_path and return its path."""
+    def write(rows, name="equipments.csv"):
+        path = tmp_path / name
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=CATALOG_HEADER)
+            writer.writeheader()
+            writer.writerows(rows)
+        return path
+    return write
@@ -0,0 +1,74 @@
+import json
+
+import pytest
+
+import normalize_equipment_catalog as nec
+from conftest import catalog_row
+
+# Distinct models plus respelled copies, so some rows are marked as duplicates and later skipped
+MODELS = [f"{chr(65 + i % 26)}{i * 7919 % 10007}-{i * 31 % 97}" for i in range(60)]
+RECORDS = (
+    [catalog_row(i + 1, "Qcells", model) for i, model in enumerate(MODELS)]
+    + [catalog_row(200 + i, "Q CELLS", model.lower()) for i, model in enumerate(MODELS[::6])]
+    + [catalog_row(300 + i, "SMA", f"SB{i}.0-1SP-US-{i * 13}", "Inverter") for i in range(20)]
+)
+
+
+class Killed(Exception):
+    pass
+
+
+def test_matches_without_checkpoints(tmp_path):
+    assert nec.find_duplicates(RECORDS, 90, work_dir=tmp_path / "work", block_size=7) == \
+        nec.find_duplicates(RECORDS, 90)
+
+
+def test_resumes_after_interruption(tmp_path, monkeypatch):
+    expected = nec.find_duplicates(RECORDS, 90)
+    work_dir = tmp_path / "work"
+
+    real_row_matches = nec.row_matches
+    calls = []
+    def counting_row_matches(keys, i, score_cutoff, kill_at=None):
+        calls.append(i)
+        if len(calls) == kill_at:
+            raise Killed()
+        return real_row_matches(keys, i, score_cutoff)
+
+    monkeypatch.setattr(nec, "row_matches", lambda *args: counting_row_matches(*args, kill_at=25))
+    with pytest.raises(Killed):
+        nec.find_duplicates(RECORDS, 90, work_dir=work_dir, block_size=5)
+    first_run = len(calls) - 1
+
+    calls.clear()
+    monkeypatch.setattr(nec, "row_matches", counting_row_matches)
+    assert nec.find_duplicates(RECORDS, 90, work_dir=work_dir, block_size=5) == expected
+
+    # Every row not marked as a duplicate is scored once, except the interrupted block's
+    assert len(RECORDS) - len(expected) <= first_run + len(calls) < len(RECORDS) - len(expected) + 5
+    states = [json.loads(p.read_text()) for p in work_dir.glob("*.json")]
+    assert len(states) == 2 and all(state["complete"] for state in states)
+
+
+def test_checkpoint_for_other_threshold_is_ignored(tmp_path):
+    work_dir = tmp_path / "work"
+    nec.find_duplicates(RECORDS, 95, work_dir=work_dir)
+    assert nec.find_duplicates(RECORDS, 85, work_dir=work_dir) == nec.find_duplicates(RECORDS, 85)
+
+
+def test_progress_rate_counts_scored_pairs_only(capsys):
+    progress = nec.DedupProgress(total_pairs=1_000_000, interval=0)
+    progress.start -= 10
+    # 100 rows passed, but only 1,000 of their 50,000 pairs were scored
+    progress.advance(100, 50_000, 1_000)
+    progress.report("Solar Panel", 100, 1000)
+    # 950,000 pairs left at 100 scored pairs/s
+    assert "ETA 2h38m" in capsys.readouterr().out
+
+
+def test_row_matches_scores_keys_unprocessed():
+    fuzz = nec.fuzz
+    keys = ["QCELLS|Q.PEAK DUO-400", "QCELLS|QPEAK DUO 400", "QCELLS|Q.PEAK DUO-400", "SMA|SB7.7"]
+    expected = [(j, fuzz.token_sort_ratio(keys[0], keys[j])) for j in range(1, 4)
+                if fuzz.token_sort_ratio(keys[0], keys[j]) >= 50]
+    assert nec.row_matches(keys, 0, 50) == expected
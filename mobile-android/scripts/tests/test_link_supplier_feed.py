@@ -0,0 +1,92 @@
+import csv
+
+import pytest
+
+import link_supplier_feed
+from catalog_store import open_store
+from conftest import catalog_row
+from link_supplier_feed import CatalogIndex, StoreCatalogIndex, link_feed
+from normalize_equipment_catalog import load_records
+
+CATALOG = [
+    catalog_row(809, "Ablytek", "6MN6A275"),
+    catalog_row(811, "Ablytek", "6MN6A270"),
+    catalog_row(900, "SMA", "SB7.7-1SP-US-41", "Inverter"),
+    catalog_row(901, "SMA", "SB7.7-1SP-US-41", "Inverter"),
+    catalog_row(902, "Enphase", "IQ8PLUS-72-2-US", "MicroInverter"),
+]
+
+
+@pytest.fixture(params=["csv", "store"])
+def index(request, write_catalog, tmp_path):
+    catalog = write_catalog(CATALOG)
+    if request.param == "csv":
+        yield CatalogIndex(load_records(str(catalog)))
+    else:
+        store = open_store(tmp_path / "catalog.sqlite", catalog, tmp_path / "batteryModelsData.json")
+        yield StoreCatalogIndex(store)
+        store.close()
+
+
+def test_exact_key_matches_canonical_record(index):
+    status, best, confidence, _ = index.lookup("Inverter", "sma", "sb7.7-1sp-us-41", 90, 80)
+    assert (status, best["id"], confidence) == ("MATCHED", "900", 100.0)
+
+
+def test_fuzzy_match_within_manufacturer_block(index):
+    status, best, confidence, _ = index.lookup("MicroInverter", "Enphase", "IQ8PLUS722US", 80, 70)
+    assert status == "MATCHED" and best["id"] == "902"
+
+
+@pytest.mark.parametrize("manufacturer, model, expected_id", [
+    ("Ablytek Inc.", "6MN6A275", "809"),
+    ("SMA Inc.", "SB7.7-1SP-US-41", "900"),
+])
+def test_unmapped_manufacturer_spelling_falls_back_to_type_block(index, manufacturer, model, expected_id):
+    equipment_type = "Solar Panel" if expected_id == "809" else "Inverter"
+    status, best, confidence, candidates = index.lookup(equipment_type, manufacturer, model, 80, 80)
+    # Scored well above the MATCHED threshold, but never trusted without the manufacturer block
+    assert status == "AMBIGUOUS"
+    assert best["id"] == expected_id
+    assert confidence >= 80
+    assert candidates[0][0]["id"] == expected_id
+
+
+def test_type_block_keys_are_tokenized_once(index, monkeypatch):
+    records, keys = index.block(("Inverter", None))
+    assert keys == ["SMA SB7.7-1SP-US-41"] and records[keys[0]]["id"] == "900"
+
+    processors = []
+    extract = link_supplier_feed.process.extract
+
+    def recording_extract(*args, **kwargs):
+        processors.append(kwargs["processor"])
+        return extract(*args, **kwargs)
+
+    monkeypatch.setattr(link_supplier_feed.process, "extract", recording_extract)
+    assert index.lookup("Inverter", "SMA Inc.", "SB7.7-1SP-US-41", 80, 80)[0] == "AMBIGUOUS"
+    # Neither the manufacturer block nor the type-wide fallback re-processes keys per lookup
+    assert processors and set(processors) == {None}
+
+
+def test_unrelated_row_is_new(index):
+    assert index.lookup("Solar Panel", "Ablytek Inc.", "ZZZ-999", 90, 80)[0] == "NEW"
+
+
+def test_link_feed_writes_status_per_row(index, tmp_path):
+    feed = tmp_path / "feed.csv"
+    feed.write_text(
+        "manufacturer,model,equipment_type,price\n"
+        "SMA,SB7.7-1SP-US-41,Inverter,1200\n"
+        "SMA Inc.,SB7.7-1SP-US-41,inverter,1190\n"
+        "Acme,QQ-1,Battery,10\n",
+        encoding="utf-8")
+    output = tmp_path / "out.csv"
+
+    counts = link_feed(index, str(feed), str(output))
+
+    with open(output, encoding="utf-8", newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert [row["link_status"] for row in rows] == ["MATCHED", "AMBIGUOUS", "NEW"]
+    assert rows[1]["catalog_id"] == "900" and rows[1]["price"] == "1190"
+    assert dict(counts) == {"MATCHED": 1, "AMBIGUOUS": 1, "NEW": 1}
@@ -0,0 +1,92 @@
+import csv
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+
+from conftest import catalog_row
+from normalize_equipment_catalog import build_suggested_changes, load_catalog, write_suggested_changes
+from validate_catalog import CatalogValidator, validate_records
+
+TYPES_FILE = Path(__file__).resolve().parents[2] / "src" / "constants" / "equipmentTypes.ts"
+
+BATTERY_UUID = "a527fc65-0800-4e04-97f5-c00f563dd124"
+BATTERIES = {"BYD": [{
+    "id": 357, "model": "Battery-BOX H 5.0", "model_number": "Battery-BOX H 5.0",
+    "make_model": "BYD Battery-BOX H 5.0", "manufacturer": "BYD", "equipment_type": "Battery",
+    "uuid": BATTERY_UUID,
+}]}
+
+
+@pytest.fixture
+def constants(tmp_path):
+    shutil.copy(TYPES_FILE, tmp_path)
+    (tmp_path / "batteryModelsData.json").write_text(json.dumps(BATTERIES), encoding="utf-8")
+    return tmp_path
+
+
+@pytest.fixture
+def validator(constants):
+    return CatalogValidator.from_files(constants / "equipmentTypes.ts", constants / "batteryModelsData.json")
+
+
+def issue_names(issues):
+    return [(issue["severity"], issue["issue"]) for issue in issues]
+
+
+def test_clean_row_passes(validator):
+    row, issues = validator.check(catalog_row(357, "BYD", "Battery-BOX H 5.0", "Battery", BATTERY_UUID))
+    assert row is not None and issues == []
+
+
+def test_noncanonical_type_is_coerced(validator):
+    row, issues = validator.check(catalog_row(1, "APSYSTEMS", "DS3-H", "micro-inverter"))
+    assert row["equipment_type"] == "MicroInverter"
+    assert issue_names(issues) == [("WARNING", "NONCANONICAL_TYPE")]
+
+
+@pytest.mark.parametrize("second, expected", [
+    (dict(catalog_row(2, "SMA", "SB7.7"), id="1"), "DUPLICATE_ID"),
+    (dict(catalog_row(2, "SMA", "SB7.7"), id="001"), "DUPLICATE_ID"),
+    (catalog_row(2, "SMA", "SB7.7", uuid="00000000-0000-0000-0000-000000000001"), "DUPLICATE_UUID"),
+    (catalog_row(2, "SMA", "SB7.7", "Flux Capacitor"), "UNKNOWN_TYPE"),
+    (catalog_row(2, "SMA", "SB7.7", "Inverter", BATTERY_UUID), "BATTERY_UUID_CONFLICT"),
+    (dict(catalog_row(2, "SMA", "SB7.7"), id="x2"), "MALFORMED_ROW"),
+])
+def test_error_rows_are_held_back(validator, second, expected):
+    validator.check(catalog_row(1, "APSYSTEMS", "DS3-H"))
+    row, issues = validator.check(second)
+    assert row is None
+    assert ("ERROR", expected) in issue_names(issues)
+
+
+def test_finish_reports_orphaned_battery(validator):
+    accepted, issues = validate_records(validator, [catalog_row(1, "APSYSTEMS", "DS3-H")])
+    assert len(accepted) == 1
+    assert issue_names(issues) == [("WARNING", "ORPHANED_BATTERY")]
+
+
+def test_held_back_rows_reach_suggested_changes(constants):
+    catalog = constants / "equipments.csv"
+    rows = [
+        catalog_row(1, "APSYSTEMS", "DS3-H", "MicroInverter"),
+        catalog_row(2, "APSYSTEMS", "DS3-H", "MicroInverter", "00000000-0000-0000-0000-000000000001"),
+        dict(catalog_row(3, "APSYSTEMS", "DS3-L", "MicroInverter"), id="1"),
+    ]
+    with open(catalog, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+    records, held_back = load_catalog(str(catalog), validation_report=constants / "report.csv")
+    assert [r["id"] for r in records] == ["1"]
+
+    changes, _ = build_suggested_changes(records, {}, held_back)
+    output = constants / "suggested_changes.csv"
+    counts = write_suggested_changes(output, changes)
+    assert counts["HELD_BACK"] == 2
+
+    with open(output, encoding="utf-8", newline="") as f:
+        written = [(row["action"], row["reason"].split(":")[0]) for row in csv.DictReader(f)]
+    assert written == [("HELD_BACK", "DUPLICATE_UUID"), ("HELD_BACK", "DUPLICATE_ID"), ("KEEP", "No changes needed")]
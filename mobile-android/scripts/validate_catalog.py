@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Equipment Catalog Validation Script
+
+Checks equipments.csv against the two other sources of truth in one
+streaming pass:
+- src/constants/equipmentTypes.ts: the authoritative equipment types
+  (EQUIPMENT_TYPES) and the aliases coerceEquipmentType accepts
+- src/constants/batteryModelsData.json: the app's copy of the battery catalog
+
+Reported issues:
+- ERROR rows are excluded from dedup, so they can't land in the wrong bucket:
+  MALFORMED_ROW, UNKNOWN_TYPE, DUPLICATE_ID, DUPLICATE_UUID, and BATTERY_UUID_CONFLICT
+  when the JSON says the UUID is a battery but the row has another type
+- WARNING rows are kept: NONCANONICAL_TYPE (coerced the way the app does),
+  MISSING_UUID, BATTERY_UUID_CONFLICT (same UUID / make_model, different
+  details), BATTERY_NOT_IN_JSON, ORPHANED_BATTERY (JSON entry with no
+  catalog row)
+
+Usage:
+    python validate_catalog.py          # writes catalog_validation.csv, exit 1 on errors
+"""
+
+import argparse
+import csv
+import json
+import re
+import sys
+from collections import defaultdict
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from pathlib import Path
+
+ERROR = 'ERROR'
+WARNING = 'WARNING'
+
+CATALOG_FIELDS = ['id', 'model', 'status', 'manufacturer', 'equipment_type', 'uuid', 'created_at', 'is_validated']
+REPORT_FIELDS = ['severity', 'issue', 'id', 'uuid', 'equipment_type', 'manufacturer', 'model', 'detail']
+
+BATTERY_TYPE = 'Battery'
+
+_CONSTANTS_BLOCK_RE = re.compile(r'EQUIPMENT_TYPES\s*=\s*\{(.*?)\}', re.DOTALL)
+_ALIAS_BLOCK_RE = re.compile(r'aliasMap[^=]*=\s*\{(.*?)\}', re.DOTALL)
+_ENTRY_RE = re.compile(r'(?:"([^"]+)"|\'([^\']+)\'|([A-Za-z_]\w*))\s*:\s*["\']([^"\']+)["\']')
+
+
+def _entries(block: str) -> List[Tuple[str, str]]:
+    return [(m.group(1) or m.group(2) or m.group(3), m.group(4)) for m in _ENTRY_RE.finditer(block)]
+
+
+def _clean_type(raw: str) -> str:
+    """Same cleanup as coerceEquipmentType: trim, hyphens/underscores to spaces, collapse, lowercase."""
+    cleaned = re.sub(r'[-_]+', ' ', raw.strip())
+    return re.sub(r'\s+', ' ', cleaned).lower()
+
+
+def _normalize_text(value: Optional[str]) -> str:
+    return " ".join((value or '').upper().split())
+
+
+def load_equipment_types(ts_file: Path) -> Tuple[List[str], Dict[str, str]]:
+    """
+    Parse equipmentTypes.ts.
+
+    Returns:
+        Tuple of (valid equipment types, {cleaned spelling: valid type}) where
+        the mapping covers every type plus coerceEquipmentType's aliases
+    """
+    with open(ts_file, 'r', encoding='utf-8') as f:
+        source = f.read()
+
+    constants = _CONSTANTS_BLOCK_RE.search(source)
+    if constants is None:
+        raise ValueError(f"No EQUIPMENT_TYPES object in {ts_file}")
+    types = [value for _, value in _entries(constants.group(1))]
+
+    coercions = {_clean_type(t): t for t in types}
+    aliases = _ALIAS_BLOCK_RE.search(source)
+    if aliases:
+        for alias, value in _entries(aliases.group(1)):
+            if value in types:
+                coercions.setdefault(_clean_type(alias), value)
+    return types, coercions
+
+
+def load_battery_index(json_file: Path) -> Tuple[Dict[str, Dict], Dict[str, List[Dict]], List[Dict]]:
+    """
+    Index batteryModelsData.json.
+
+    Returns:
+        Tuple of ({uuid: entry}, {normalized make_model: [entries]}, entries whose
+        UUID repeats an earlier entry)
+    """
+    with open(json_file, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    by_uuid = {}
+    by_make_model = defaultdict(list)
+    repeated = []
+    for manufacturer, models in data.items():
+        for entry in models:
+            entry = dict(entry, source_key=manufacturer)
+            uuid = entry.get('uuid') or ''
+            if uuid in by_uuid:
+                repeated.append(entry)
+            else:
+                by_uuid[uuid] = entry
+            make_model = entry.get('make_model') or f"{entry.get('manufacturer', '')} {entry.get('model', '')}"
+            by_make_model[_normalize_text(make_model)].append(entry)
+    return by_uuid, by_make_model, repeated
+
+
+class CatalogValidator:
+    """Hash indexes of the TS types and battery JSON, checked against catalog rows one at a time."""
+
+    def __init__(self, types: List[str], coercions: Dict[str, str],
+                 battery_by_uuid: Dict[str, Dict], battery_by_make_model: Dict[str, List[Dict]],
+                 repeated_batteries: List[Dict] = ()):
+        self.types = set(types)
+        self.coercions = coercions
+        self.battery_by_uuid = battery_by_uuid
+        self.battery_by_make_model = battery_by_make_model
+        self.repeated_batteries = list(repeated_batteries)
+        self.seen_ids = {}           # numeric id -> uuid of the first row carrying it
+        self.seen_uuids = {}         # uuid -> id of the first row carrying it
+        self.matched_batteries = set()
+        self.counts = defaultdict(int)
+
+    @classmethod
+    def from_files(cls, ts_file: Path, battery_file: Path) -> 'CatalogValidator':
+        types, coercions = load_equipment_types(ts_file)
+        if Path(battery_file).exists():
+            by_uuid, by_make_model, repeated = load_battery_index(battery_file)
+        else:
+            by_uuid, by_make_model, repeated = {}, {}, []
+        return cls(types, coercions, by_uuid, by_make_model, repeated)
+
+    def _issue(self, severity: str, issue: str, record: Dict, detail: str) -> Dict:
+        self.counts[issue] += 1
+        return {
+            'severity': severity,
+            'issue': issue,
+            'id': record.get('id') or '',
+            'uuid': record.get('uuid') or '',
+            'equipment_type': record.get('equipment_type') or '',
+            'manufacturer': record.get('manufacturer') or '',
+            'model': record.get('model') or '',
+            'detail': detail,
+        }
+
+    def check(self, record: Dict) -> Tuple[Optional[Dict], List[Dict]]:
+        """
+        Validate one catalog row.
+
+        Returns:
+            Tuple of (row to dedup, or None if it has an ERROR; issues). A row
+            with a non-canonical type comes back with the coerced type.
+        """
+        issues = []
+
+        # Mis-parsed CSV lines: extra fields land under None, missing ones are None
+        if None in record or any(record.get(field) is None for field in CATALOG_FIELDS):
+            extra = record.get(None)
+            detail = f"unexpected extra fields: {extra}" if extra else "missing fields"
+            return None, [self._issue(ERROR, 'MALFORMED_ROW', record, detail)]
+        if not record['id'].strip().isdigit():
+            return None, [self._issue(ERROR, 'MALFORMED_ROW', record, f"non-numeric id {record['id']!r}")]
+
+        row_id = int(record['id'])
+        if row_id in self.seen_ids:
+            issues.append(self._issue(ERROR, 'DUPLICATE_ID', record,
+                                      f"id already used by uuid {self.seen_ids[row_id] or '(empty)'}"))
+        else:
+            self.seen_ids[row_id] = record['uuid']
+
+        equipment_type = record['equipment_type']
+        if equipment_type not in self.types:
+            coerced = self.coercions.get(_clean_type(equipment_type))
+            if coerced is None:
+                issues.append(self._issue(ERROR, 'UNKNOWN_TYPE', record,
+                                          "not in EQUIPMENT_TYPES and not coercible"))
+            else:
+                issues.append(self._issue(WARNING, 'NONCANONICAL_TYPE', record, f"coerced to {coerced!r}"))
+                record = dict(record, equipment_type=coerced)
+                equipment_type = coerced
+
+        uuid = record['uuid'].strip()
+        if not uuid:
+            issues.append(self._issue(WARNING, 'MISSING_UUID', record, "empty uuid"))
+        elif uuid in self.seen_uuids:
+            issues.append(self._issue(ERROR, 'DUPLICATE_UUID', record,
+                                      f"uuid already used by id {self.seen_uuids[uuid]}"))
+        else:
+            self.seen_uuids[uuid] = record['id']
+
+        issues.extend(self._check_battery(record, uuid, equipment_type))
+
+        if any(issue['severity'] == ERROR for issue in issues):
+            return None, issues
+        return record, issues
+
+    def _check_battery(self, record: Dict, uuid: str, equipment_type: str) -> List[Dict]:
+        entry = self.battery_by_uuid.get(uuid) if uuid else None
+        if entry is not None:
+            self.matched_batteries.add(uuid)
+            if equipment_type != (entry.get('equipment_type') or BATTERY_TYPE):
+                return [self._issue(ERROR, 'BATTERY_UUID_CONFLICT', record,
+                                    f"batteryModelsData.json lists this uuid as {entry.get('make_model')!r} "
+                                    f"({entry.get('equipment_type')})")]
+            mismatched = [
+                field for field in ('id', 'manufacturer', 'model')
+                if _normalize_text(str(entry.get(field, ''))) != _normalize_text(record[field])
+            ]
+            if mismatched:
+                return [self._issue(WARNING, 'BATTERY_UUID_CONFLICT', record,
+                                    f"batteryModelsData.json differs in {', '.join(mismatched)}: "
+                                    f"{entry.get('id')} {entry.get('make_model')!r}")]
+            return []
+
+        if equipment_type != BATTERY_TYPE:
+            return []
+
+        make_model = _normalize_text(f"{record['manufacturer']} {record['model']}")
+        others = self.battery_by_make_model.get(make_model)
+        if others:
+            return [self._issue(WARNING, 'BATTERY_UUID_CONFLICT', record,
+                                f"batteryModelsData.json has this make_model under uuid "
+                                f"{', '.join(e.get('uuid') or '?' for e in others)}")]
+        return [self._issue(WARNING, 'BATTERY_NOT_IN_JSON', record, "no batteryModelsData.json entry")]
+
+    def finish(self) -> List[Dict]:
+        """Issues only known after every row was seen: orphaned and repeated battery entries."""
+        issues = []
+        for uuid, entry in self.battery_by_uuid.items():
+            if uuid not in self.matched_batteries:
+                issues.append(self._issue(WARNING, 'ORPHANED_BATTERY', entry,
+                                          f"batteryModelsData.json entry ({entry['source_key']}) "
+                                          "has no catalog row with this uuid"))
+        for entry in self.repeated_batteries:
+            issues.append(self._issue(WARNING, 'BATTERY_UUID_CONFLICT', entry,
+                                      "uuid repeated in batteryModelsData.json"))
+        return issues
+
+
+def validate_records(validator: CatalogValidator, records: Iterable[Dict],
+                     held_back: Optional[List[Tuple[Dict, List[Dict]]]] = None) -> Tuple[List[Dict], List[Dict]]:
+    """
+    Run every record through the validator.
+
+    Args:
+        validator: Fresh CatalogValidator
+        records: Catalog rows
+        held_back: If given, (row, its issues) is appended for every row with an ERROR
+
+    Returns:
+        Tuple of (rows safe to dedup, issues)
+    """
+    accepted = []
+    issues = []
+    for record in records:
+        row, row_issues = validator.check(record)
+        issues.extend(row_issues)
+        if row is not None:
+            accepted.append(row)
+        elif held_back is not None:
+            held_back.append((record, row_issues))
+    issues.extend(validator.finish())
+    return accepted, issues
+
+
+def iter_catalog(catalog_file: Path) -> Iterator[Dict]:
+    """Stream catalog rows."""
+    with open(catalog_file, 'r', encoding='utf-8', newline='') as f:
+        yield from csv.DictReader(f)
+
+
+def write_report(report_file: Path, issues: List[Dict]):
+    """Write issues, errors first."""
+    issues = sorted(issues, key=lambda i: (i['severity'] != ERROR, i['issue']))
+    with open(report_file, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=REPORT_FIELDS)
+        writer.writeheader()
+        writer.writerows(issues)
+
+
+def main():
+    """Main execution function."""
+    # Set up paths
+    script_dir = Path(__file__).parent.parent
+    constants_dir = script_dir / "src" / "constants"
+
+    parser = argparse.ArgumentParser(description="Validate equipments.csv against equipmentTypes.ts and batteryModelsData.json")
+    parser.add_argument('--catalog', type=Path, default=constants_dir / "equipments.csv")
+    parser.add_argument('--types', type=Path, default=constants_dir / "equipmentTypes.ts")
+    parser.add_argument('--batteries', type=Path, default=constants_dir / "batteryModelsData.json")
+    parser.add_argument('-o', '--output', type=Path, default=script_dir / "catalog_validation.csv",
+                        help="issue report (default: catalog_validation.csv)")
+    args = parser.parse_args()
+
+    for path in (args.catalog, args.types):
+        if not path.exists():
+            print(f"Error: Input file not found: {path}")
+            sys.exit(1)
+
+    print(f"Validating equipment catalog: {args.catalog}")
+    print("=" * 80)
+
+    validator = CatalogValidator.from_files(args.types, args.batteries)
+    accepted, issues = validate_records(validator, iter_catalog(args.catalog))
+    write_report(args.output, issues)
+
+    errors = sum(1 for issue in issues if issue['severity'] == ERROR)
+
+    # Print summary
+    print("\n" + "=" * 80)
+    print("SUMMARY")
+    print("=" * 80)
+    print(f"Rows accepted for dedup: {len(accepted)}")
+    print(f"Issues: {len(issues)} ({errors} errors)")
+    for issue, count in sorted(validator.counts.items(), key=lambda x: x[1], reverse=True):
+        print(f"  - {issue}: {count}")
+    print("\nOutput file:")
+    print(f"  - {args.output}")
+
+    if errors:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,446 @@
+#!/usr/bin/env python3
+"""
+Equipment Catalog Store
+
+Loads equipments.csv and batteryModelsData.json into a local SQLite
+database, so the catalog scripts can query it instead of re-parsing the CSV
+and rebuilding their own dicts on every run.
+
+This script:
+1. Stores every catalog row with its normalized manufacturer and model
+   (same normalization as normalize_equipment_catalog)
+2. Indexes (equipment_type, normalized manufacturer, normalized model) for
+   exact and candidate-block lookups, plus UUID
+3. Adds an FTS5 trigram table on the normalized model for substring and
+   prefix searches (skipped, with a warning, if SQLite lacks the trigram
+   tokenizer; searches then scan the model column)
+4. Rebuilds itself only when a source file or the manufacturer mappings change
+
+Usage:
+    python catalog_store.py                       # build / refresh catalog.sqlite
+    python catalog_store.py --prefix "Q.PEAK DUO" --type "Solar Panel"
+    python catalog_store.py --search 295TW
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+from pathlib import Path
+
+from normalize_equipment_catalog import (
+    MANUFACTURER_MAPPINGS,
+    create_comparison_key,
+    normalize_manufacturer,
+    normalize_model,
+)
+
+SCRIPT_DIR = Path(__file__).parent.parent
+CATALOG_FILE = SCRIPT_DIR / "src" / "constants" / "equipments.csv"
+BATTERY_FILE = SCRIPT_DIR / "src" / "constants" / "batteryModelsData.json"
+DEFAULT_DB_PATH = SCRIPT_DIR / "catalog.sqlite"
+
+# Bump when the schema or the stored normalization changes
+SCHEMA_VERSION = 2
+
+CATALOG_COLUMNS = ['id', 'model', 'status', 'manufacturer', 'equipment_type', 'uuid', 'created_at', 'is_validated']
+# Catalog columns plus the row's other CSV fields, as read back by _row_dict
+ROW_COLUMNS = CATALOG_COLUMNS + ['extra']
+# Canonical record first: lowest ID, then file order
+CANONICAL_ORDER = "CAST(id AS INTEGER), rowid"
+
+SCHEMA = """
+CREATE TABLE meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+
+-- IDs are stored as the CSV text: they may repeat or not be numbers (the
+-- validator reports those rows), so the implicit rowid is the key and keeps
+-- file order
+CREATE TABLE equipment (
+    id TEXT,
+    model TEXT,
+    status TEXT,
+    manufacturer TEXT,
+    equipment_type TEXT,
+    uuid TEXT,
+    created_at TEXT,
+    is_validated TEXT,
+    extra TEXT,
+    norm_manufacturer TEXT NOT NULL,
+    norm_model TEXT NOT NULL,
+    comparison_key TEXT NOT NULL
+);
+CREATE INDEX equipment_normalized ON equipment (equipment_type, norm_manufacturer, norm_model);
+CREATE INDEX equipment_uuid ON equipment (uuid);
+
+CREATE TABLE battery_models (
+    id INTEGER,
+    model TEXT,
+    model_number TEXT,
+    make_model TEXT,
+    manufacturer TEXT,
+    equipment_type TEXT,
+    uuid TEXT,
+    source_key TEXT NOT NULL,
+    norm_manufacturer TEXT NOT NULL,
+    norm_model TEXT NOT NULL
+);
+CREATE INDEX battery_models_uuid ON battery_models (uuid);
+CREATE INDEX battery_models_make_model ON battery_models (make_model);
+CREATE INDEX battery_models_normalized ON battery_models (norm_manufacturer, norm_model);
+"""
+
+# Needs SQLite >= 3.34 with FTS5; without it the store is built without the
+# table and searches scan norm_model instead
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE equipment_model_fts USING fts5(
+    norm_model,
+    content='equipment',
+    tokenize='trigram'
+);
+"""
+
+# Highest code point: norm_model >= prefix AND norm_model < prefix || PREFIX_END is a prefix range
+PREFIX_END = "\U0010ffff"
+# The trigram tokenizer can only match strings of at least three characters
+MIN_TRIGRAM_LENGTH = 3
+
+
+def _file_fingerprint(path: Path) -> Dict:
+    stat = os.stat(path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def source_fingerprint(catalog_file: Path, battery_file: Path) -> str:
+    """Everything the stored rows depend on: both sources, the mappings and the schema."""
+    return json.dumps({
+        'schema': SCHEMA_VERSION,
+        'catalog': _file_fingerprint(catalog_file),
+        'battery': _file_fingerprint(battery_file) if Path(battery_file).exists() else None,
+        'mappings': hashlib.sha1(
+            json.dumps(MANUFACTURER_MAPPINGS, sort_keys=True).encode('utf-8')
+        ).hexdigest(),
+    }, sort_keys=True)
+
+
+def build_store(db_path: Path, catalog_file: Path, battery_file: Path) -> Tuple[int, int]:
+    """
+    Build the database from the source files.
+
+    The new database is written next to db_path and renamed over it, so a
+    reader never sees a half-built store; a failed build leaves no file.
+
+    Returns:
+        Tuple of (catalog rows, battery model rows)
+    """
+    tmp_path = Path(f"{db_path}.tmp")
+    if tmp_path.exists():
+        tmp_path.unlink()
+
+    try:
+        catalog_count, battery_count = _write_store(tmp_path, catalog_file, battery_file)
+        os.replace(tmp_path, db_path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+    return catalog_count, battery_count
+
+
+def _extra_fields(record: Dict) -> Optional[str]:
+    """A CSV row's fields beyond CATALOG_COLUMNS as JSON [key, value] pairs (key None: overflow values)."""
+    extra = [[key, value] for key, value in record.items() if key not in CATALOG_COLUMNS]
+    return json.dumps(extra) if extra else None
+
+
+def _write_store(db_path: Path, catalog_file: Path, battery_file: Path) -> Tuple[int, int]:
+    conn = sqlite3.connect(str(db_path))
+    try:
+        conn.executescript(SCHEMA)
+        try:
+            conn.executescript(FTS_SCHEMA)
+            has_fts = True
+        except sqlite3.OperationalError as e:
+            print(f"Warning: SQLite {sqlite3.sqlite_version} has no FTS5 trigram tokenizer ({e}); "
+                  "building the store without the model search index")
+            has_fts = False
+
+        with open(catalog_file, 'r', encoding='utf-8') as f:
+            rows = []
+            for record in csv.DictReader(f):
+                norm_manufacturer = normalize_manufacturer(record['manufacturer'])
+                norm_model = normalize_model(record['model'])
+                rows.append(tuple(record.get(column) for column in CATALOG_COLUMNS) + (
+                    _extra_fields(record), norm_manufacturer, norm_model,
+                    create_comparison_key(norm_manufacturer, norm_model)))
+        conn.executemany(
+            f"INSERT INTO equipment ({', '.join(ROW_COLUMNS)}, norm_manufacturer, norm_model, comparison_key) "
+            f"VALUES ({', '.join('?' * (len(ROW_COLUMNS) + 3))})",
+            rows,
+        )
+        catalog_count = len(rows)
+
+        battery_rows = []
+        if Path(battery_file).exists():
+            with open(battery_file, 'r', encoding='utf-8') as f:
+                battery_data = json.load(f)
+            for source_key, models in battery_data.items():
+                for entry in models:
+                    battery_rows.append((
+                        entry.get('id'), entry.get('model'), entry.get('model_number'),
+                        entry.get('make_model'), entry.get('manufacturer'), entry.get('equipment_type'),
+                        entry.get('uuid'), source_key,
+                        normalize_manufacturer(entry.get('manufacturer') or source_key),
+                        normalize_model(entry.get('model') or ''),
+                    ))
+        conn.executemany(
+            "INSERT INTO battery_models (id, model, model_number, make_model, manufacturer, "
+            "equipment_type, uuid, source_key, norm_manufacturer, norm_model) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            battery_rows,
+        )
+
+        if has_fts:
+            conn.execute("INSERT INTO equipment_model_fts (equipment_model_fts) VALUES ('rebuild')")
+        conn.execute("INSERT INTO meta (key, value) VALUES ('fingerprint', ?)",
+                     (source_fingerprint(catalog_file, battery_file),))
+        conn.execute("INSERT INTO meta (key, value) VALUES ('built_at', ?)",
+                     (time.strftime('%Y-%m-%d %H:%M:%S'),))
+        conn.commit()
+    finally:
+        conn.close()
+
+    return catalog_count, len(battery_rows)
+
+
+def _row_dict(row: sqlite3.Row) -> Dict:
+    # Same shape as csv.DictReader rows (unknown columns and overflow values
+    # included), so the scripts can use either source
+    record = {column: row[column] for column in CATALOG_COLUMNS}
+    if row['extra']:
+        record.update((key, value) for key, value in json.loads(row['extra']))
+    return record
+
+
+def _fts_phrase(text: str) -> str:
+    return '"' + text.replace('"', '""') + '"'
+
+
+class CatalogStore:
+    """Read side of the catalog database."""
+
+    def __init__(self, db_path: Path = DEFAULT_DB_PATH):
+        self.db_path = Path(db_path)
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.row_factory = sqlite3.Row
+        self.has_fts = self._has_fts()
+
+    def close(self):
+        self.conn.close()
+
+    def _has_fts(self) -> bool:
+        """True if the trigram table exists and this SQLite can read it."""
+        try:
+            self.conn.execute("SELECT 1 FROM equipment_model_fts LIMIT 0")
+        except sqlite3.DatabaseError:
+            return False
+        return True
+
+    def fingerprint(self) -> Optional[str]:
+        try:
+            row = self.conn.execute("SELECT value FROM meta WHERE key = 'fingerprint'").fetchone()
+        except sqlite3.DatabaseError:
+            return None
+        return row[0] if row else None
+
+    def records(self, equipment_type: Optional[str] = None) -> List[Dict]:
+        """Catalog rows (as CSV-style dicts) in file order, optionally one equipment type only."""
+        query = f"SELECT {', '.join(ROW_COLUMNS)} FROM equipment"
+        params = ()
+        if equipment_type is not None:
+            query += " WHERE equipment_type = ?"
+            params = (equipment_type,)
+        return [_row_dict(row) for row in self.conn.execute(query + " ORDER BY rowid", params)]
+
+    def equipment_types(self) -> Dict[str, int]:
+        """Row count per equipment type."""
+        return dict(self.conn.execute(
+            "SELECT equipment_type, COUNT(*) FROM equipment GROUP BY equipment_type ORDER BY equipment_type"))
+
+    def lookup(self, equipment_type: str, manufacturer: str, model: str) -> List[Dict]:
+        """Rows with the same type and normalized manufacturer + model, canonical (lowest ID) first."""
+        rows = self.conn.execute(
+            f"SELECT {', '.join(ROW_COLUMNS)} FROM equipment "
+            f"WHERE equipment_type = ? AND norm_manufacturer = ? AND norm_model = ? ORDER BY {CANONICAL_ORDER}",
+            (equipment_type, normalize_manufacturer(manufacturer), normalize_model(model)),
+        )
+        return [_row_dict(row) for row in rows]
+
+    def block(self, equipment_type: Optional[str], manufacturer: Optional[str]) -> List[Tuple[str, Dict]]:
+        """
+        Fuzzy-match candidates: (comparison key, row) for one normalized manufacturer, canonical first.
+
+        Args:
+            equipment_type: Restrict to this type (None searches every type)
+            manufacturer: Manufacturer (raw or normalized; None for every manufacturer)
+        """
+        query = f"SELECT comparison_key, {', '.join(ROW_COLUMNS)} FROM equipment"
+        conditions, params = [], []
+        if manufacturer is not None:
+            conditions.append("norm_manufacturer = ?")
+            params.append(normalize_manufacturer(manufacturer))
+        if equipment_type is not None:
+            conditions.append("equipment_type = ?")
+            params.append(equipment_type)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        rows = self.conn.execute(query + f" ORDER BY {CANONICAL_ORDER}", params)
+        return [(row['comparison_key'], _row_dict(row)) for row in rows]
+
+    def prefix_search(self, prefix: str, equipment_type: Optional[str] = None,
+                      manufacturer: Optional[str] = None, limit: int = 50) -> List[Dict]:
+        """
+        Rows whose normalized model starts with prefix.
+
+        With both equipment_type and manufacturer this is a range scan of the
+        (type, manufacturer, model) index; otherwise the trigram index (when
+        the store has one) narrows the rows first.
+        """
+        prefix = normalize_model(prefix)
+        conditions = ["e.norm_model >= ?", "e.norm_model < ?"]
+        params = [prefix, prefix + PREFIX_END]
+        source = "equipment e"
+
+        if equipment_type is not None:
+            conditions.append("e.equipment_type = ?")
+            params.append(equipment_type)
+        if manufacturer is not None:
+            conditions.append("e.norm_manufacturer = ?")
+            params.append(normalize_manufacturer(manufacturer))
+        if (self.has_fts and (equipment_type is None or manufacturer is None)
+                and len(prefix) >= MIN_TRIGRAM_LENGTH):
+            source = "equipment_model_fts f JOIN equipment e ON e.rowid = f.rowid"
+            conditions.append("equipment_model_fts MATCH ?")
+            params.append(_fts_phrase(prefix))
+
+        rows = self.conn.execute(
+            f"SELECT {', '.join('e.' + c for c in ROW_COLUMNS)} FROM {source} "
+            f"WHERE {' AND '.join(conditions)} ORDER BY e.norm_model, e.rowid LIMIT ?",
+            params + [limit],
+        )
+        return [_row_dict(row) for row in rows]
+
+    def search(self, text: str, equipment_type: Optional[str] = None, limit: int = 50) -> List[Dict]:
+        """Rows whose normalized model contains text (at least three characters), via the trigram index if built."""
+        text = normalize_model(text)
+        if len(text) < MIN_TRIGRAM_LENGTH:
+            raise ValueError(f"Search text must be at least {MIN_TRIGRAM_LENGTH} characters")
+
+        columns = ', '.join('e.' + c for c in ROW_COLUMNS)
+        if self.has_fts:
+            query = (f"SELECT {columns} FROM equipment_model_fts f JOIN equipment e ON e.rowid = f.rowid "
+                     "WHERE equipment_model_fts MATCH ?")
+            params = [_fts_phrase(text)]
+        else:
+            query = f"SELECT {columns} FROM equipment e WHERE instr(e.norm_model, ?) > 0"
+            params = [text]
+        if equipment_type is not None:
+            query += " AND e.equipment_type = ?"
+            params.append(equipment_type)
+        rows = self.conn.execute(query + " ORDER BY e.rowid LIMIT ?", params + [limit])
+        return [_row_dict(row) for row in rows]
+
+    def battery_models(self, uuid: Optional[str] = None, make_model: Optional[str] = None) -> List[Dict]:
+        """batteryModelsData.json entries, optionally by UUID and/or make_model."""
+        conditions, params = [], []
+        if uuid is not None:
+            conditions.append("uuid = ?")
+            params.append(uuid)
+        if make_model is not None:
+            conditions.append("make_model = ?")
+            params.append(make_model)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        rows = self.conn.execute(
+            "SELECT id, model, model_number, make_model, manufacturer, equipment_type, uuid, source_key "
+            f"FROM battery_models{where} ORDER BY rowid", params)
+        return [dict(row) for row in rows]
+
+
+def open_store(db_path: Path = DEFAULT_DB_PATH, catalog_file: Path = CATALOG_FILE,
+               battery_file: Path = BATTERY_FILE, rebuild: bool = False) -> CatalogStore:
+    """
+    Open the catalog store, (re)building it first if it is missing or stale.
+
+    Args:
+        db_path: SQLite database path
+        catalog_file: equipments.csv
+        battery_file: batteryModelsData.json (optional)
+        rebuild: Rebuild even if the store is current
+    """
+    expected = source_fingerprint(catalog_file, battery_file)
+    if not rebuild and Path(db_path).exists():
+        store = CatalogStore(db_path)
+        if store.fingerprint() == expected:
+            return store
+        store.close()
+
+    start = time.time()
+    catalog_count, battery_count = build_store(db_path, catalog_file, battery_file)
+    print(f"Built catalog store {db_path}: {catalog_count} catalog rows, "
+          f"{battery_count} battery models ({time.time() - start:.1f}s)")
+    return CatalogStore(db_path)
+
+
+def _print_rows(rows: List[Dict]):
+    for row in rows:
+        print(f"  {row['id']:>6}  {row['equipment_type']:<22} {row['manufacturer']:<24} {row['model']}")
+    print(f"\n{len(rows)} rows")
+
+
+def main():
+    """Main execution function."""
+    parser = argparse.ArgumentParser(description="Build and query the SQLite equipment catalog store")
+    parser.add_argument('--db', type=Path, default=DEFAULT_DB_PATH,
+                        help="database path (default: catalog.sqlite)")
+    parser.add_argument('--catalog', type=Path, default=CATALOG_FILE, help="equipments.csv to load")
+    parser.add_argument('--batteries', type=Path, default=BATTERY_FILE, help="batteryModelsData.json to load")
+    parser.add_argument('--rebuild', action='store_true', help="rebuild even if the store is current")
+    parser.add_argument('--prefix', help="list rows whose normalized model starts with this")
+    parser.add_argument('--search', help="list rows whose normalized model contains this")
+    parser.add_argument('--type', dest='equipment_type', help="restrict queries to one equipment type")
+    parser.add_argument('--manufacturer', help="restrict --prefix to one manufacturer")
+    parser.add_argument('--limit', type=int, default=50)
+    args = parser.parse_args()
+
+    if not args.catalog.exists():
+        print(f"Error: Input file not found: {args.catalog}")
+        sys.exit(1)
+
+    store = open_store(args.db, args.catalog, args.batteries, args.rebuild)
+    try:
+        if args.prefix is not None:
+            _print_rows(store.prefix_search(args.prefix, args.equipment_type, args.manufacturer, args.limit))
+        elif args.search is not None:
+            try:
+                _print_rows(store.search(args.search, args.equipment_type, args.limit))
+            except ValueError as e:
+                print(f"Error: {e}")
+                sys.exit(1)
+        else:
+            types = store.equipment_types()
+            print(f"{store.db_path}: {sum(types.values())} catalog rows, "
+                  f"{len(store.battery_models())} battery models")
+            for equipment_type, count in types.items():
+                print(f"  {count:>6}  {equipment_type}")
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
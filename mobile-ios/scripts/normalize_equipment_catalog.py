@@ -6,19 +6,56 @@ This script:
 1. Normalizes manufacturer names with known variations
 2. Finds duplicate equipment using fuzzy matching
 3. Outputs suggested changes for review
+
+Threshold sweep: score every same-type pair once (down to --floor) into a
+compact edge file, then write suggested_changes_<threshold>.csv for each
+threshold without rescoring:
+
+    python normalize_equipment_catalog.py --sweep 85,90,95
+
+Long runs checkpoint into --work-dir after every block of rows; a restarted
+run skips finished equipment types and resumes the interrupted one.
+
+--store reads the catalog from the SQLite store (catalog_store.py) instead
+of parsing the CSV, rebuilding the store first only if the CSV changed.
+Dedup still compares every same-type pair in memory: blocking candidates by
+normalized manufacturer or model trigrams would miss the manufacturer
+spelling variants this script exists to find. The store's block and prefix
+queries serve link_supplier_feed.py and catalog_store.py --prefix/--search.
+
+Rows are validated against equipmentTypes.ts and batteryModelsData.json
+(validate_catalog.py) as they are read; rows with errors are held back from
+dedup, listed in catalog_validation.csv and written to the suggested changes
+as HELD_BACK with their errors.
 """
 
+import argparse
 import csv
+import hashlib
+import json
+import os
+import re
+import struct
 import sys
+import time
 from collections import defaultdict
-from typing import Dict, List, Tuple
+from typing import Dict, Iterator, List, Tuple
 from pathlib import Path
 
+from validate_catalog import ERROR, CatalogValidator, iter_catalog, validate_records, write_report
+
 try:
-    from rapidfuzz import fuzz
+    from rapidfuzz import fuzz, process
 except ImportError:
-    print("Error: rapidfuzz not installed. Install with: pip install rapidfuzz")
-    sys.exit(1)
+    # Only fuzzy matching needs it; the normalization below is also used by catalog_store
+    fuzz = process = None
+
+
+def require_rapidfuzz():
+    """Exit with install instructions if rapidfuzz is missing."""
+    if fuzz is None:
+        print("Error: rapidfuzz not installed. Install with: pip install rapidfuzz")
+        sys.exit(1)
 
 
 # Known manufacturer variations mapping
@@ -165,86 +202,459 @@ def create_comparison_key(manufacturer: str, model: str) -> str:
     return f"{manufacturer}|{model}"
 
 
-def find_duplicates(records: List[Dict], threshold: int = 90) -> Dict[int, Tuple[int, float]]:
+def group_by_type(records: List[Dict]) -> Dict[str, List[Dict]]:
+    """
+    Group records by equipment type.
+
+    Each group is sorted by ID so the first occurrence is canonical.
+    """
+    by_type = defaultdict(list)
+    for record in records:
+        equipment_type = record.get('equipment_type', '')
+        by_type[equipment_type].append(record)
+
+    for type_records in by_type.values():
+        type_records.sort(key=lambda r: int(r['id']))
+
+    return by_type
+
+
+def comparison_keys(type_records: List[Dict]) -> List[str]:
+    """Comparison key of every record in a group (computed once per record)."""
+    return [
+        create_comparison_key(
+            normalize_manufacturer(record['manufacturer']),
+            normalize_model(record['model'])
+        )
+        for record in type_records
+    ]
+
+
+def row_matches(keys: List[str], i: int, score_cutoff: float) -> List[Tuple[int, float]]:
+    """
+    Score keys[i] against every later key in the group.
+
+    Args:
+        keys: Comparison keys of one group, in canonical (ID) order
+        i: Row to score
+        score_cutoff: Minimum similarity to report (0-100)
+
+    Returns:
+        (index, similarity) for every later key scoring >= score_cutoff, by index
+    """
+    # Token sort ratio for better matching; the loop over the row runs in rapidfuzz.
+    # processor=None scores the keys as fuzz.token_sort_ratio(a, b) does: rapidfuzz
+    # < 3 lowercases and strips punctuation in process.* by default.
+    matches = process.extract(
+        keys[i], keys[i + 1:],
+        scorer=fuzz.token_sort_ratio,
+        processor=None,
+        score_cutoff=score_cutoff,
+        limit=None,
+    )
+    return sorted((i + 1 + index, similarity) for _, similarity, index in matches)
+
+
+# =========================
+# CHECKPOINTS AND PROGRESS
+# =========================
+
+DEFAULT_BLOCK_SIZE = 500
+
+
+def checkpoint_path(work_dir: Path, equipment_type: str) -> Path:
+    """Checkpoint file for one equipment type."""
+    slug = re.sub(r'[^A-Za-z0-9]+', '_', equipment_type).strip('_').lower() or 'untyped'
+    return Path(work_dir) / f"{slug}.json"
+
+
+def group_fingerprint(ids: List[int], keys: List[str]) -> str:
+    """Hash of a group's IDs and comparison keys; any catalog edit invalidates its checkpoint."""
+    digest = hashlib.sha1()
+    for record_id, key in zip(ids, keys):
+        digest.update(f"{record_id}\t{key}\n".encode('utf-8'))
+    return digest.hexdigest()
+
+
+def load_checkpoint(path: Path, threshold: float, fingerprint: str) -> Tuple[int, Dict[int, Tuple[int, float]]]:
+    """
+    Resume point of one equipment type.
+
+    Returns:
+        Tuple of (next row to compare, duplicates found so far); (0, {}) when
+        there is no checkpoint or it was made for other data or another threshold
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return 0, {}
+
+    if state.get('threshold') != threshold or state.get('fingerprint') != fingerprint:
+        return 0, {}
+    duplicates = {
+        int(duplicate_id): (canonical_id, similarity)
+        for duplicate_id, (canonical_id, similarity) in state['duplicates'].items()
+    }
+    return state['next_row'], duplicates
+
+
+def save_checkpoint(path: Path, equipment_type: str, threshold: float, fingerprint: str,
+                    next_row: int, row_count: int, duplicates: Dict[int, Tuple[int, float]]):
+    """Write one equipment type's progress atomically (a kill mid-write keeps the previous one)."""
+    state = {
+        'equipment_type': equipment_type,
+        'threshold': threshold,
+        'fingerprint': fingerprint,
+        'next_row': next_row,
+        'rows': row_count,
+        'complete': next_row >= row_count,
+        'duplicates': {str(k): list(v) for k, v in duplicates.items()},
+    }
+    tmp_path = path.with_suffix('.json.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f)
+    os.replace(tmp_path, path)
+
+
+def remaining_pairs(row_count: int, next_row: int) -> int:
+    """Pairs still to compare in a group of row_count records, starting at next_row."""
+    rows_left = max(row_count - next_row, 0)
+    return rows_left * (rows_left - 1) // 2
+
+
+def _format_duration(seconds: float) -> str:
+    seconds = int(seconds)
+    hours, seconds = divmod(seconds, 3600)
+    minutes, seconds = divmod(seconds, 60)
+    return f"{hours}h{minutes:02d}m" if hours else f"{minutes}m{seconds:02d}s"
+
+
+class DedupProgress:
+    """
+    Rows/sec and an ETA from the number of pairs still to compare.
+
+    The rate counts only pairs actually scored: rows already marked as
+    duplicates are skipped without scoring their pairs, and counting those
+    made the first ETAs far too short. The ETA assumes every remaining row
+    is scored, so it errs long.
+    """
+
+    def __init__(self, total_pairs: int, interval: float = 5.0):
+        self.pairs_left = total_pairs
+        self.interval = interval
+        self.rows_done = 0
+        self.pairs_scored = 0
+        self.start = time.time()
+        self.last_report = 0.0
+
+    def advance(self, rows: int, pairs: int, scored: int):
+        """rows and pairs passed (skipped rows included), scored of those pairs actually compared"""
+        self.rows_done += rows
+        self.pairs_scored += scored
+        self.pairs_left -= pairs
+
+    def report(self, equipment_type: str, row: int, row_count: int, force: bool = False):
+        now = time.time()
+        if not force and now - self.last_report < self.interval:
+            return
+        self.last_report = now
+
+        elapsed = max(now - self.start, 1e-9)
+        rows_per_sec = self.rows_done / elapsed
+        pairs_per_sec = self.pairs_scored / elapsed
+        eta = _format_duration(self.pairs_left / pairs_per_sec) if pairs_per_sec else "?"
+        print(f"  {equipment_type}: row {row}/{row_count} | {rows_per_sec:,.0f} rows/s | "
+              f"{self.pairs_left:,} pairs left | ETA {eta}")
+
+
+def find_duplicates(records: List[Dict], threshold: int = 90, work_dir: Path = None,
+                    block_size: int = DEFAULT_BLOCK_SIZE) -> Dict[int, Tuple[int, float]]:
     """
     Find duplicate records using fuzzy matching.
 
     Args:
         records: List of equipment records
         threshold: Similarity threshold (0-100)
+        work_dir: Directory for per-type checkpoints, saved after every block
+            of rows; finished types are skipped on the next run (None disables)
+        block_size: Rows compared between checkpoints
 
     Returns:
         Dict mapping duplicate record ID to (canonical ID, confidence)
     """
     duplicates = {}
 
-    # Group records by equipment type
-    by_type = defaultdict(list)
-    for record in records:
-        equipment_type = record.get('equipment_type', '')
-        by_type[equipment_type].append(record)
+    groups = []
+    for equipment_type, type_records in group_by_type(records).items():
+        ids = [int(record['id']) for record in type_records]
+        keys = comparison_keys(type_records)
+        fingerprint = group_fingerprint(ids, keys)
+        next_row, group_duplicates = 0, {}
+        if work_dir is not None:
+            next_row, group_duplicates = load_checkpoint(
+                checkpoint_path(work_dir, equipment_type), threshold, fingerprint)
+        groups.append((equipment_type, ids, keys, fingerprint, next_row, group_duplicates))
+
+    if work_dir is not None:
+        Path(work_dir).mkdir(parents=True, exist_ok=True)
+    progress = DedupProgress(sum(remaining_pairs(len(g[1]), g[4]) for g in groups))
 
     # Find duplicates within each equipment type
-    for equipment_type, type_records in by_type.items():
-        # Sort by ID to ensure first occurrence is canonical
-        type_records.sort(key=lambda r: int(r['id']))
+    for equipment_type, ids, keys, fingerprint, next_row, group_duplicates in groups:
+        row_count = len(ids)
+        if next_row >= row_count:
+            if next_row:
+                print(f"  {equipment_type}: finished in a previous run, skipped")
+            duplicates.update(group_duplicates)
+            continue
+        if next_row:
+            print(f"  {equipment_type}: resuming at row {next_row}/{row_count}")
+
+        for block_start in range(next_row, row_count, block_size):
+            block_end = min(block_start + block_size, row_count)
+            scored = 0
+            for i in range(block_start, block_end):
+                record_id = ids[i]
+                if record_id in group_duplicates:
+                    continue  # Already marked as duplicate
+                scored += row_count - i - 1
 
-        for i, record in enumerate(type_records):
-            if int(record['id']) in duplicates:
-                continue  # Already marked as duplicate
+                # Compare with all subsequent records
+                for j, similarity in row_matches(keys, i, threshold):
+                    if ids[j] not in group_duplicates:
+                        # Mark as duplicate of the first (canonical) record
+                        group_duplicates[ids[j]] = (record_id, similarity)
 
-            record_key = create_comparison_key(
-                normalize_manufacturer(record['manufacturer']),
-                normalize_model(record['model'])
-            )
+            progress.advance(block_end - block_start,
+                             remaining_pairs(row_count, block_start) - remaining_pairs(row_count, block_end),
+                             scored)
+            if work_dir is not None:
+                save_checkpoint(checkpoint_path(work_dir, equipment_type), equipment_type,
+                                threshold, fingerprint, block_end, row_count, group_duplicates)
+            progress.report(equipment_type, block_end, row_count, force=block_end == row_count)
 
-            # Compare with all subsequent records
-            for other_record in type_records[i+1:]:
-                if int(other_record['id']) in duplicates:
-                    continue  # Already marked as duplicate
+        duplicates.update(group_duplicates)
+
+    return duplicates
 
-                other_key = create_comparison_key(
-                    normalize_manufacturer(other_record['manufacturer']),
-                    normalize_model(other_record['model'])
-                )
 
-                # Use token sort ratio for better matching
-                similarity = fuzz.token_sort_ratio(record_key, other_key)
+# =========================
+# THRESHOLD SWEEP (EDGE FILE)
+# =========================
 
-                if similarity >= threshold:
-                    # Mark as duplicate of the first (canonical) record
-                    duplicates[int(other_record['id'])] = (int(record['id']), similarity)
+# Edge file layout: magic line, one JSON metadata line, then fixed-size
+# (canonical ID, other ID, similarity) records. Records are in the order
+# find_duplicates visits pairs (group, row, column), so replaying them
+# reproduces its greedy marking for any threshold >= the floor.
+EDGE_FILE_MAGIC = b"SKYFIRE-CATALOG-EDGES 1\n"
+EDGE_RECORD = struct.Struct("<IId")
+DEFAULT_SCORE_FLOOR = 80
 
-    return duplicates
+
+def _source_fingerprint(input_file: str) -> Dict:
+    stat = os.stat(input_file)
+    return {'source_size': stat.st_size, 'source_mtime_ns': stat.st_mtime_ns}
 
 
-def process_catalog(input_file: str) -> Tuple[List[Dict], Dict[str, int]]:
+def write_edge_file(records: List[Dict], edge_file: str, floor: float = DEFAULT_SCORE_FLOOR,
+                    input_file: str = None) -> int:
     """
-    Process equipment catalog and generate suggested changes.
+    Score every same-type pair once and store those >= floor.
 
     Args:
-        input_file: Path to input CSV file
+        records: List of equipment records
+        edge_file: Output path (written atomically)
+        floor: Lowest similarity kept; sweeps can use any threshold >= floor
+        input_file: CSV the records came from (recorded to detect stale edge files)
 
     Returns:
-        Tuple of (suggested changes, manufacturer mapping counts)
+        Number of edges written
     """
-    # Read input file
+    metadata = {'floor': floor, 'records': len(records),
+                'created_at': time.strftime('%Y-%m-%d %H:%M:%S')}
+    if input_file:
+        metadata.update(_source_fingerprint(input_file))
+
+    count = 0
+    tmp_file = f"{edge_file}.tmp"
+    with open(tmp_file, 'wb') as f:
+        f.write(EDGE_FILE_MAGIC)
+        f.write(json.dumps(metadata).encode('utf-8') + b"\n")
+
+        for equipment_type, type_records in sorted(group_by_type(records).items()):
+            ids = [int(record['id']) for record in type_records]
+            keys = comparison_keys(type_records)
+            print(f"  Scoring {equipment_type}: {len(ids)} records")
+
+            for i, record_id in enumerate(ids):
+                row = row_matches(keys, i, floor)
+                if row:
+                    f.write(b"".join(EDGE_RECORD.pack(record_id, ids[j], s) for j, s in row))
+                    count += len(row)
+
+    os.replace(tmp_file, edge_file)
+    return count
+
+
+def read_edge_metadata(edge_file: str) -> Dict:
+    """Metadata line of an edge file (ValueError if it is not one)."""
+    with open(edge_file, 'rb') as f:
+        if f.readline() != EDGE_FILE_MAGIC:
+            raise ValueError(f"{edge_file} is not a catalog edge file")
+        return json.loads(f.readline())
+
+
+def iter_edges(edge_file: str, chunk_records: int = 65536) -> Iterator[Tuple[int, int, float]]:
+    """Stream (canonical ID, other ID, similarity) records from an edge file."""
+    with open(edge_file, 'rb') as f:
+        if f.readline() != EDGE_FILE_MAGIC:
+            raise ValueError(f"{edge_file} is not a catalog edge file")
+        f.readline()
+
+        while True:
+            chunk = f.read(EDGE_RECORD.size * chunk_records)
+            if not chunk:
+                return
+            yield from EDGE_RECORD.iter_unpack(chunk)
+
+
+def duplicates_for_thresholds(edge_file: str,
+                              thresholds: List[float]) -> Dict[float, Dict[int, Tuple[int, float]]]:
+    """
+    Replay find_duplicates for several thresholds in one pass over an edge file.
+
+    Returns:
+        Dict mapping threshold to find_duplicates()-style results
+    """
+    floor = read_edge_metadata(edge_file)['floor']
+    if min(thresholds) < floor:
+        raise ValueError(f"Threshold {min(thresholds)} is below the edge file floor ({floor})")
+
+    results = {threshold: {} for threshold in thresholds}
+    for canonical_id, other_id, similarity in iter_edges(edge_file):
+        for threshold, duplicates in results.items():
+            if (similarity >= threshold
+                    and canonical_id not in duplicates
+                    and other_id not in duplicates):
+                duplicates[other_id] = (canonical_id, similarity)
+    return results
+
+
+def edge_file_is_current(edge_file: str, input_file: str, floor: float, record_count: int = None) -> bool:
+    """True if edge_file was scored from the current input_file (and record_count rows) down to at most floor."""
+    try:
+        metadata = read_edge_metadata(edge_file)
+    except (OSError, ValueError):
+        return False
+    fingerprint = _source_fingerprint(input_file)
+    return (metadata['floor'] <= floor
+            and record_count in (None, metadata.get('records'))
+            and all(metadata.get(key) == value for key, value in fingerprint.items()))
+
+
+# =========================
+# SUGGESTED CHANGES
+# =========================
+
+def load_records(input_file: str) -> List[Dict]:
+    """Read the equipment catalog CSV."""
     records = []
     with open(input_file, 'r', encoding='utf-8') as f:
         reader = csv.DictReader(f)
         for row in reader:
             records.append(row)
+    return records
 
-    print(f"Loaded {len(records)} records from {input_file}")
 
-    # Track manufacturer normalizations
-    manufacturer_changes = defaultdict(int)
+def load_catalog(input_file: str, store_path: Path = None,
+                 validation_report: Path = None) -> Tuple[List[Dict], List[Tuple[Dict, List[Dict]]]]:
+    """
+    Catalog records ready for dedup.
+
+    Args:
+        input_file: Path to input CSV file
+        store_path: Read records from this catalog store instead of the CSV
+        validation_report: Validate rows while reading them and write the
+            issues here; rows with errors are held back (None skips validation)
+
+    Returns:
+        Tuple of (equipment records, held back (record, issues) pairs)
+    """
+    constants_dir = Path(input_file).parent
+    types_file = constants_dir / "equipmentTypes.ts"
+    battery_file = constants_dir / "batteryModelsData.json"
+
+    if store_path is None:
+        records = iter_catalog(input_file)
+    else:
+        # catalog_store imports the normalization from this module
+        from catalog_store import open_store
+        store = open_store(store_path, Path(input_file), battery_file)
+        try:
+            records = store.records()
+        finally:
+            store.close()
+
+    if validation_report is None:
+        return list(records), []
+    if not types_file.exists():
+        print(f"Warning: {types_file} not found, skipping validation")
+        return list(records), []
+
+    validator = CatalogValidator.from_files(types_file, battery_file)
+    held_back = []
+    accepted, issues = validate_records(validator, records, held_back)
+    write_report(validation_report, issues)
+
+    if issues:
+        print(f"Validation: {len(issues)} issues, {len(held_back)} rows held back from dedup "
+              f"(HELD_BACK in the suggested changes; see {validation_report})")
+    return accepted, held_back
+
+
+def process_catalog(input_file: str, threshold: int = 90, work_dir: Path = None,
+                    block_size: int = DEFAULT_BLOCK_SIZE, store_path: Path = None,
+                    validation_report: Path = None) -> Tuple[List[Dict], Dict[str, int]]:
+    """
+    Process equipment catalog and generate suggested changes.
+
+    Args:
+        input_file: Path to input CSV file
+        threshold: Similarity threshold (0-100)
+        work_dir: Checkpoint directory for find_duplicates (None disables)
+        block_size: Rows compared between checkpoints
+        store_path: Read records from this catalog store instead of the CSV
+        validation_report: Validate rows and write issues here (None skips validation)
+
+    Returns:
+        Tuple of (suggested changes, manufacturer mapping counts)
+    """
+    # Read input file
+    records, held_back = load_catalog(input_file, store_path, validation_report)
+
+    print(f"Loaded {len(records)} records from {input_file}")
 
     # Find duplicates
-    print("Finding duplicates with fuzzy matching (threshold: 90%)...")
-    duplicates = find_duplicates(records, threshold=90)
+    print(f"Finding duplicates with fuzzy matching (threshold: {threshold}%)...")
+    duplicates = find_duplicates(records, threshold=threshold, work_dir=work_dir, block_size=block_size)
     print(f"Found {len(duplicates)} duplicate records")
 
+    return build_suggested_changes(records, duplicates, held_back)
+
+
+def build_suggested_changes(records: List[Dict], duplicates: Dict[int, Tuple[int, float]],
+                            held_back: List[Tuple[Dict, List[Dict]]] = ()) -> Tuple[List[Dict], Dict[str, int]]:
+    """
+    Turn duplicate matches into DELETE/UPDATE/KEEP rows, plus a HELD_BACK row
+    (with its validation errors) for every row left out of dedup.
+
+    Returns:
+        Tuple of (suggested changes, manufacturer mapping counts)
+    """
+    # Track manufacturer normalizations
+    manufacturer_changes = defaultdict(int)
+
     # Generate suggested changes
     suggested_changes = []
 
@@ -304,37 +714,40 @@ def process_catalog(input_file: str) -> Tuple[List[Dict], Dict[str, int]]:
                 'reason': 'No changes needed'
             })
 
-    return suggested_changes, manufacturer_changes
-
-
-def main():
-    """Main execution function."""
-    # Set up paths
-    script_dir = Path(__file__).parent.parent
-    input_file = script_dir / "src" / "constants" / "equipments.csv"
-    output_file = script_dir / "suggested_changes.csv"
-    mapping_file = script_dir / "manufacturer_mapping.csv"
+    for record, issues in held_back:
+        suggested_changes.append({
+            'action': 'HELD_BACK',
+            'confidence': '',
+            'id': record.get('id') or '',
+            'uuid': record.get('uuid') or '',
+            'equipment_type': record.get('equipment_type') or '',
+            'current_manufacturer': record.get('manufacturer') or '',
+            'current_model': record.get('model') or '',
+            'new_manufacturer': '',
+            'new_model': '',
+            'duplicate_of_id': '',
+            'reason': '; '.join(f"{issue['issue']}: {issue['detail']}"
+                                for issue in issues if issue['severity'] == ERROR)
+        })
 
-    if not input_file.exists():
-        print(f"Error: Input file not found: {input_file}")
-        sys.exit(1)
+    return suggested_changes, manufacturer_changes
 
-    print(f"Processing equipment catalog: {input_file}")
-    print("=" * 80)
 
-    # Process catalog
-    suggested_changes, manufacturer_changes = process_catalog(str(input_file))
+def write_suggested_changes(output_file: Path, suggested_changes: List[Dict]) -> Dict[str, int]:
+    """
+    Sort and write suggested changes.
 
+    Returns:
+        Dict mapping action to row count
+    """
     # Sort suggested changes
-    # Priority: DELETE first, then UPDATE, then KEEP
+    # Priority: DELETE first, then UPDATE, then HELD_BACK (fix and re-run), then KEEP
     # Within each action, sort by confidence (ascending - lowest first for review)
-    action_priority = {'DELETE': 0, 'UPDATE': 1, 'KEEP': 2}
+    action_priority = {'DELETE': 0, 'UPDATE': 1, 'HELD_BACK': 2, 'KEEP': 3}
     suggested_changes.sort(
-        key=lambda x: (action_priority[x['action']], float(x['confidence']))
+        key=lambda x: (action_priority[x['action']], float(x['confidence'] or 0))
     )
 
-    # Write suggested changes
-    print(f"\nWriting suggested changes to: {output_file}")
     with open(output_file, 'w', newline='', encoding='utf-8') as f:
         fieldnames = [
             'action', 'confidence', 'id', 'uuid', 'equipment_type',
@@ -345,8 +758,14 @@ def main():
         writer.writeheader()
         writer.writerows(suggested_changes)
 
-    # Write manufacturer mapping
-    print(f"Writing manufacturer mapping to: {mapping_file}")
+    action_counts = defaultdict(int)
+    for change in suggested_changes:
+        action_counts[change['action']] += 1
+    return action_counts
+
+
+def write_manufacturer_mapping(mapping_file: Path, manufacturer_changes: Dict[str, int]):
+    """Write manufacturer normalizations, most common first."""
     manufacturer_mappings_list = []
     for change, count in sorted(manufacturer_changes.items(), key=lambda x: x[1], reverse=True):
         original, normalized = change.split(' → ')
@@ -362,24 +781,138 @@ def main():
         writer.writeheader()
         writer.writerows(manufacturer_mappings_list)
 
+
+def parse_thresholds(value: str) -> List[float]:
+    """Parse a comma-separated threshold list such as "85,90,95"."""
+    try:
+        thresholds = sorted({float(part) for part in value.split(',') if part.strip()})
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid threshold list: {value!r}")
+    if not thresholds or not all(0 <= t <= 100 for t in thresholds):
+        raise argparse.ArgumentTypeError("thresholds must be between 0 and 100")
+    return thresholds
+
+
+def run_sweep(input_file: Path, script_dir: Path, thresholds: List[float],
+              edge_file: Path, floor: float, rescore: bool = False,
+              store_path: Path = None, validation_report: Path = None) -> List[Path]:
+    """
+    Write suggested_changes_<threshold>.csv for every threshold from one scoring pass.
+
+    The edge file is reused when it was scored from the current input down
+    to at most min(floor, thresholds); otherwise it is rebuilt first.
+
+    Returns:
+        Paths of the suggested changes files written
+    """
+    floor = min(floor, thresholds[0])
+    records, held_back = load_catalog(str(input_file), store_path, validation_report)
+    print(f"Loaded {len(records)} records from {input_file}")
+
+    if rescore or not edge_file_is_current(str(edge_file), str(input_file), floor, len(records)):
+        print(f"Scoring all same-type pairs (floor: {floor:g}%)...")
+        start = time.time()
+        count = write_edge_file(records, str(edge_file), floor, str(input_file))
+        print(f"Wrote {count} edges to {edge_file} in {time.time() - start:.1f}s")
+    else:
+        print(f"Reusing edges from {edge_file}")
+
+    results = duplicates_for_thresholds(str(edge_file), thresholds)
+
+    written = []
+    print(f"\n{'threshold':>9}  {'DELETE':>7}  {'UPDATE':>7}  {'KEEP':>7}  file")
+    for threshold in thresholds:
+        suggested_changes, manufacturer_changes = build_suggested_changes(records, results[threshold], held_back)
+        output_file = script_dir / f"suggested_changes_{threshold:g}.csv"
+        counts = write_suggested_changes(output_file, suggested_changes)
+        print(f"{threshold:>9g}  {counts['DELETE']:>7}  {counts['UPDATE']:>7}  {counts['KEEP']:>7}  {output_file.name}")
+        written.append(output_file)
+
+    write_manufacturer_mapping(script_dir / "manufacturer_mapping.csv", manufacturer_changes)
+    return written
+
+
+def main():
+    """Main execution function."""
+    # Set up paths
+    script_dir = Path(__file__).parent.parent
+    input_file = script_dir / "src" / "constants" / "equipments.csv"
+    output_file = script_dir / "suggested_changes.csv"
+    mapping_file = script_dir / "manufacturer_mapping.csv"
+
+    parser = argparse.ArgumentParser(description="Normalize manufacturers and find duplicate equipment")
+    parser.add_argument('--threshold', type=float, default=90,
+                        help="similarity threshold for a single run (default: 90)")
+    parser.add_argument('--sweep', type=parse_thresholds, metavar='T1,T2,...',
+                        help="write suggested_changes_<t>.csv for each threshold from one scoring pass")
+    parser.add_argument('--edges', type=Path, default=script_dir / "catalog_edges.bin",
+                        help="edge file used by --sweep (default: catalog_edges.bin)")
+    parser.add_argument('--floor', type=float, default=DEFAULT_SCORE_FLOOR,
+                        help=f"lowest similarity kept in the edge file (default: {DEFAULT_SCORE_FLOOR})")
+    parser.add_argument('--rescore', action='store_true',
+                        help="rebuild the edge file even if it is current")
+    parser.add_argument('--work-dir', type=Path, default=script_dir / "dedup_work",
+                        help="checkpoint directory for resumable runs (default: dedup_work)")
+    parser.add_argument('--block-size', type=int, default=DEFAULT_BLOCK_SIZE,
+                        help=f"rows compared between checkpoints (default: {DEFAULT_BLOCK_SIZE})")
+    parser.add_argument('--no-checkpoint', action='store_true',
+                        help="don't read or write checkpoints")
+    parser.add_argument('--store', type=Path, nargs='?', const=script_dir / "catalog.sqlite",
+                        help="read the catalog from the SQLite store (default: catalog.sqlite)")
+    parser.add_argument('--no-validate', action='store_true',
+                        help="skip validation against equipmentTypes.ts and batteryModelsData.json")
+    args = parser.parse_args()
+    require_rapidfuzz()
+    validation_report = None if args.no_validate else script_dir / "catalog_validation.csv"
+
+    if not input_file.exists():
+        print(f"Error: Input file not found: {input_file}")
+        sys.exit(1)
+
+    print(f"Processing equipment catalog: {input_file}")
+    print("=" * 80)
+
+    if args.sweep:
+        written = run_sweep(input_file, script_dir, args.sweep, args.edges, args.floor, args.rescore,
+                            args.store, validation_report)
+        print("\nOutput files:")
+        for path in written:
+            print(f"  - {path}")
+        print(f"  - {mapping_file}")
+        print("\nReview the suggested changes before applying to database!")
+        return
+
+    # Process catalog
+    work_dir = None if args.no_checkpoint else args.work_dir
+    suggested_changes, manufacturer_changes = process_catalog(
+        str(input_file), args.threshold, work_dir, args.block_size, args.store, validation_report)
+
+    # Write suggested changes
+    print(f"\nWriting suggested changes to: {output_file}")
+    action_counts = write_suggested_changes(output_file, suggested_changes)
+
+    # Write manufacturer mapping
+    print(f"Writing manufacturer mapping to: {mapping_file}")
+    write_manufacturer_mapping(mapping_file, manufacturer_changes)
+
     # Print summary
     print("\n" + "=" * 80)
     print("SUMMARY")
     print("=" * 80)
 
-    action_counts = defaultdict(int)
-    for change in suggested_changes:
-        action_counts[change['action']] += 1
-
     print(f"Total records processed: {len(suggested_changes)}")
     print(f"  - DELETE (duplicates): {action_counts['DELETE']}")
     print(f"  - UPDATE (normalization): {action_counts['UPDATE']}")
     print(f"  - KEEP (no changes): {action_counts['KEEP']}")
+    if action_counts['HELD_BACK']:
+        print(f"  - HELD_BACK (validation errors, not deduped): {action_counts['HELD_BACK']}")
     print(f"\nManufacturer normalizations: {len(manufacturer_changes)}")
 
     print(f"\nOutput files:")
     print(f"  - {output_file}")
     print(f"  - {mapping_file}")
+    if validation_report is not None:
+        print(f"  - {validation_report}")
     print("\nReview suggested_changes.csv before applying to database!")
 
 
@@ -0,0 +1,121 @@
+import shutil
+from pathlib import Path
+
+import pytest
+
+import catalog_store
+from catalog_store import build_store, open_store
+from conftest import catalog_row
+from normalize_equipment_catalog import load_catalog
+from validate_catalog import iter_catalog
+
+
+def test_round_trips_rows_in_file_order(write_catalog, tmp_path):
+    rows = [
+        catalog_row(12, "Ablytek", "6MN6A275"),
+        catalog_row(3, "SMA", "SB7.7-1SP-US-41", "Inverter"),
+    ]
+    store = open_store(tmp_path / "catalog.sqlite", write_catalog(rows), tmp_path / "none.json")
+    try:
+        assert store.records() == rows
+        assert [r["id"] for r in store.records("Inverter")] == ["3"]
+    finally:
+        store.close()
+
+
+def test_repeated_and_non_numeric_ids_are_stored(write_catalog, tmp_path):
+    rows = [
+        catalog_row(7, "SMA", "SB7.7-1SP-US-41", "Inverter"),
+        dict(catalog_row(5, "SMA", "SB7.7-1SP-US-41", "Inverter"), id="7"),
+        dict(catalog_row(6, "SMA", "SB7.7-1SP-US-41", "Inverter"), id="A-6"),
+        catalog_row(2, "SMA", "SB7.7-1SP-US-41", "Inverter"),
+    ]
+    store = open_store(tmp_path / "catalog.sqlite", write_catalog(rows), tmp_path / "none.json")
+    try:
+        assert [r["id"] for r in store.records()] == ["7", "7", "A-6", "2"]
+        # Canonical (lowest numeric ID) first, file order between equal IDs
+        matches = store.lookup("Inverter", "SMA", "SB7.7-1SP-US-41")
+        assert [r["uuid"] for r in matches] == [rows[2]["uuid"], rows[3]["uuid"], rows[0]["uuid"], rows[1]["uuid"]]
+        assert [r["id"] for r in store.search("7-1SP")] == ["7", "7", "A-6", "2"]
+    finally:
+        store.close()
+
+
+def test_keeps_extra_csv_fields(tmp_path):
+    catalog = tmp_path / "equipments.csv"
+    catalog.write_text(
+        "id,model,status,manufacturer,equipment_type,uuid,created_at,is_validated,notes\n"
+        "1,DS3-H,NULL,APSYSTEMS,MicroInverter,u-1,2024-08-12,False,ok\n"
+        "2,DS3-L,NULL,APSYSTEMS,MicroInverter,u-2,2024-08-12,False,ok,stray\n"
+        "3,DS3\n",
+        encoding="utf-8")
+    store = open_store(tmp_path / "catalog.sqlite", catalog, tmp_path / "none.json")
+    try:
+        first, second, third = store.records()
+    finally:
+        store.close()
+    assert first["notes"] == "ok" and None not in first
+    assert second[None] == ["stray"]
+    assert third["manufacturer"] is None and third["notes"] is None
+
+
+def test_failed_build_leaves_no_temp_file(tmp_path):
+    catalog = tmp_path / "equipments.csv"
+    catalog.write_text("id,model\n1,DS3-H\n", encoding="utf-8")
+    db_path = tmp_path / "catalog.sqlite"
+
+    with pytest.raises(KeyError):
+        build_store(db_path, catalog, tmp_path / "none.json")
+    assert list(tmp_path.iterdir()) == [catalog]
+
+
+def test_prefix_search_uses_normalized_model(write_catalog, tmp_path):
+    rows = [
+        catalog_row(1, "Qcells", "Q.PEAK DUO BLK-G10 400"),
+        catalog_row(2, "Qcells", "Q.PEAK DUO BLK-G10 405"),
+        catalog_row(3, "Qcells", "Q.TRON BLK M-G2+ 420"),
+    ]
+    store = open_store(tmp_path / "catalog.sqlite", write_catalog(rows), tmp_path / "none.json")
+    try:
+        assert [r["id"] for r in store.prefix_search("q.peak duo")] == ["1", "2"]
+        assert [r["id"] for r in store.prefix_search("q.peak duo", "Solar Panel", "Qcells")] == ["1", "2"]
+    finally:
+        store.close()
+
+
+def test_store_without_trigram_tokenizer_still_searches(write_catalog, tmp_path, monkeypatch, capsys):
+    # Same error as a SQLite build without the trigram tokenizer
+    monkeypatch.setattr(catalog_store, "FTS_SCHEMA",
+                        catalog_store.FTS_SCHEMA.replace("'trigram'", "'no_such_tokenizer'"))
+    rows = [
+        catalog_row(1, "Qcells", "Q.PEAK DUO BLK-G10 400"),
+        catalog_row(2, "Qcells", "Q.TRON BLK M-G2+ 420"),
+    ]
+    store = open_store(tmp_path / "catalog.sqlite", write_catalog(rows), tmp_path / "none.json")
+    try:
+        assert "no FTS5 trigram tokenizer" in capsys.readouterr().out
+        assert not store.has_fts
+        assert [r["id"] for r in store.prefix_search("q.peak")] == ["1"]
+        assert [r["id"] for r in store.search("BLK")] == ["1", "2"]
+    finally:
+        store.close()
+
+
+def test_validation_over_store_reports_malformed_rows(tmp_path):
+    constants = Path(__file__).resolve().parents[2] / "src" / "constants"
+    shutil.copy(constants / "equipmentTypes.ts", tmp_path)
+    catalog = tmp_path / "equipments.csv"
+    catalog.write_text(
+        "id,model,status,manufacturer,equipment_type,uuid,created_at,is_validated\n"
+        "1,DS3-H,NULL,APSYSTEMS,MicroInverter,u-1,2024-08-12,False\n"
+        "2,DS3-L,NULL,APSYSTEMS,MicroInverter,u-2,2024-08-12,False,stray\n",
+        encoding="utf-8")
+
+    csv_report, store_report = tmp_path / "csv_report.csv", tmp_path / "store_report.csv"
+    from_csv, held_back_csv = load_catalog(str(catalog), validation_report=csv_report)
+    from_store, held_back_store = load_catalog(str(catalog), tmp_path / "catalog.sqlite", store_report)
+
+    assert from_csv == from_store
+    assert held_back_csv == held_back_store and len(held_back_store) == 1
+    assert list(iter_catalog(str(csv_report))) == list(iter_catalog(str(store_report)))
+    assert "MALFORMED_ROW" in store_report.read_text(encoding="utf-8")
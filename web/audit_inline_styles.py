@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Inline Style Auditor
+Finds every style={{ ... }} object in src/ and reports it as JSON
+
+Walks src/ once for .js/.jsx/.ts/.tsx files, locates each inline style
+object with a brace-balanced scan (strings, template literals and comments
+are skipped, so multi-line objects and nested expressions are handled), and
+records the file, line, source line and the object's top-level property names.
+
+Output is the JSON array the old audit_inline_styles.sh printed, one
+{"file", "line", "content"} object per match, each now with a "properties"
+list as well. --summary wraps it as {"files_scanned", "files_with_inline_styles",
+"total", "property_counts", "matches": [...]} instead.
+
+Usage:
+    python audit_inline_styles.py                      # JSON on stdout
+    python audit_inline_styles.py -o inline_styles.json [--summary] [--workers N] [src/]
+"""
+
+import argparse
+import json
+import re
+import sys
+import time
+from collections import Counter
+
+from css_discovery import find_sources, process_files
+
+STYLE_OBJECT_RE = re.compile(r'\bstyle=\{\s*\{')
+# Characters that open/close nesting or start a string/comment
+_JS_TOKEN_RE = re.compile(r'[{}\[\]()"\'`]|/[/*]')
+_ENTRY_TOKEN_RE = re.compile(r'[,{}\[\]()"\'`]|/[/*]')
+_TEMPLATE_TOKEN_RE = re.compile(r'[\\`]|\$\{')
+_KEY_RE = re.compile(r'\s*(?:(\.\.\.)|([A-Za-z_$][\w$]*)|(["\'])|(\[))')
+_SPACE_OR_COMMENT_RE = re.compile(r'(?:\s+|//[^\n]*|/\*.*?\*/)*', re.DOTALL)
+
+
+# =========================
+# SCANNING
+# =========================
+
+def _skip_string(text, start):
+    """Index just past the quoted string starting at `start`"""
+    quote = text[start]
+    i = start + 1
+    while True:
+        end = text.find(quote, i)
+        if end == -1:
+            return len(text)
+        backslashes = 0
+        j = end - 1
+        while j >= i and text[j] == '\\':
+            backslashes += 1
+            j -= 1
+        if backslashes % 2 == 0:
+            return end + 1
+        i = end + 1
+
+def _skip_template(text, start):
+    """Index just past the template literal starting at `start` (handles ${...})"""
+    i = start + 1
+    while True:
+        m = _TEMPLATE_TOKEN_RE.search(text, i)
+        if m is None:
+            return len(text)
+        token = m.group()
+        if token == '\\':
+            i = m.end() + 1
+        elif token == '`':
+            return m.end()
+        else:
+            i = _match_bracket(text, m.end() - 1)
+
+def _skip_comment(text, start):
+    if text.startswith('//', start):
+        end = text.find('\n', start)
+    else:
+        end = text.find('*/', start + 2)
+        end = end + 1 if end != -1 else end
+    return len(text) if end == -1 else end + 1
+
+def _skip_token(text, m):
+    """Position after a string/template/comment token matched by _JS_TOKEN_RE"""
+    token = m.group()
+    if token == '`':
+        return _skip_template(text, m.start())
+    if token in ('"', "'"):
+        return _skip_string(text, m.start())
+    return _skip_comment(text, m.start())
+
+def _match_bracket(text, start):
+    """Index just past the bracket that closes the one at `start`"""
+    depth = 0
+    pos = start
+    while True:
+        m = _JS_TOKEN_RE.search(text, pos)
+        if m is None:
+            return len(text)
+        token = m.group()
+        if token in '{[(':
+            depth += 1
+            pos = m.end()
+        elif token in '}])':
+            depth -= 1
+            pos = m.end()
+            if depth == 0:
+                return pos
+        else:
+            pos = _skip_token(text, m)
+
+def object_properties(text, start):
+    """
+    Top-level keys of the object literal whose '{' is at `start`.
+
+    Returns (keys, end) where end is just past the closing '}'. Spreads are
+    reported as '...' and computed keys as '[computed]'.
+    """
+    keys = []
+    pos = start + 1
+    while pos < len(text):
+        pos = _SPACE_OR_COMMENT_RE.match(text, pos).end()
+        if pos >= len(text) or text[pos] == '}':
+            return keys, pos + 1
+
+        m = _KEY_RE.match(text, pos)
+        if m:
+            if m.group(1):
+                keys.append('...')
+            elif m.group(2):
+                keys.append(m.group(2))
+            elif m.group(3):
+                end = _skip_string(text, m.end() - 1)
+                keys.append(text[m.end():end - 1])
+            else:
+                keys.append('[computed]')
+
+        # Skip the rest of this entry, up to a top-level ',' or the closing '}'
+        while True:
+            m = _ENTRY_TOKEN_RE.search(text, pos)
+            if m is None:
+                return keys, len(text)
+            token = m.group()
+            if token == ',':
+                pos = m.end()
+                break
+            if token in '{[(':
+                pos = _match_bracket(text, m.start())
+            elif token in ']})':
+                return keys, m.end()
+            else:
+                pos = _skip_token(text, m)
+    return keys, len(text)
+
+def scan_source(text):
+    """Yield (line, source line, property names) for every style={{...}} in JS source"""
+    line = 1
+    last = 0
+    pos = 0
+    while True:
+        m = STYLE_OBJECT_RE.search(text, pos)
+        if m is None:
+            return
+
+        line += text.count('\n', last, m.start())
+        line_start = text.rfind('\n', 0, m.start()) + 1
+        last = m.start()
+
+        line_end = text.find('\n', m.start())
+        source_line = text[line_start:line_end if line_end != -1 else len(text)].strip()
+
+        keys, end = object_properties(text, m.end() - 1)
+        yield line, source_line, keys
+        pos = max(end, m.end())
+
+
+# =========================
+# FILES
+# =========================
+
+def audit_file(filepath):
+    """List of match dicts for one file"""
+    with open(filepath, 'r', encoding='utf-8', errors='replace') as f:
+        text = f.read()
+    if 'style=' not in text:
+        return []
+    return [
+        {'file': filepath, 'line': line, 'content': content, 'properties': keys}
+        for line, content, keys in scan_source(text)
+    ]
+
+def audit(filepaths, workers=None):
+    """Audit many files in parallel; returns the report dict"""
+    matches = []
+    for _, file_matches, _ in process_files(audit_file, filepaths, workers):
+        matches.extend(file_matches)
+
+    property_counts = Counter(key for match in matches for key in match['properties'])
+    return {
+        'files_scanned': len(filepaths),
+        'files_with_inline_styles': len({match['file'] for match in matches}),
+        'total': len(matches),
+        'property_counts': dict(property_counts.most_common()),
+        'matches': matches,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Report style={{...}} inline styles as JSON")
+    parser.add_argument('root', nargs='?', default='src', help="directory to scan (default: src)")
+    parser.add_argument('-o', '--output', help="write JSON here instead of stdout")
+    parser.add_argument('--summary', action='store_true',
+                        help="write an object with per-property counts and the matches, not just the matches")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="worker processes (default: CPU count)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    filepaths = find_sources(args.root)
+    if not filepaths:
+        print(f"No .js/.jsx/.ts/.tsx files under {args.root}", file=sys.stderr)
+        sys.exit(1)
+
+    report = audit(filepaths, args.workers)
+    output = report if args.summary else report['matches']
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(output, f, indent=2)
+    else:
+        json.dump(output, sys.stdout, indent=2)
+        print()
+
+    elapsed = time.perf_counter() - start
+    print(f"{report['total']} inline styles in {report['files_with_inline_styles']} of "
+          f"{report['files_scanned']} files ({elapsed:.2f}s)", file=sys.stderr)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+Benchmark and determinism check for the web CSS tools.
+
+Builds a seeded synthetic corpus of CSS modules (nested @media/@supports,
+keyframes, compound selectors, comments with braces, mixed units, calc(),
+var() fallbacks, !important) next to a snapshot of src/styles, then times
+the spacing converter, both standardizers and css_codemod end to end and
+per phase (read, match, rewrite, write). Every run must produce identical
+output. Runs offline.
+
+Usage:
+    python bench_css_tools.py [--files 1000] [--min-lines 50] [--max-lines 5000]
+                              [--repeats 3] [--seed 1] [--json out.json] [--keep]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+import css_codemod
+import nuclear_spacing_converter
+import standardize_all_buttons
+import standardize_inputs
+from css_scanner import rewrite_rules, scan_rules
+
+SNAPSHOT_DIR = os.path.join('src', 'styles')
+
+CLASS_WORDS = [
+    'card', 'header', 'panel', 'row', 'title', 'list', 'item', 'footer', 'grid', 'badge',
+    'saveButton', 'btnPrimary', 'iconBtn', 'searchInput', 'filterSelect', 'datePicker',
+    'dropdown', 'textField', 'modal', 'tabs',
+]
+LENGTHS = [
+    '0', '1px', '2px', '4px', '6px', '8px', '12px', '16px', '24px', '32px', '40px', '7px',
+    '0.25rem', '0.5rem', '1rem', '1.5rem', '2rem', '50%', 'auto', '1em',
+    'var(--spacing)', 'var(--spacing-xs)', 'var(--spacing-tight)', 'var(--spacing-wide)',
+    'var(--spacing-tight, 0.5rem)', 'calc(var(--spacing) + 2px)', '-8px',
+]
+OTHER_DECLARATIONS = [
+    'display: flex;', 'color: var(--text-primary);', 'border-radius: var(--radius-sm);',
+    'background: rgba(0, 0, 0, 0.3);', 'font-size: var(--text-sm);', 'min-height: 36px;',
+    'height: 32px;', 'line-height: 20px;', "content: '}';", 'transition: all 0.2s;',
+]
+SPACING_PROPERTIES = ['padding', 'margin', 'gap', 'padding-top', 'margin-bottom', 'padding-left']
+
+
+# =========================
+# FIXTURES
+# =========================
+
+def _selector(rng):
+    name = rng.choice(CLASS_WORDS) + str(rng.randint(1, 40))
+    shape = rng.random()
+    if shape < 0.5:
+        return f'.{name}'
+    if shape < 0.65:
+        return f'.{name}:hover'
+    if shape < 0.8:
+        return f'.{rng.choice(CLASS_WORDS)} .{name}'
+    if shape < 0.9:
+        return f'.{name}, .{rng.choice(CLASS_WORDS)}{rng.randint(1, 40)}'
+    return f'.{name}.{rng.choice(CLASS_WORDS)}'
+
+def _declarations(rng, indent):
+    lines = []
+    for _ in range(rng.randint(2, 8)):
+        if rng.random() < 0.55:
+            prop = rng.choice(SPACING_PROPERTIES)
+            count = 1 if '-' in prop or prop == 'gap' else rng.randint(1, 4)
+            value = ' '.join(rng.choice(LENGTHS) for _ in range(count))
+            if rng.random() < 0.05:
+                value += ' !important'
+            lines.append(f'{indent}{prop}: {value};')
+        else:
+            lines.append(f'{indent}{rng.choice(OTHER_DECLARATIONS)}')
+    return lines
+
+def _rule(rng, indent=''):
+    return [f'{indent}{_selector(rng)} {{', *_declarations(rng, indent + '  '), f'{indent}}}', '']
+
+def make_module(path, lines, rng):
+    """Write a CSS module of roughly `lines` lines"""
+    out = [f'/* Synthetic module {os.path.basename(path)} {{ not a rule }} */', '']
+    while len(out) < lines:
+        kind = rng.random()
+        if kind < 0.75:
+            out += _rule(rng)
+        elif kind < 0.88:
+            out.append('@media (max-width: 768px) {')
+            for _ in range(rng.randint(1, 4)):
+                out += _rule(rng, '  ')
+            out += ['}', '']
+        elif kind < 0.95:
+            out.append('@supports (gap: 1px) {')
+            out.append('  @media (min-width: 1200px) {')
+            out += _rule(rng, '    ')
+            out += ['  }', '}', '']
+        else:
+            out += ['@keyframes pulse {', '  from { opacity: 0.4; }', '  to { opacity: 1; }', '}', '']
+
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(out))
+
+def build_corpus(corpus_dir, files, min_lines, max_lines, seed):
+    """Synthetic modules plus a snapshot of src/styles; returns the file list"""
+    rng = random.Random(seed)
+    synthetic = os.path.join(corpus_dir, 'synthetic')
+    os.makedirs(synthetic)
+    for i in range(files):
+        lines = int(rng.triangular(min_lines, max_lines, min_lines))
+        make_module(os.path.join(synthetic, f'Module{i:04d}.module.css'), lines, rng)
+
+    if os.path.isdir(SNAPSHOT_DIR):
+        shutil.copytree(SNAPSHOT_DIR, os.path.join(corpus_dir, 'snapshot'))
+
+    paths = []
+    for directory, _, names in os.walk(corpus_dir):
+        paths += [os.path.join(directory, n) for n in names if n.endswith('.css')]
+    return sorted(paths)
+
+
+# =========================
+# TOOLS
+# =========================
+
+def _button_rewrite(rule):
+    name = rule.find_class(standardize_all_buttons.is_button_class)
+    return None if name is None else standardize_all_buttons.standardize_button_rule(name, rule.body)
+
+def _input_rewrite(rule):
+    name = rule.find_class(standardize_inputs.is_input_class)
+    return None if name is None else standardize_inputs.standardize_input_rule(name, rule.body)
+
+def _spacing_match(content):
+    return list(nuclear_spacing_converter._iter_declarations(content))
+
+def _rules_match(content):
+    return list(scan_rules(content))
+
+ALL_TRANSFORMS = css_codemod.get_transforms()
+
+# name -> (end-to-end file function, match phase, in-memory rewrite phase)
+TOOLS = {
+    'spacing': (
+        lambda path: nuclear_spacing_converter.convert_file(path, verbose=False),
+        _spacing_match,
+        lambda content: nuclear_spacing_converter.convert_css(content)[0],
+    ),
+    'buttons': (
+        lambda path: standardize_all_buttons.standardize_button_file(path, verbose=False),
+        _rules_match,
+        lambda content: rewrite_rules(content, _button_rewrite)[0],
+    ),
+    'inputs': (
+        lambda path: standardize_inputs.standardize_input_file(path, verbose=False),
+        _rules_match,
+        lambda content: rewrite_rules(content, _input_rewrite)[0],
+    ),
+    'codemod': (
+        lambda path: css_codemod.codemod_file(path, ALL_TRANSFORMS),
+        _rules_match,
+        lambda content: css_codemod.codemod_css(content, ALL_TRANSFORMS)[0],
+    ),
+}
+
+
+# =========================
+# BENCHMARKS
+# =========================
+
+def _digest(paths):
+    h = hashlib.sha256()
+    for path in paths:
+        with open(path, 'rb') as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+def time_phases(paths, match, rewrite, scratch):
+    """
+    Seconds spent per phase over all files, plus a digest of the outputs.
+    `match` is the scan alone; `rewrite` is the tool's whole in-memory
+    transform (which does its own scan), so match/rewrite shows scan share.
+    """
+    phases = dict.fromkeys(('read', 'match', 'rewrite', 'write'), 0.0)
+    h = hashlib.sha256()
+    out_path = os.path.join(scratch, 'out.css')
+
+    for path in paths:
+        start = time.perf_counter()
+        with open(path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        phases['read'] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        match(content)
+        phases['match'] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        output = rewrite(content)
+        phases['rewrite'] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        with open(out_path, 'w', encoding='utf-8') as f:
+            f.write(output)
+        phases['write'] += time.perf_counter() - start
+
+        h.update(output.encode('utf-8'))
+    return phases, h.hexdigest()
+
+def time_end_to_end(corpus_dir, work_dir, run_file):
+    """Seconds for the tool's own file function over a fresh copy, plus an output digest"""
+    if os.path.exists(work_dir):
+        shutil.rmtree(work_dir)
+    shutil.copytree(corpus_dir, work_dir)
+    paths = sorted(
+        os.path.join(directory, n)
+        for directory, _, names in os.walk(work_dir) for n in names if n.endswith('.css')
+    )
+
+    start = time.perf_counter()
+    for path in paths:
+        run_file(path)
+    seconds = time.perf_counter() - start
+    return seconds, _digest(paths)
+
+def run(work_dir, files, min_lines, max_lines, repeats, seed):
+    corpus_dir = os.path.join(work_dir, 'corpus')
+    scratch = os.path.join(work_dir, 'scratch')
+    os.makedirs(scratch)
+
+    start = time.perf_counter()
+    paths = build_corpus(corpus_dir, files, min_lines, max_lines, seed)
+    corpus_bytes = 0
+    corpus_lines = 0
+    for path in paths:
+        with open(path, 'rb') as f:
+            data = f.read()
+        corpus_bytes += len(data)
+        corpus_lines += data.count(b'\n') + 1
+    results = {
+        'corpus': {
+            'files': len(paths),
+            'synthetic_files': files,
+            'bytes': corpus_bytes,
+            'lines': corpus_lines,
+            'seed': seed,
+            'build_seconds': time.perf_counter() - start,
+        },
+        'repeats': repeats,
+        'tools': {},
+        'errors': [],
+    }
+
+    for name, (run_file, match, rewrite) in TOOLS.items():
+        end_to_end = []
+        phase_runs = []
+        digests = set()
+
+        for _ in range(repeats):
+            seconds, digest = time_end_to_end(corpus_dir, os.path.join(work_dir, name), run_file)
+            end_to_end.append(seconds)
+            digests.add(('file', digest))
+
+            phases, digest = time_phases(paths, match, rewrite, scratch)
+            phase_runs.append(phases)
+            digests.add(('memory', digest))
+
+        if len({d for kind, d in digests if kind == 'file'}) > 1:
+            results['errors'].append(f"{name}: file output differs between runs")
+        if len({d for kind, d in digests if kind == 'memory'}) > 1:
+            results['errors'].append(f"{name}: in-memory output differs between runs")
+
+        best = min(end_to_end)
+        results['tools'][name] = {
+            'end_to_end_seconds': end_to_end,
+            'best_seconds': best,
+            'median_seconds': statistics.median(end_to_end),
+            'mb_per_second': corpus_bytes / best / 1e6,
+            'phases_seconds': {
+                phase: min(run[phase] for run in phase_runs) for phase in phase_runs[0]
+            },
+        }
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--files", type=int, default=1000, help="synthetic modules to generate")
+    parser.add_argument("--min-lines", type=int, default=50, help="smallest synthetic module")
+    parser.add_argument("--max-lines", type=int, default=5000, help="largest synthetic module")
+    parser.add_argument("--repeats", type=int, default=3, help="runs per tool")
+    parser.add_argument("--seed", type=int, default=1, help="corpus random seed")
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--keep", action="store_true", help="keep the generated work dir")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="css_bench_")
+    try:
+        results = run(work_dir, args.files, args.min_lines, args.max_lines, args.repeats, args.seed)
+    finally:
+        if args.keep:
+            print(f"Work dir kept: {work_dir}")
+        else:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    corpus = results["corpus"]
+    print(f"Corpus: {corpus['files']} files, {corpus['lines']:,} lines, "
+          f"{corpus['bytes'] / 1e6:.1f} MB (seed {corpus['seed']})\n")
+    print(f"{'tool':<10} {'best s':>8} {'median s':>9} {'MB/s':>7}   "
+          f"{'read':>6} {'match':>6} {'rewrite':>7} {'write':>6}")
+    for name, tool in results["tools"].items():
+        phases = tool["phases_seconds"]
+        print(f"{name:<10} {tool['best_seconds']:>8.3f} {tool['median_seconds']:>9.3f} "
+              f"{tool['mb_per_second']:>7.1f}   {phases['read']:>6.3f} {phases['match']:>6.3f} "
+              f"{phases['rewrite']:>7.3f} {phases['write']:>6.3f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.json}")
+
+    if results["errors"]:
+        print(f"\n✗ {len(results['errors'])} determinism error(s):")
+        for error in results["errors"]:
+            print(f"  - {error}")
+        sys.exit(1)
+
+    print("\n✓ Output identical across runs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Benchmark and regression check for logo_inserter.
+
+Generates synthetic plansets (portrait, landscape and ARCH D) and sample
+PDF/image logos in a temp LOGO_DIR, then times single-file and batch
+stamping, records file growth across repeated incremental saves and
+verifies that the logo lands where it should. Runs offline.
+
+Usage:
+    python bench_logo_inserter.py [--pages 20] [--batch 10] [--repeats 3] [--json out.json]
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import fitz  # PyMuPDF
+
+import logo_inserter
+
+POINTS_PER_INCH = logo_inserter.POINTS_PER_INCH
+
+# Sheet sizes in inches (width, height)
+PAGE_SIZES = {
+    "portrait": (11, 17),
+    "landscape": (17, 11),
+    "arch_d": (24, 36),
+}
+
+# Logo marker colour, checked by sampling the rendered page
+LOGO_RGB = (255, 0, 0)
+
+# Where the PDF logo draws its marker, in inches from the top-left corner
+PDF_LOGO_MARK = (1.0, 1.0, 3.0, 2.0)
+
+
+# =========================
+# FIXTURES
+# =========================
+
+def make_planset(path: str, size: tuple, pages: int):
+    """Write a planset with some text and linework on every sheet."""
+    width, height = (v * POINTS_PER_INCH for v in size)
+    doc = fitz.open()
+    for number in range(pages):
+        page = doc.new_page(width=width, height=height)
+        page.insert_text((36, 48), f"SHEET {number + 1} — BENCHMARK PLANSET", fontsize=18)
+        for i in range(40):
+            y = 72 + i * (height - 144) / 40
+            page.draw_line((36, y), (width / 2, y), color=(0, 0, 0), width=0.5)
+    doc.save(path)
+    doc.close()
+
+
+def make_pdf_logo(path: str, size: tuple):
+    """Write a sheet-sized logo PDF with a solid marker block."""
+    width, height = (v * POINTS_PER_INCH for v in size)
+    doc = fitz.open()
+    page = doc.new_page(width=width, height=height)
+    page.draw_rect(_mark_rect(), color=None, fill=tuple(c / 255 for c in LOGO_RGB))
+    doc.save(path)
+    doc.close()
+
+
+def make_image_logo(path: str, width: int = 3840, height: int = 2160):
+    """Write a large solid PNG logo (the oversized 4K case)."""
+    pix = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, width, height), False)
+    pix.set_rect(pix.irect, LOGO_RGB)
+    pix.save(path)
+
+
+def _mark_rect() -> fitz.Rect:
+    return fitz.Rect(*(v * POINTS_PER_INCH for v in PDF_LOGO_MARK))
+
+
+def _image_logo_rect(page_rect: fitz.Rect) -> fitz.Rect:
+    """Expected image logo box (mirrors _stamp_image_logo)."""
+    size = logo_inserter.IMAGE_LOGO_SIZE * POINTS_PER_INCH
+    x = page_rect.width - size - 0.75 * POINTS_PER_INCH - 0.5 * POINTS_PER_INCH
+    y = page_rect.height - size - 0.75 * POINTS_PER_INCH - 0.75 * POINTS_PER_INCH
+    return fitz.Rect(x, y, x + size, y + size)
+
+
+# =========================
+# CHECKS
+# =========================
+
+def _has_logo_colour(page, rect: fitz.Rect) -> bool:
+    """Render a small patch at the centre of `rect` and compare colours."""
+    centre = fitz.Point((rect.x0 + rect.x1) / 2, (rect.y0 + rect.y1) / 2)
+    clip = fitz.Rect(centre.x - 1, centre.y - 1, centre.x + 1, centre.y + 1)
+    pix = page.get_pixmap(clip=clip, dpi=72)
+    return tuple(pix.pixel(0, 0)[:3]) == LOGO_RGB
+
+
+def verify_pdf_logo(pdf_path: str) -> list[str]:
+    errors = []
+    with fitz.open(pdf_path) as doc:
+        for page in doc:
+            if not _has_logo_colour(page, _mark_rect()):
+                errors.append(f"{os.path.basename(pdf_path)} p{page.number + 1}: PDF logo missing")
+    return errors
+
+
+def verify_image_logo(pdf_path: str) -> list[str]:
+    errors = []
+    with fitz.open(pdf_path) as doc:
+        for page in doc:
+            expected = _image_logo_rect(page.rect)
+            name = f"{os.path.basename(pdf_path)} p{page.number + 1}"
+
+            boxes = [fitz.Rect(info["bbox"]) for info in page.get_image_info()]
+            if not boxes:
+                errors.append(f"{name}: image logo missing")
+                continue
+
+            # keep_proportion may letterbox inside the box, so check containment
+            box = boxes[0]
+            if not (expected + (-1, -1, 1, 1)).contains(box):
+                errors.append(f"{name}: image logo at {tuple(box)} outside {tuple(expected)}")
+            elif abs(box.x0 + box.x1 - expected.x0 - expected.x1) > 1 or \
+                    abs(box.y0 + box.y1 - expected.y0 - expected.y1) > 1:
+                errors.append(f"{name}: image logo not centred in {tuple(expected)}")
+            elif not _has_logo_colour(page, expected):
+                errors.append(f"{name}: image logo not visible")
+    return errors
+
+
+# =========================
+# BENCHMARKS
+# =========================
+
+def _stamp_timed(pdf_path: str, client: str) -> float:
+    start = time.perf_counter()
+    logo_inserter.add_company_logo(pdf_path, client)
+    return time.perf_counter() - start
+
+
+def run(work_dir: str, pages: int, batch: int, repeats: int) -> dict:
+    logo_dir = os.path.join(work_dir, "logos")
+    plan_dir = os.path.join(work_dir, "plansets")
+    os.makedirs(logo_dir)
+    os.makedirs(plan_dir)
+
+    logo_inserter.LOGO_CONFIG["logo_dirs"] = [logo_dir]
+    logo_inserter.LOGO_CONFIG["logo_cache_dir"] = os.path.join(work_dir, "variants")
+
+    make_image_logo(os.path.join(logo_dir, "Bench Image Logo.png"))
+
+    results = {"pages": pages, "batch": batch, "repeats": repeats, "cases": [], "errors": []}
+
+    for size_name, size in PAGE_SIZES.items():
+        pdf_client = f"Bench PDF {size_name}"
+        make_pdf_logo(os.path.join(logo_dir, f"{pdf_client} Logo.pdf"), size)
+
+        for client, verify in ((pdf_client, verify_pdf_logo), ("Bench Image", verify_image_logo)):
+            case = {"size": size_name, "logo": "pdf" if verify is verify_pdf_logo else "image"}
+            prefix = f"{size_name}_{case['logo']}"
+
+            # Single file
+            single = os.path.join(plan_dir, f"{prefix}_single.pdf")
+            make_planset(single, size, pages)
+            case["bytes_before"] = os.path.getsize(single)
+            case["single_seconds"] = _stamp_timed(single, client)
+            results["errors"].extend(verify(single))
+
+            # Growth across repeated incremental saves
+            sizes = [os.path.getsize(single)]
+            for _ in range(repeats - 1):
+                _stamp_timed(single, client)
+                sizes.append(os.path.getsize(single))
+            case["bytes_after_each_run"] = sizes
+
+            # Batch of fresh copies
+            template = os.path.join(plan_dir, f"{prefix}_template.pdf")
+            make_planset(template, size, pages)
+            copies = []
+            for i in range(batch):
+                copy = os.path.join(plan_dir, f"{prefix}_batch_{i}.pdf")
+                shutil.copyfile(template, copy)
+                copies.append(copy)
+
+            start = time.perf_counter()
+            for copy in copies:
+                logo_inserter.add_company_logo(copy, client)
+            case["batch_seconds"] = time.perf_counter() - start
+            case["batch_pages_per_second"] = batch * pages / case["batch_seconds"]
+
+            results["cases"].append(case)
+
+    results["metrics"] = logo_inserter.METRICS.snapshot()["totals"]
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, default=20, help="sheets per planset")
+    parser.add_argument("--batch", type=int, default=10, help="plansets per batch run")
+    parser.add_argument("--repeats", type=int, default=3, help="stamping runs on the same file")
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--keep", action="store_true", help="keep the generated work dir")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="logo_bench_")
+    try:
+        results = run(work_dir, args.pages, args.batch, args.repeats)
+    finally:
+        if args.keep:
+            print(f"Work dir kept: {work_dir}")
+        else:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    print(f"{'case':<20} {'single s':>9} {'batch s':>9} {'pages/s':>9}  bytes per run")
+    for case in results["cases"]:
+        name = f"{case['size']}/{case['logo']}"
+        print(f"{name:<20} {case['single_seconds']:>9.3f} {case['batch_seconds']:>9.3f} "
+              f"{case['batch_pages_per_second']:>9.1f}  {case['bytes_after_each_run']}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.json}")
+
+    if results["errors"]:
+        print(f"\n✗ {len(results['errors'])} placement error(s):")
+        for error in results["errors"]:
+            print(f"  - {error}")
+        sys.exit(1)
+
+    print("\n✓ All logos placed correctly")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Converged-file cache for the CSS standardizers
+
+Remembers the content hashes of files a tool has already normalized, so
+re-runs (e.g. from a pre-commit hook) skip them without parsing. Entries
+are tied to the tool's transform version; bumping it invalidates them.
+
+Cache files live in web/.cache/<tool>.json
+"""
+
+import hashlib
+import json
+import os
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache')
+
+
+def content_hash(content):
+    """Stable hash of file content (str)"""
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+class ConvergedCache:
+    """
+    Content hashes known to be fixed points of a tool at a given version.
+
+    Lookups first compare (mtime, size) against the last time the path was
+    seen, so unchanged files are skipped without even being read.
+    """
+
+    def __init__(self, tool, version, cache_dir=CACHE_DIR):
+        self.path = os.path.join(cache_dir, f'{tool}.json')
+        self.version = str(version)
+        self.hashes = set()
+        self.stats = {}
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False
+
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        if data.get('version') == self.version:
+            self.hashes = set(data.get('hashes', []))
+            self.stats = data.get('stats', {})
+
+    def is_converged(self, filepath):
+        """True if the file's current content is a known converged output"""
+        key = os.path.realpath(filepath)
+        stat = os.stat(filepath)
+        seen = self.stats.get(key)
+
+        if seen and seen[0] == stat.st_mtime_ns and seen[1] == stat.st_size and seen[2] in self.hashes:
+            self.hits += 1
+            return True
+
+        with open(filepath, 'r', encoding='utf-8') as f:
+            digest = content_hash(f.read())
+
+        if digest in self.hashes:
+            self.stats[key] = [stat.st_mtime_ns, stat.st_size, digest]
+            self._dirty = True
+            self.hits += 1
+            return True
+
+        self.misses += 1
+        return False
+
+    def mark_converged(self, filepath, content=None):
+        """Record the file's current content (after the tool ran) as converged"""
+        if content is None:
+            with open(filepath, 'r', encoding='utf-8') as f:
+                content = f.read()
+
+        digest = content_hash(content)
+        stat = os.stat(filepath)
+        self.hashes.add(digest)
+        self.stats[os.path.realpath(filepath)] = [stat.st_mtime_ns, stat.st_size, digest]
+        self._dirty = True
+
+    def save(self):
+        if not self._dirty:
+            return
+
+        # Keep only files that still exist and the hashes they point at
+        self.stats = {path: seen for path, seen in self.stats.items() if os.path.exists(path)}
+        self.hashes = {seen[2] for seen in self.stats.values()}
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f'{self.path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'version': self.version,
+                'hashes': sorted(self.hashes),
+                'stats': self.stats,
+            }, f)
+        os.replace(tmp_path, self.path)
+        self._dirty = False
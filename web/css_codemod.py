@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+CSS Codemod Runner
+Applies the button, input and spacing standardizers in one read/write per file
+
+Each file is parsed once into a Stylesheet (style rule blocks from
+css_scanner + the raw text between them). Registered transforms run over that model in a fixed order
+and the file is written once, only if something changed.
+
+Usage:
+    python css_codemod.py                        # doctrine file list (css_discovery)
+    python css_codemod.py src/styles --only buttons,inputs [--workers N]
+    python css_codemod.py --live-only            # skip classes no component uses (css_usage)
+"""
+
+import argparse
+import functools
+import os
+import sys
+import time
+from collections import Counter, namedtuple
+
+import nuclear_spacing_converter
+import standardize_all_buttons
+import standardize_inputs
+from codemod_cache import ConvergedCache
+from css_discovery import discover, print_slowest, process_files
+from css_scanner import required_classes, scan_rules
+from css_usage import build_index, live_class_map
+from file_transaction import FileTransaction, TransactionError, read_snapshot
+from nuclear_spacing_converter import collect_files, convert_css
+from standardize_all_buttons import is_button_class, standardize_button_rule
+from standardize_inputs import is_input_class, standardize_input_rule
+
+
+# =========================
+# MODEL
+# =========================
+
+class Rule:
+    """The declaration block of one style rule (selectors stay in the raw text)"""
+
+    __slots__ = ('css_rule', 'body', 'locked', 'live_classes')
+
+    def __init__(self, css_rule, live_classes=None):
+        self.css_rule = css_rule
+        self.body = css_rule.body
+        # Properties a transform has taken ownership of; later transforms leave them alone
+        self.locked = set()
+        # Classes components actually use (None = treat every class as live)
+        self.live_classes = live_classes
+
+    def find_class(self, predicate):
+        """First subject class matching predicate, ignoring dead classes"""
+        if self.live_classes is None:
+            return self.css_rule.find_class(predicate)
+        return self.css_rule.find_class(lambda name: name in self.live_classes and predicate(name))
+
+    @property
+    def dead(self):
+        """True if every selector needs a class no component uses, so the rule never applies"""
+        if self.live_classes is None:
+            return False
+        return all(
+            any(name not in self.live_classes for name in required_classes(selector))
+            for selector in self.css_rule.selectors
+        )
+
+    def set_body(self, body):
+        """Replace the body; returns True if it changed"""
+        if body == self.body:
+            return False
+        self.body = body
+        return True
+
+    def serialize(self):
+        return self.body
+
+
+class Stylesheet:
+    """A CSS file as an ordered list of raw text chunks and Rules"""
+
+    def __init__(self, content, live_classes=None):
+        self.original = content
+        self.parts = []
+
+        last = 0
+        for css_rule in scan_rules(content):
+            if css_rule.start > last:
+                self.parts.append(content[last:css_rule.start])
+            self.parts.append(Rule(css_rule, live_classes))
+            last = css_rule.end
+        if last < len(content):
+            self.parts.append(content[last:])
+
+    def rules(self):
+        return [part for part in self.parts if isinstance(part, Rule)]
+
+    def serialize(self):
+        return ''.join(
+            part.serialize() if isinstance(part, Rule) else part
+            for part in self.parts
+        )
+
+
+# =========================
+# TRANSFORMS
+# =========================
+
+# name, run order (lower first), version (bump when output changes), apply(sheet) -> changes
+Transform = namedtuple('Transform', 'name order version apply')
+
+TRANSFORMS = {}
+
+def register_transform(name, order, version=1):
+    """Register a Stylesheet transform under `name`"""
+    def decorator(fn):
+        TRANSFORMS[name] = Transform(name, order, version, fn)
+        return fn
+    return decorator
+
+def get_transforms(names=None):
+    """Transforms to run, in run order (all registered ones by default)"""
+    if names is None:
+        selected = TRANSFORMS.values()
+    else:
+        unknown = set(names) - set(TRANSFORMS)
+        if unknown:
+            raise ValueError(f"Unknown transform(s): {', '.join(sorted(unknown))}")
+        selected = [TRANSFORMS[name] for name in names]
+    return sorted(selected, key=lambda t: t.order)
+
+
+# Component rules run first and lock the padding they own, so the generic
+# spacing pass does not turn their var(--spacing-xs) back into var(--spacing)
+@register_transform('buttons', order=10, version=standardize_all_buttons.TRANSFORM_VERSION)
+def buttons_transform(sheet):
+    changes = 0
+    for rule in sheet.rules():
+        class_name = rule.find_class(is_button_class)
+        if class_name is not None:
+            if rule.set_body(standardize_button_rule(class_name, rule.body)):
+                changes += 1
+            rule.locked.add('padding')
+    return changes
+
+@register_transform('inputs', order=20, version=standardize_inputs.TRANSFORM_VERSION)
+def inputs_transform(sheet):
+    changes = 0
+    for rule in sheet.rules():
+        class_name = rule.find_class(is_input_class)
+        if class_name is not None:
+            if rule.set_body(standardize_input_rule(class_name, rule.body)):
+                changes += 1
+            rule.locked.add('padding')
+    return changes
+
+@register_transform('spacing', order=30, version=nuclear_spacing_converter.TRANSFORM_VERSION)
+def spacing_transform(sheet):
+    changes = 0
+    for i, part in enumerate(sheet.parts):
+        if isinstance(part, Rule):
+            if part.dead:
+                continue
+            body, counts = convert_css(part.body, skip=part.locked)
+            part.set_body(body)
+        else:
+            sheet.parts[i], counts = convert_css(part)
+        changes += sum(counts.values())
+    return changes
+
+
+# =========================
+# RUNNER
+# =========================
+
+def codemod_css(content, transforms, live_classes=None):
+    """Run transforms over CSS text; returns (new content, Counter of changes per transform)
+
+    With live_classes, rules for other classes are left as they are.
+    """
+    sheet = Stylesheet(content, live_classes)
+    changes = Counter()
+    for transform in transforms:
+        count = transform.apply(sheet)
+        if count:
+            changes[transform.name] += count
+    return sheet.serialize(), changes
+
+def codemod_snapshot(filepath, transforms, live_classes=None):
+    """(Counter of changes, (new content, snapshot) or None) - computed only, nothing written
+
+    Stage the second item on a FileTransaction to write it.
+    """
+    content, snapshot = read_snapshot(filepath)
+    new_content, changes = codemod_css(content, transforms, live_classes)
+    return changes, (new_content, snapshot) if new_content != content else None
+
+def codemod_file(filepath, transforms, live_classes=None):
+    """Read, transform and (only if changed) write one file"""
+    changes, staged = codemod_snapshot(filepath, transforms, live_classes)
+    if staged:
+        with FileTransaction() as transaction:
+            transaction.stage(filepath, *staged)
+    return changes
+
+def open_cache(transforms):
+    """Converged-file cache for this exact set and version of transforms"""
+    tool = 'css_codemod-' + '-'.join(t.name for t in transforms)
+    version = ','.join(f"{t.name}:{t.version}" for t in transforms)
+    return ConvergedCache(tool, version)
+
+def _codemod_worker(filepath, names, live=None):
+    live_classes = live.get(os.path.realpath(filepath)) if live else None
+    return codemod_snapshot(filepath, get_transforms(names), live_classes)
+
+def run(filepaths, names=None, workers=None, use_cache=True, live_only=False):
+    """Run the codemods over many files and print a summary
+
+    Every file is transformed before any is written; the changes are then
+    committed as one FileTransaction (TransactionError if that fails, with
+    no file modified).
+
+    live_only restricts them to classes some component uses (css_usage
+    index of src/). The converged cache is bypassed then, since its
+    entries assume every rule was converted.
+    """
+    start = time.perf_counter()
+    totals = Counter()
+    changed_files = 0
+    timings = []
+
+    live = live_class_map(build_index()) if live_only else None
+    if live_only:
+        use_cache = False
+
+    cache = open_cache(get_transforms(names)) if use_cache else None
+    pending = [f for f in filepaths if not (cache and cache.is_converged(f))]
+
+    worker = functools.partial(_codemod_worker, names=names, live=live)
+    transaction = FileTransaction()
+    for filepath, (changes, staged), seconds in process_files(worker, pending, workers):
+        timings.append((filepath, seconds))
+        if staged:
+            transaction.stage(filepath, *staged)
+        if changes:
+            changed_files += 1
+            totals.update(changes)
+            detail = ', '.join(f"{name} {count}" for name, count in sorted(changes.items()))
+            print(f"Updated {filepath} ({detail})")
+
+    transaction.commit()
+    if cache:
+        for filepath in pending:
+            cache.mark_converged(filepath)
+        cache.save()
+
+    print_slowest(timings)
+
+    elapsed = time.perf_counter() - start
+    print(f"\n{'='*60}")
+    print(f"SUMMARY: Changed {changed_files} of {len(filepaths)} files ({elapsed:.2f}s)")
+    if len(pending) < len(filepaths):
+        print(f"  skipped {len(filepaths) - len(pending)} already-converged files (cache)")
+    if live_only:
+        print("  restricted to live classes (css_usage)")
+    for transform in get_transforms(names):
+        print(f"  {transform.name}: {totals[transform.name]}")
+    print(f"{'='*60}")
+    return totals
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply the CSS standardizers in one pass per file")
+    parser.add_argument('targets', nargs='*',
+                        help="CSS files, directories or globs (default: doctrine file list)")
+    parser.add_argument('--only', help=f"comma-separated transforms ({', '.join(TRANSFORMS)})")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="worker processes (default: CPU count)")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="re-check every file even if it is known to be converged")
+    parser.add_argument('--live-only', action='store_true',
+                        help="only rewrite rules for classes some component uses")
+    args = parser.parse_args()
+
+    names = args.only.split(',') if args.only else None
+    try:
+        get_transforms(names)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    filepaths = collect_files(args.targets) if args.targets else discover()
+    if not filepaths:
+        print("No CSS files matched")
+        sys.exit(1)
+
+    try:
+        run(filepaths, names, args.workers, use_cache=not args.no_cache, live_only=args.live_only)
+    except TransactionError as e:
+        print(f"\nERROR: {e}")
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
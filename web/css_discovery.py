@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Shared file discovery and worker pool for the CSS standardizers
+
+One os.scandir walk applies the include patterns and the ui/ + dev/
+exclusions while walking (excluded directories are never entered), and
+de-duplicates by real path, so overlapping patterns cannot process a file
+twice. find_sources() lists the JS/TS component sources that
+audit_inline_styles and css_usage read. process_files() fans the list
+out over a process pool and reports how long each file took.
+"""
+
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# Files to process (excluding ui/ and dev/ per doctrine)
+DOCTRINE_INCLUDES = [
+    'src/components/common/*.module.css',
+    'src/components/pdf/*.module.css',
+    'src/components/project/**/*.module.css',
+    'src/pages/*.module.css',
+    'src/styles/*.module.css',
+]
+DOCTRINE_EXCLUDED_DIRS = frozenset({'ui', 'dev'})
+
+# Component sources (JS/TS) scanned for inline styles and CSS module usage
+SOURCE_EXTENSIONS = ('.js', '.jsx', '.ts', '.tsx')
+SKIPPED_DIRS = frozenset({'node_modules', 'build', '.git'})
+
+
+def _glob_to_regex(pattern):
+    """Translate a '/'-separated glob (with ** for any depth) into a regex"""
+    out = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith('**/', i):
+            out.append('(?:[^/]+/)*')
+            i += 3
+        elif pattern[i] == '*':
+            out.append('[^/]*')
+            i += 1
+        elif pattern[i] == '?':
+            out.append('[^/]')
+            i += 1
+        else:
+            out.append(re.escape(pattern[i]))
+            i += 1
+    return ''.join(out)
+
+
+def _literal_prefix(pattern):
+    """Directory part of a pattern before its first wildcard"""
+    parts = []
+    for part in pattern.split('/')[:-1]:
+        if any(c in part for c in '*?['):
+            break
+        parts.append(part)
+    return '/'.join(parts)
+
+
+def _include_regex(includes):
+    return re.compile('(?:%s)\\Z' % '|'.join(_glob_to_regex(p) for p in includes))
+
+
+def path_matcher(includes=DOCTRINE_INCLUDES, excluded_dirs=DOCTRINE_EXCLUDED_DIRS):
+    """
+    Predicate for '/'-separated paths relative to the discovery root: true
+    if the path matches an include pattern and no directory on it is excluded
+    (the same rule discover() applies while walking).
+    """
+    include_re = _include_regex(includes)
+
+    def matches(rel_path):
+        if excluded_dirs.intersection(rel_path.split('/')[:-1]):
+            return False
+        return include_re.match(rel_path) is not None
+    return matches
+
+
+def discover(includes=DOCTRINE_INCLUDES, excluded_dirs=DOCTRINE_EXCLUDED_DIRS, root='.'):
+    """
+    Walk `root` once and return the sorted files matching any include pattern.
+
+    Patterns are relative to `root`. Directories named in `excluded_dirs`
+    are pruned, and only directories that can still lead to a match are
+    entered.
+    """
+    include_re = _include_regex(includes)
+    # (literal prefix, may recurse below it)
+    prefixes = [(_literal_prefix(p), '**' in p) for p in includes]
+
+    def worth_entering(rel_dir):
+        for prefix, recursive in prefixes:
+            if prefix == rel_dir or prefix.startswith(rel_dir + '/') or rel_dir == '':
+                return True
+            if recursive and rel_dir.startswith(prefix + '/'):
+                return True
+        return False
+
+    found = {}
+    stack = ['']
+    while stack:
+        rel_dir = stack.pop()
+        try:
+            entries = os.scandir(os.path.join(root, rel_dir) if rel_dir else root)
+        except OSError:
+            continue
+
+        with entries:
+            for entry in entries:
+                rel_path = f'{rel_dir}/{entry.name}' if rel_dir else entry.name
+                if entry.is_dir():
+                    if entry.name not in excluded_dirs and worth_entering(rel_path):
+                        stack.append(rel_path)
+                elif include_re.match(rel_path):
+                    path = os.path.join(root, rel_path) if root != '.' else rel_path
+                    found.setdefault(os.path.realpath(path), path)
+
+    return sorted(found.values())
+
+
+def find_sources(root='src'):
+    """All .js/.jsx/.ts/.tsx files under `root` in one scandir walk, sorted"""
+    found = []
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            entries = os.scandir(directory)
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in SKIPPED_DIRS:
+                        stack.append(entry.path)
+                elif entry.name.endswith(SOURCE_EXTENSIONS):
+                    found.append(entry.path.replace(os.sep, '/'))
+    return sorted(found)
+
+
+def _timed_call(args):
+    fn, filepath = args
+    start = time.perf_counter()
+    result = fn(filepath)
+    return filepath, result, time.perf_counter() - start
+
+
+def process_files(fn, filepaths, workers=None):
+    """
+    Run fn(filepath) for every file, across a process pool when there is
+    more than one file. fn must be picklable (a module-level function or a
+    functools.partial of one).
+
+    Yields (filepath, result, seconds) in input order.
+    """
+    jobs = [(fn, filepath) for filepath in filepaths]
+    if len(jobs) <= 1 or workers == 1:
+        yield from map(_timed_call, jobs)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(_timed_call, jobs, chunksize=8)
+
+
+def print_slowest(timings, count=5):
+    """Print the slowest files from a list of (filepath, seconds)"""
+    if not timings:
+        return
+    print("\nSlowest files:")
+    for filepath, seconds in sorted(timings, key=lambda t: t[1], reverse=True)[:count]:
+        print(f"  {seconds * 1000:8.1f} ms  {filepath}")
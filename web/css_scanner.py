@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Brace-depth-aware CSS rule scanner for the standardizers
+
+Walks a stylesheet once, jumping between structural characters, and yields
+every style rule with its full selector list, its declaration block and the
+at-rules (@media, @supports, ...) it sits in. Comments and strings are
+skipped, so braces inside them never confuse the depth tracking.
+"""
+
+import re
+from collections import namedtuple
+
+# At-rules whose blocks contain rules rather than declarations
+NESTING_AT_RULES = frozenset({
+    'media', 'supports', 'container', 'layer', 'document', '-moz-document',
+    'scope', 'starting-style', 'keyframes', '-webkit-keyframes',
+})
+
+# Characters the scanner has to stop at (inside a rule block ';' doesn't matter)
+_TOKEN_RE = re.compile(r'/\*|["\'{};]')
+_BLOCK_TOKEN_RE = re.compile(r'/\*|["\'{}]')
+_COMMENT_RE = re.compile(r'/\*.*?\*/', re.DOTALL)
+_AT_RULE_NAME_RE = re.compile(r'@([\w-]+)')
+_CLASS_RE = re.compile(r'\.(-?[_a-zA-Z][\w-]*)')
+_PARENS_RE = re.compile(r'\([^()]*\)|\[[^\[\]]*\]')
+_COMBINATOR_RE = re.compile(r'\s*[>+~]\s*|\s+')
+_NOT_RE = re.compile(r':not\((?:[^()]|\([^()]*\))*\)', re.IGNORECASE)
+_GLOBAL_OR_ATTR_RE = re.compile(r':global\((?:[^()]|\([^()]*\))*\)|\[[^\[\]]*\]')
+# ::before, ::-webkit-scrollbar, ... plus the legacy single-colon forms
+_PSEUDO_ELEMENT_RE = re.compile(r'::|:(?:before|after|first-line|first-letter)\b', re.IGNORECASE)
+
+
+class CssRule(namedtuple('CssRule', 'selectors body context start end')):
+    """
+    A style rule: selector list, declaration block text, enclosing at-rule
+    preludes (outermost first) and the [start, end) span of the block.
+    """
+
+    __slots__ = ()
+
+    @property
+    def classes(self):
+        """Classes on the styled element (last compound) of each selector, in order"""
+        seen = []
+        for selector in self.selectors:
+            for name in subject_classes(selector):
+                if name not in seen:
+                    seen.append(name)
+        return seen
+
+    def find_class(self, predicate):
+        """First class in `classes` for which predicate(name) is true, else None"""
+        for name in self.classes:
+            if predicate(name):
+                return name
+        return None
+
+
+def split_selectors(prelude):
+    """Split a selector list on top-level commas"""
+    if '(' not in prelude and '[' not in prelude:
+        return [s for s in (part.strip() for part in prelude.split(',')) if s]
+
+    selectors = []
+    depth = 0
+    start = 0
+    for i, char in enumerate(prelude):
+        if char in '([':
+            depth += 1
+        elif char in ')]':
+            depth -= 1
+        elif char == ',' and depth == 0:
+            selectors.append(prelude[start:i].strip())
+            start = i + 1
+    selectors.append(prelude[start:].strip())
+    return [s for s in selectors if s]
+
+
+def subject_classes(selector):
+    """
+    Class names on the last compound selector, e.g. `.a .b.c:hover` -> ['b', 'c'].
+    Empty when the selector styles a pseudo-element (`.b::placeholder`).
+    """
+    # Drop :not(...), :is(...), [attr=...] so their classes and spaces don't count
+    previous = None
+    while previous != selector:
+        previous = selector
+        selector = _PARENS_RE.sub('', selector)
+
+    compounds = _COMBINATOR_RE.split(selector.strip())
+    if not compounds or _PSEUDO_ELEMENT_RE.search(compounds[-1]):
+        return []
+    return _CLASS_RE.findall(compounds[-1])
+
+
+def selector_classes(selector):
+    """Every local class a selector mentions (anywhere, not only the subject); :global(...) excluded"""
+    return _CLASS_RE.findall(_GLOBAL_OR_ATTR_RE.sub('', selector))
+
+
+def required_classes(selector):
+    """
+    Classes an element must carry for the selector to match: selector_classes()
+    minus those inside :not(...), e.g. `.a:not(.b)` -> ['a'].
+    """
+    return selector_classes(_NOT_RE.sub('', selector))
+
+
+def _skip_string(content, start):
+    """Index just past the string literal starting at `start`"""
+    quote = content[start]
+    i = start + 1
+    while True:
+        end = content.find(quote, i)
+        if end == -1:
+            return len(content)
+        backslashes = 0
+        j = end - 1
+        while j >= i and content[j] == '\\':
+            backslashes += 1
+            j -= 1
+        if backslashes % 2 == 0:
+            return end + 1
+        i = end + 1
+
+
+def scan_rules(content):
+    """
+    Yield a CssRule for every style rule in `content`, in source order.
+
+    Rules nested directly inside another rule (CSS nesting) are part of
+    the outer rule's block rather than yielded separately. Unbalanced
+    closing braces are ignored; a rule left open at EOF is not yielded.
+    """
+    context = []
+    # Open blocks: ('at',) | ('rule', selectors, body_start) | ('nested',)
+    stack = []
+    prelude_start = 0
+    pos = 0
+    in_rule = False
+
+    while True:
+        m = (_BLOCK_TOKEN_RE if in_rule else _TOKEN_RE).search(content, pos)
+        if m is None:
+            return
+
+        token = m.group()
+        i = m.start()
+        pos = m.end()
+
+        if token == '/*':
+            end = content.find('*/', pos)
+            pos = len(content) if end == -1 else end + 2
+        elif token == '"' or token == "'":
+            pos = _skip_string(content, i)
+        elif token == ';':
+            if not in_rule:
+                prelude_start = pos
+        elif token == '{':
+            if in_rule:
+                stack.append(('nested',))
+                continue
+
+            prelude = content[prelude_start:i]
+            if '/*' in prelude:
+                prelude = _COMMENT_RE.sub('', prelude)
+            prelude = prelude.strip()
+            at_rule = _AT_RULE_NAME_RE.match(prelude)
+            if at_rule and at_rule.group(1).lower() in NESTING_AT_RULES:
+                stack.append(('at',))
+                context.append(prelude)
+            else:
+                stack.append(('rule', split_selectors(prelude), pos))
+                in_rule = True
+            prelude_start = pos
+        else:  # '}'
+            if not stack:
+                prelude_start = pos
+                continue
+
+            block = stack.pop()
+            if block[0] == 'nested':
+                continue
+            if block[0] == 'at':
+                context.pop()
+            else:
+                in_rule = False
+                yield CssRule(block[1], content[block[2]:i], tuple(context), block[2], i)
+            prelude_start = pos
+
+
+def rewrite_rules(content, rewrite):
+    """
+    Call rewrite(rule) for every rule and splice in the block text it returns
+    (None or the unchanged body leaves the rule alone).
+
+    Returns (new content, list of rules that changed)
+    """
+    out = []
+    changed = []
+    last = 0
+    for rule in scan_rules(content):
+        body = rewrite(rule)
+        if body is None or body == rule.body:
+            continue
+        out.append(content[last:rule.start])
+        out.append(body)
+        last = rule.end
+        changed.append(rule)
+
+    if not changed:
+        return content, changed
+
+    out.append(content[last:])
+    return ''.join(out), changed
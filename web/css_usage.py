@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+CSS Module Class Usage Index
+Maps every *.module.css class to the components that use it, and reports dead classes
+
+Classes come from the selectors of every CSS module under src/ (css_scanner).
+Usage comes from the .js/.jsx/.ts/.tsx sources under src/: each
+`import x from './Y.module.css'` binds an identifier, and `x.name`,
+`x['name']` and `composes: name` count as uses
+(`composes: name from './Other.module.css'` is a use in Other.module.css).
+Classes that only appear inside :not(...) don't keep a rule alive or dead.
+Anything that can't be resolved statically is treated as live:
+
+- `x[variable]` or `x` passed around whole -> every class of that module
+- `x[`grid-${size}`]`, `x['status-' + s]` -> every class starting with the prefix
+
+Usage:
+    python css_usage.py                     # dead classes by removable bytes
+    python css_usage.py --json usage.json   # full usage map
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from collections import defaultdict
+
+from css_discovery import find_sources
+from css_scanner import required_classes, scan_rules
+
+MODULE_SUFFIX = '.module.css'
+
+IMPORT_RE = re.compile(
+    r'''import\s+(?:\*\s+as\s+)?([A-Za-z_$][\w$]*)\s+from\s+['"]([^'"]+\.module\.css)['"]\s*;?''')
+COMPOSES_RE = re.compile(r'composes:\s*([^;}]+)')
+_COMPOSES_FROM_RE = re.compile(r'\s+from\s+')
+# A literal string key, or the literal prefix of a template / concatenation
+_LITERAL_KEY_RE = re.compile(r'''\s*(['"])([^'"\\]*)\1\s*\Z''')
+_PREFIX_KEY_RE = re.compile(r'''\s*(?:`([^`$\\]*)\$\{|(['"])([^'"\\]*)\2\s*\+)''')
+
+
+# =========================
+# CSS SIDE
+# =========================
+
+class ModuleUsage:
+    """Classes defined by one CSS module and what is known about their use"""
+
+    def __init__(self, path):
+        self.path = path
+        self.classes = {}        # class -> bytes of the rules it appears in
+        self.rules = []          # (selector classes per selector, rule bytes)
+        self.used = defaultdict(set)  # class -> JS files referencing it
+        self.composed = set()
+        self.composes_from = defaultdict(set)  # other module path -> classes composed from it
+        self.prefixes = set()
+        self.dynamic_in = set()  # JS files that index/pass the module dynamically
+        self.importers = set()
+
+    def load(self):
+        with open(self.path, 'r', encoding='utf-8') as f:
+            content = f.read()
+
+        for rule in scan_rules(content):
+            per_selector = [required_classes(selector) for selector in rule.selectors]
+            size = sum(len(s) for s in rule.selectors) + 2 * len(rule.selectors) + len(rule.body)
+            self.rules.append((per_selector, size))
+            for name in {name for names in per_selector for name in names}:
+                self.classes[name] = self.classes.get(name, 0) + size
+
+            for m in COMPOSES_RE.finditer(rule.body):
+                value, *source = _COMPOSES_FROM_RE.split(m.group(1).strip(), 1)
+                if not source:
+                    self.composed.update(value.split())
+                elif source[0][:1] in '\'"':
+                    # `from global` names global classes; a path names another module
+                    spec = source[0].strip('\'"')
+                    other = os.path.normpath(os.path.join(os.path.dirname(self.path), spec))
+                    self.composes_from[other.replace(os.sep, '/')].update(value.split())
+        return self
+
+    def is_live(self, name):
+        """Used, or not provably unused"""
+        if self.dynamic_in or name in self.used or name in self.composed:
+            return True
+        return any(name.startswith(prefix) for prefix in self.prefixes)
+
+    def live_classes(self):
+        return {name for name in self.classes if self.is_live(name)}
+
+    def dead_rules(self):
+        """(rule bytes, first dead class) for rules where every selector needs a dead class"""
+        dead = []
+        for per_selector, size in self.rules:
+            blockers = []
+            for names in per_selector:
+                dead_names = [name for name in names if not self.is_live(name)]
+                if not dead_names:
+                    break
+                blockers.append(dead_names[0])
+            else:
+                if blockers:
+                    dead.append((size, blockers[0]))
+        return dead
+
+
+# =========================
+# JS SIDE
+# =========================
+
+def _usage_re(identifier):
+    ident = re.escape(identifier)
+    return re.compile(
+        rf'(?<![\w$.]){ident}(?![\w$])(?:\s*\.\s*([A-Za-z_$][\w$]*)|\s*\[((?:[^\[\]]|\[[^\]]*\])*)\])?')
+
+def scan_component(filepath):
+    """Module references in one JS file: list of (css path, kind, value)
+
+    kind is 'class' (value = class name), 'prefix' (value = class prefix)
+    or 'dynamic' (value = None).
+    """
+    with open(filepath, 'r', encoding='utf-8', errors='replace') as f:
+        text = f.read()
+    if MODULE_SUFFIX not in text:
+        return []
+
+    refs = []
+    directory = os.path.dirname(filepath)
+    for m in IMPORT_RE.finditer(text):
+        identifier, spec = m.groups()
+        if not spec.startswith('.'):
+            continue
+        css_path = os.path.normpath(os.path.join(directory, spec)).replace(os.sep, '/')
+
+        body = text[:m.start()] + text[m.end():]
+        for use in _usage_re(identifier).finditer(body):
+            member, key = use.groups()
+            if member is not None:
+                refs.append((css_path, 'class', member))
+                continue
+            if key is not None:
+                literal = _LITERAL_KEY_RE.match(key)
+                if literal:
+                    refs.append((css_path, 'class', literal.group(2)))
+                    continue
+                prefix = _PREFIX_KEY_RE.match(key)
+                if prefix and (prefix.group(1) or prefix.group(3)):
+                    refs.append((css_path, 'prefix', prefix.group(1) or prefix.group(3)))
+                    continue
+            refs.append((css_path, 'dynamic', None))
+    return refs
+
+
+# =========================
+# INDEX
+# =========================
+
+def find_modules(root='src'):
+    """All CSS modules under `root`, sorted"""
+    modules = []
+    for directory, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d != 'node_modules']
+        for name in filenames:
+            if name.endswith(MODULE_SUFFIX):
+                modules.append(os.path.join(directory, name).replace(os.sep, '/'))
+    return sorted(modules)
+
+def build_index(root='src'):
+    """{css path: ModuleUsage} for every CSS module under `root`"""
+    modules = {path: ModuleUsage(path).load() for path in find_modules(root)}
+
+    for module in modules.values():
+        for css_path, names in module.composes_from.items():
+            if css_path in modules:
+                modules[css_path].composed.update(names)
+
+    for component in find_sources(root):
+        for css_path, kind, value in scan_component(component):
+            module = modules.get(css_path)
+            if module is None:
+                continue
+            module.importers.add(component)
+            if kind == 'class':
+                module.used[value].add(component)
+            elif kind == 'prefix':
+                module.prefixes.add(value)
+            else:
+                module.dynamic_in.add(component)
+    return modules
+
+def live_class_map(index):
+    """{realpath of css module: set of live classes} - what the codemods accept as `live_classes`"""
+    return {os.path.realpath(path): module.live_classes() for path, module in index.items()}
+
+def dead_report(index):
+    """Dead classes (no importer uses them) sorted by removable bytes, largest first"""
+    dead = []
+    for path, module in index.items():
+        removable = defaultdict(int)
+        for size, name in module.dead_rules():
+            removable[name] += size
+        for name in module.classes:
+            if not module.is_live(name):
+                dead.append({
+                    'file': path,
+                    'class': name,
+                    'bytes': removable.get(name, 0),
+                    'unimported': not module.importers,
+                })
+    dead.sort(key=lambda d: (-d['bytes'], d['file'], d['class']))
+    return dead
+
+def to_json(index):
+    modules = {}
+    for path, module in index.items():
+        modules[path] = {
+            'importers': sorted(module.importers),
+            'dynamic_in': sorted(module.dynamic_in),
+            'prefixes': sorted(module.prefixes),
+            'classes': {
+                name: {
+                    'live': module.is_live(name),
+                    'used_in': sorted(module.used.get(name, ())),
+                    'bytes': size,
+                }
+                for name, size in sorted(module.classes.items())
+            },
+        }
+    dead = dead_report(index)
+    return {
+        'modules': modules,
+        'dead': dead,
+        'dead_bytes': sum(d['bytes'] for d in dead),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Index CSS module class usage and report dead classes")
+    parser.add_argument('root', nargs='?', default='src', help="source directory (default: src)")
+    parser.add_argument('--json', help="write the full usage map to this file")
+    parser.add_argument('--top', type=int, default=30, help="dead classes to list (default: 30)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    index = build_index(args.root)
+    if not index:
+        print(f"No *{MODULE_SUFFIX} files under {args.root}")
+        sys.exit(1)
+
+    report = to_json(index)
+    dead = report['dead']
+    elapsed = time.perf_counter() - start
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Usage map written to {args.json}")
+
+    total_classes = sum(len(m.classes) for m in index.values())
+    dynamic = sum(1 for m in index.values() if m.dynamic_in)
+    unimported = [path for path, m in index.items() if not m.importers]
+
+    print(f"\n{'bytes':>7}  class")
+    for entry in dead[:args.top]:
+        print(f"{entry['bytes']:>7}  {entry['file']} .{entry['class']}")
+
+    print(f"\n{'='*60}")
+    print(f"SUMMARY: {len(dead)} dead of {total_classes} classes in {len(index)} modules ({elapsed:.2f}s)")
+    print(f"  removable rule bytes: {report['dead_bytes']:,}")
+    print(f"  modules never imported: {len(unimported)}")
+    print(f"  modules indexed dynamically (all classes kept): {dynamic}")
+    print(f"{'='*60}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+CSS Codemod Watch Mode
+Re-applies the button, input and spacing transforms to CSS modules as they change
+
+Watches src/ (inotify on Linux, mtime polling elsewhere), keeps only the
+files the doctrine covers (same include patterns and ui/ + dev/ exclusions
+as css_discovery), waits until edits go quiet for --debounce seconds and
+then runs css_codemod over just that batch.
+
+Usage:
+    python css_watch.py                          # all transforms, from the web/ directory
+    python css_watch.py --only spacing --debounce 0.5 [--poll]
+"""
+
+import argparse
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from collections import Counter
+
+from css_codemod import TRANSFORMS, codemod_snapshot, get_transforms, open_cache
+from css_discovery import DOCTRINE_EXCLUDED_DIRS, path_matcher
+from file_transaction import FileTransaction, TransactionError
+
+WATCH_ROOT = 'src'
+
+# inotify(7) constants
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = 0o2000000
+
+# Events that can leave a file with new content (editors often save via rename)
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+_EVENT_HEADER = struct.Struct('iIII')
+
+
+# =========================
+# WATCHERS
+# =========================
+
+class InotifyWatcher:
+    """Recursive inotify watch on a directory tree (Linux only)"""
+
+    def __init__(self, root, excluded_dirs=DOCTRINE_EXCLUDED_DIRS):
+        libc_name = ctypes.util.find_library('c')
+        if not sys.platform.startswith('linux') or not libc_name:
+            raise OSError("inotify is only available on Linux")
+
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        self.fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        self.root = root
+        self.excluded_dirs = excluded_dirs
+        self.dirs = {}  # watch descriptor -> directory path
+        self._add_tree(root)
+
+    def _add_tree(self, top):
+        """Watch `top` and every non-excluded directory below it; returns files already there"""
+        found = set()
+        stack = [top]
+        while stack:
+            path = stack.pop()
+            wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+            if wd < 0:
+                continue
+            self.dirs[wd] = path
+            try:
+                with os.scandir(path) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in self.excluded_dirs:
+                                stack.append(entry.path)
+                        else:
+                            found.add(entry.path)
+            except OSError:
+                continue
+        return found
+
+    def wait(self, timeout=None):
+        """Block up to `timeout` seconds (forever if None); returns the set of changed file paths"""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+
+        changed = set()
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return changed
+
+        offset = 0
+        while offset < len(data):
+            wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                # The kernel queue overflowed and events were dropped: rescan
+                # the whole tree (re-adding watches for any directory created
+                # meanwhile); the converged cache skips files that didn't change
+                changed |= self._add_tree(self.root)
+                continue
+
+            if mask & IN_IGNORED:
+                self.dirs.pop(wd, None)
+                continue
+
+            directory = self.dirs.get(wd)
+            if directory is None or not name:
+                continue
+
+            path = os.path.join(directory, name)
+            if mask & IN_ISDIR:
+                # New (or moved-in) directory: watch it and pick up anything
+                # written into it before the watch existed
+                if name not in self.excluded_dirs:
+                    changed |= self._add_tree(path)
+            else:
+                changed.add(path)
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """Portable fallback: compares (mtime, size) of the doctrine files under `root` every `interval` seconds"""
+
+    def __init__(self, root, interval=0.5, excluded_dirs=DOCTRINE_EXCLUDED_DIRS):
+        self.root = root
+        self.interval = interval
+        self.excluded_dirs = excluded_dirs
+        self.matches = path_matcher(excluded_dirs=excluded_dirs)
+        self.seen = self._snapshot()
+
+    def _snapshot(self):
+        snapshot = {}
+        stack = [self.root]
+        while stack:
+            try:
+                entries = os.scandir(stack.pop())
+            except OSError:
+                continue
+            with entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in self.excluded_dirs:
+                            stack.append(entry.path)
+                    elif self.matches(_relative(entry.path)):
+                        try:
+                            stat = entry.stat()
+                        except OSError:
+                            continue
+                        snapshot[entry.path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def wait(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            delay = self.interval
+            if deadline is not None:
+                delay = min(delay, max(0.0, deadline - time.monotonic()))
+            time.sleep(delay)
+
+            current = self._snapshot()
+            changed = {path for path, seen in current.items() if self.seen.get(path) != seen}
+            self.seen = current
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+
+    def close(self):
+        pass
+
+
+def open_watcher(root, force_poll=False):
+    """inotify watcher when available, polling otherwise"""
+    if not force_poll:
+        try:
+            return InotifyWatcher(root)
+        except OSError:
+            pass
+    return PollingWatcher(root)
+
+
+# =========================
+# RUNNER
+# =========================
+
+def _relative(path):
+    return os.path.relpath(path).replace(os.sep, '/')
+
+def apply_batch(filepaths, transforms, cache):
+    """Run the transforms over one debounced batch; returns Counter of changes per transform
+
+    The batch is written as one FileTransaction. If a file is edited again
+    before the commit, nothing is written; that edit's event starts the
+    next batch.
+    """
+    totals = Counter()
+    transaction = FileTransaction()
+    done = []
+    updated = []
+    for filepath in sorted(filepaths):
+        if not os.path.isfile(filepath) or cache.is_converged(filepath):
+            continue
+        try:
+            changes, staged = codemod_snapshot(filepath, transforms)
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"  ! {filepath}: {e}")
+            continue
+
+        done.append(filepath)
+        if staged:
+            transaction.stage(filepath, *staged)
+        if changes:
+            totals.update(changes)
+            updated.append((filepath, changes))
+
+    try:
+        transaction.commit()
+    except TransactionError as e:
+        print(f"  ! batch not written: {e}")
+        return Counter()
+
+    # Our own writes fire more events; the cache's stat check swallows them
+    for filepath in done:
+        cache.mark_converged(filepath)
+    cache.save()
+    for filepath, changes in updated:
+        detail = ', '.join(f"{name} {count}" for name, count in sorted(changes.items()))
+        print(f"{time.strftime('%H:%M:%S')} Updated {filepath} ({detail})")
+    return totals
+
+def watch(names=None, debounce=0.3, force_poll=False):
+    """Watch WATCH_ROOT until interrupted"""
+    transforms = get_transforms(names)
+    cache = open_cache(transforms)
+    matches = path_matcher()
+    watcher = open_watcher(WATCH_ROOT, force_poll)
+
+    print(f"Watching {WATCH_ROOT}/ with {type(watcher).__name__} "
+          f"({', '.join(t.name for t in transforms)}; Ctrl+C to stop)")
+
+    pending = set()
+    try:
+        while True:
+            # Block until something happens, then keep collecting until it goes quiet
+            changed = watcher.wait(debounce if pending else None)
+            if changed:
+                pending.update(p for p in map(_relative, changed) if matches(p))
+                continue
+            if pending:
+                batch, pending = pending, set()
+                apply_batch(batch, transforms, cache)
+    except KeyboardInterrupt:
+        print("\nStopped")
+    finally:
+        watcher.close()
+        cache.save()
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-apply the CSS standardizers to files as they change")
+    parser.add_argument('--only', help=f"comma-separated transforms ({', '.join(TRANSFORMS)})")
+    parser.add_argument('--debounce', type=float, default=0.3,
+                        help="seconds without events before a batch runs (default: 0.3)")
+    parser.add_argument('--poll', action='store_true',
+                        help="poll file mtimes instead of using inotify")
+    args = parser.parse_args()
+
+    names = args.only.split(',') if args.only else None
+    try:
+        get_transforms(names)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    if not os.path.isdir(WATCH_ROOT):
+        print(f"Error: {WATCH_ROOT}/ not found - run from the web/ directory")
+        sys.exit(1)
+
+    watch(names, args.debounce, args.poll)
+
+if __name__ == '__main__':
+    main()
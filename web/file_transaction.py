@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+All-or-nothing multi-file writes for the CSS standardizers
+
+New contents are staged in memory first. commit() writes every one to a
+temp file next to its target, then renames them over the targets; if
+anything fails (or the run is interrupted) before the last rename, the
+files already replaced are put back and the temp files removed, so the
+tree is never left half converted or with a truncated file.
+
+    content, snapshot = read_snapshot('src/styles/App.module.css')
+    with FileTransaction() as tx:
+        tx.stage('src/styles/App.module.css', transform(content), snapshot)
+    # committed on a clean exit, rolled back on an exception
+
+Take the snapshot where the file is read (in the worker process, for the
+parallel tools), so a change made while it was being transformed is caught.
+Writes go to the symlink target and keep the file's permission bits.
+"""
+
+import os
+import shutil
+
+
+class TransactionError(Exception):
+    """Commit refused or failed; no target file was left modified"""
+
+
+def _write(path, content):
+    if isinstance(content, bytes):
+        with open(path, 'wb') as f:
+            f.write(content)
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+
+
+def _write_temp(target, tmp_path, content):
+    _write(tmp_path, content)
+    if os.path.exists(target):
+        shutil.copymode(target, tmp_path)
+
+
+def write_atomic(filepath, content):
+    """Replace one file's content (str or bytes) via temp file + rename, so readers never see a partial file"""
+    target = os.path.realpath(filepath)
+    tmp_path = f'{target}.{os.getpid()}.tmp'
+    try:
+        _write_temp(target, tmp_path, content)
+        os.replace(tmp_path, target)
+    except BaseException:
+        _remove(tmp_path)
+        raise
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def read_snapshot(filepath):
+    """
+    Read a text file for a transformation. Returns (content, snapshot);
+    pass the snapshot to FileTransaction.stage() with the new content.
+    """
+    with open(filepath, 'rb') as f:
+        stat = os.fstat(f.fileno())
+        original = f.read()
+    # Same newline handling as open(filepath, 'r')
+    content = original.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+    return content, (original, stat.st_mtime_ns, stat.st_size)
+
+
+class FileTransaction:
+    """New file contents staged in memory, applied all at once or not at all"""
+
+    def __init__(self):
+        # filepath -> (new content, (original bytes, mtime_ns, size) when read)
+        self.staged = {}
+        self.committed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.discard()
+        return False
+
+    def __len__(self):
+        return len(self.staged)
+
+    def stage(self, filepath, content, snapshot=None):
+        """
+        Queue `content` for filepath. `snapshot` comes from read_snapshot()
+        when the file was read (taken now if omitted); its bytes are kept
+        for rollback, and commit() refuses to run if the file changed since.
+        """
+        if snapshot is None:
+            _, snapshot = read_snapshot(filepath)
+        self.staged[filepath] = (content, snapshot)
+
+    def discard(self):
+        self.staged.clear()
+
+    def commit(self):
+        """Apply every staged write, or none; returns the list of files written"""
+        if self.committed:
+            raise TransactionError("transaction already committed")
+
+        for filepath, (_, (_, mtime_ns, size)) in self.staged.items():
+            stat = os.stat(filepath)
+            if (stat.st_mtime_ns, stat.st_size) != (mtime_ns, size):
+                raise TransactionError(f"{filepath} changed since it was read; nothing written")
+
+        # Symlinked sources are rewritten where they point, not replaced by a file
+        targets = {filepath: os.path.realpath(filepath) for filepath in self.staged}
+        suffix = f'.{os.getpid()}.tmp'
+        temps = []
+        replaced = []
+        try:
+            # Phase 1: every new file fully on disk; targets untouched
+            for filepath, (content, _) in self.staged.items():
+                tmp_path = targets[filepath] + suffix
+                temps.append(tmp_path)
+                _write_temp(targets[filepath], tmp_path, content)
+
+            # Phase 2: renames only
+            for filepath, target in targets.items():
+                os.replace(target + suffix, target)
+                replaced.append(filepath)
+        except BaseException as e:
+            self._rollback(replaced)
+            for tmp_path in temps:
+                _remove(tmp_path)
+            if isinstance(e, Exception):
+                raise TransactionError(f"commit failed, rolled back: {e}") from e
+            raise
+
+        self.committed = True
+        return replaced
+
+    def _rollback(self, replaced):
+        for filepath in reversed(replaced):
+            write_atomic(filepath, self.staged[filepath][1][0])
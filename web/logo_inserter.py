@@ -4,26 +4,76 @@ Supports both image logos (PNG/JPG) and PDF logos.
 PDF logos preserve exact positioning from source file.
 """
 
+import hashlib
+import json
+import logging
 import os
+import re
 import shutil
+import tempfile
+import threading
+import time
+from collections import deque
 from datetime import datetime
 import fitz  # PyMuPDF
 
+logger = logging.getLogger(__name__)
+
 # =========================
 # CONFIGURATION
 # =========================
 
 LOGO_DIR = r"C:\Users\LoganSpiers\Dropbox\Skyfire App\Client Templates DWG\logos"
 
+# Logo search roots, in priority order. SKYFIRE_LOGO_DIRS takes a
+# os.pathsep-separated list (":" on Linux, ";" on Windows).
+LOGO_DIRS = [
+    d for d in os.environ.get("SKYFIRE_LOGO_DIRS", "").split(os.pathsep) if d
+] or [LOGO_DIR]
+
+# Optional prebuilt manifest (see build_logo_manifest). When set, lookups
+# are answered from the manifest and never touch the logo directories.
+LOGO_MANIFEST = os.environ.get("SKYFIRE_LOGO_MANIFEST") or None
+
+# Lookup order: PDF before image, "<client> Logo" before "<client>"
+LOGO_EXTENSIONS = ((".pdf",), (".png", ".jpg", ".jpeg"))
+LOGO_SUFFIXES = (" Logo", "")
+
 LOGO_CONFIG = {
+    # Logo discovery (None = module-level LOGO_DIRS / LOGO_MANIFEST)
+    "logo_dirs": None,
+    "logo_manifest": None,
+
     # Rendering options
     "as_background": True,
 
     # Debug mode
-    "debug_draw_box": False
+    "debug_draw_box": False,
+
+    # Per-page timings and log lines (off by default: adds work on every page)
+    "log_pages": False,
+
+    # Page selection (all None = stamp every page). Filters combine with AND,
+    # cheapest first: ranges, then page geometry, then text search.
+    "pages": None,           # 1-based ranges: "1-3,7,10-" or an iterable of ints
+    "orientation": None,     # "portrait" or "landscape"
+    "page_filter": None,     # callable(page) -> bool, e.g. a page-size check;
+                             # must be a module-level function when the config is
+                             # sent to worker processes (logo_service pickles it)
+    "text_marker": None,     # only pages whose text contains this string
+
+    # Image logos: embed a pre-rotated, resized PNG rendered at this DPI
+    # instead of the original file (None = embed the original)
+    "image_logo_dpi": 300,
+    "logo_cache_dir": os.path.join(tempfile.gettempdir(), "skyfire_logo_variants"),
 }
 
 POINTS_PER_INCH = 72
+IMAGE_LOGO_SIZE = 1.30  # inches, square box for image logos
+IMAGE_LOGO_ROTATION = 270
+
+# Page dictionary key recording which logo a page carries (see _stamp_page)
+STAMP_MARKER_KEY = "SkyfireLogo"
 
 
 # =========================
@@ -42,13 +92,81 @@ def create_backup():
 
     try:
         shutil.copy2(current_file, backup_path)
-        print(f"✓ Backup created: {backup_name}")
+        logger.info("✓ Backup created: %s", backup_name)
         return backup_path
     except Exception as e:
-        print(f"✗ Backup failed: {e}")
+        logger.warning("✗ Backup failed: %s", e)
         return None
 
 
+# =========================
+# METRICS
+# =========================
+
+class StampMetrics:
+    """
+    In-process counters for the stamping path.
+
+    Keeps running totals plus the most recent per-document records
+    (bounded), and can be exported as JSON for profiling.
+    """
+
+    def __init__(self, max_documents: int = 1000):
+        self._lock = threading.Lock()
+        self._max_documents = max_documents
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.documents = deque(maxlen=self._max_documents)
+            self.totals = {
+                "documents": 0,
+                "pages": 0,
+                "skipped": 0,
+                "failed": 0,
+                "seconds": 0.0,
+                "bytes_in": 0,
+                "bytes_out": 0,
+                "logo_cache_hits": 0,
+                "logo_cache_misses": 0,
+            }
+
+    def count(self, key: str, amount=1):
+        with self._lock:
+            self.totals[key] += amount
+
+    def record_document(self, record: dict):
+        with self._lock:
+            self.documents.append(record)
+            self.totals["documents"] += 1
+            self.totals["pages"] += record["pages"]
+            self.totals["seconds"] += record["seconds"]
+            self.totals["bytes_in"] += record["bytes_in"]
+            self.totals["bytes_out"] += record["bytes_out"]
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {"totals": dict(self.totals), "documents": list(self.documents)}
+
+    def merge(self, snapshot: dict):
+        """Add another StampMetrics' snapshot (e.g. from a worker process) to this one."""
+        with self._lock:
+            for key, value in snapshot["totals"].items():
+                self.totals[key] = self.totals.get(key, 0) + value
+            self.documents.extend(snapshot["documents"])
+
+    def to_json(self, path: str = None) -> str:
+        """Serialize the snapshot; also write it to `path` when given."""
+        data = json.dumps(self.snapshot(), indent=2)
+        if path:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(data)
+        return data
+
+
+METRICS = StampMetrics()
+
+
 # =========================
 # PUBLIC ENTRY POINT
 # =========================
@@ -60,8 +178,11 @@ def add_company_logo(
     config: dict = None
 ) -> str:
     """
-    Add company logo to all pages of a PDF.
+    Add company logo to the pages of a PDF (all pages unless the
+    page selection keys in LOGO_CONFIG narrow it down).
     Supports both image logos and PDF logos.
+    Safe to re-run: pages already stamped with the same logo are skipped,
+    and pages stamped with an older logo have it replaced.
 
     Args:
         pdf_path: Path to PDF file (modified in-place)
@@ -72,6 +193,8 @@ def add_company_logo(
     Returns:
         Path to modified PDF (or original path if skipped/failed)
     """
+    start = time.perf_counter()
+
     try:
         cfg = LOGO_CONFIG.copy()
         if config:
@@ -79,42 +202,82 @@ def add_company_logo(
 
         client = client.strip()
 
-        logo_path = _find_logo_file(client)
+        logo_path = _find_logo_file(client, cfg)
         if not logo_path:
-            print(f"⚠ Logo not found for client '{client}' — skipping logo insertion")
+            METRICS.count("skipped")
+            logger.warning("⚠ Logo not found for client '%s' — skipping logo insertion", client)
             return pdf_path
 
-        print(f"✓ Found logo: {os.path.basename(logo_path)}")
+        logger.info("✓ Found logo: %s", os.path.basename(logo_path))
 
         # Check if logo is PDF or image
         is_pdf_logo = logo_path.lower().endswith('.pdf')
+        bytes_in = os.path.getsize(pdf_path)
+        page_times = [] if cfg["log_pages"] else None
+
+        logo_hash = _logo_content_hash(logo_path)
 
         doc = fitz.open(pdf_path)
-        num_pages = len(doc)
+        total_pages = len(doc)
+        page_indexes = _select_pages(doc, cfg)
+
+        # Pages already carrying this exact logo (e.g. a retried publish) are left alone
+        page_indexes = [
+            i for i in page_indexes
+            if _read_stamp_marker(doc, doc.page_xref(i))[0] != logo_hash
+        ]
+        num_pages = len(page_indexes)
+
+        if not page_indexes:
+            doc.close()
+            METRICS.count("skipped")
+            logger.info("⚠ No pages need a logo (unselected or already stamped) — skipping logo insertion")
+            return pdf_path
 
         if is_pdf_logo:
-            print(f"  Using PDF overlay method (exact copy from source)")
-            logo_doc = fitz.open(logo_path)
+            logger.debug("  Using PDF overlay method (exact copy from source)")
+            logo_doc = fitz.open("pdf", _load_logo_bytes(logo_path))
 
-            for page_index, page in enumerate(doc):
-                _overlay_pdf_logo(page, logo_doc, cfg)
+            for page_index in page_indexes:
+                _timed_page(_stamp_page, page_times, doc[page_index],
+                            _overlay_pdf_logo, logo_doc, logo_hash, cfg)
 
             logo_doc.close()
         else:
-            print(f"  Using image insertion method")
-            for page_index, page in enumerate(doc):
-                _stamp_image_logo(page, logo_path, cfg)
-
-        doc.save(pdf_path, incremental=True, encryption=fitz.PDF_ENCRYPT_KEEP)
+            logger.debug("  Using image insertion method")
+            logo_image = _prepare_image_logo(logo_path, cfg)
+            for page_index in page_indexes:
+                _timed_page(_stamp_page, page_times, doc[page_index],
+                            _stamp_image_logo, logo_image, logo_hash, cfg)
+
+        # deflate_images: the pre-rendered PNG variant is otherwise stored as
+        # raw pixels (~480 KB per planset with its SMask)
+        doc.save(pdf_path, incremental=True, encryption=fitz.PDF_ENCRYPT_KEEP,
+                 deflate_images=True)
         doc.close()
 
-        print(f"✓ Logo applied successfully to {num_pages} page(s)")
+        record = {
+            "client": client,
+            "pdf": os.path.basename(pdf_path),
+            "logo": os.path.basename(logo_path),
+            "method": "pdf_overlay" if is_pdf_logo else "image",
+            "pages": num_pages,
+            "pages_total": total_pages,
+            "seconds": round(time.perf_counter() - start, 6),
+            "bytes_in": bytes_in,
+            "bytes_out": os.path.getsize(pdf_path),
+        }
+        if page_times is not None:
+            record["page_seconds"] = page_times
+        METRICS.record_document(record)
+
+        logger.info("✓ Logo applied successfully to %d page(s)", num_pages,
+                    extra={"logo_stats": record})
         return pdf_path
 
     except Exception as e:
-        print(f"✗ Logo insertion failed for '{client}': {e}")
-        import traceback
-        traceback.print_exc()
+        METRICS.count("failed")
+        logger.exception("✗ Logo insertion failed for '%s': %s", client, e)
         return pdf_path  # NEVER block the publish pipeline
 
 
@@ -122,39 +285,335 @@ def add_company_logo(
 # INTERNAL HELPERS
 # =========================
 
-def _find_logo_file(client_name: str) -> str | None:
-    """Find logo file by client name (case-insensitive). Checks PDF first, then images."""
-    if not os.path.exists(LOGO_DIR):
-        return None
+def _find_logo_file(client_name: str, cfg: dict = None) -> str | None:
+    """
+    Find logo file by client name. Checks PDF first, then images.
 
-    # Check for PDF first (preferred for exact positioning)
-    # Try with " Logo" suffix first (standard naming convention)
-    for ext in (".pdf", ".PDF"):
-        path = os.path.join(LOGO_DIR, f"{client_name} Logo{ext}")
-        if os.path.exists(path):
-            return path
-
-    # Try without " Logo" suffix as fallback
-    for ext in (".pdf", ".PDF"):
-        path = os.path.join(LOGO_DIR, f"{client_name}{ext}")
-        if os.path.exists(path):
-            return path
-
-    # Fall back to image formats with " Logo" suffix
-    for ext in (".png", ".jpg", ".jpeg", ".PNG", ".JPG", ".JPEG"):
-        path = os.path.join(LOGO_DIR, f"{client_name} Logo{ext}")
-        if os.path.exists(path):
-            return path
-
-    # Try images without " Logo" suffix
-    for ext in (".png", ".jpg", ".jpeg", ".PNG", ".JPG", ".JPEG"):
-        path = os.path.join(LOGO_DIR, f"{client_name}{ext}")
-        if os.path.exists(path):
-            return path
+    Uses the logo manifest when one is configured (case-insensitive, no
+    filesystem access); otherwise searches each logo root in order.
+    """
+    cfg = cfg or LOGO_CONFIG
+    manifest_path = cfg.get("logo_manifest") or LOGO_MANIFEST
+    if manifest_path:
+        entry = load_logo_manifest(manifest_path).get(client_name.lower())
+        return entry["path"] if entry else None
+
+    for logo_dir in cfg.get("logo_dirs") or LOGO_DIRS:
+        if not os.path.isdir(logo_dir):
+            continue
+
+        for extensions in LOGO_EXTENSIONS:
+            for suffix in LOGO_SUFFIXES:
+                for ext in extensions:
+                    for candidate_ext in (ext, ext.upper()):
+                        path = os.path.join(logo_dir, f"{client_name}{suffix}{candidate_ext}")
+                        if os.path.exists(path):
+                            return path
 
     return None
 
 
+# =========================
+# LOGO MANIFEST
+# =========================
+
+_MANIFESTS = {}
+_MANIFEST_HASHES = {}
+
+
+def build_logo_manifest(logo_dirs: list[str], manifest_path: str) -> dict:
+    """
+    Walk the logo roots once and write a client -> logo manifest.
+
+    Applies the same precedence as _find_logo_file (earlier root first,
+    then PDF before image, then "<client> Logo" before "<client>") and
+    records each logo's SHA-256 so workers never need to rehash it.
+
+    Returns:
+        The manifest dict that was written
+    """
+    ranked = {}
+    for root_rank, logo_dir in enumerate(logo_dirs):
+        if not os.path.isdir(logo_dir):
+            logger.warning("⚠ Logo root not found: %s", logo_dir)
+            continue
+
+        with os.scandir(logo_dir) as entries:
+            for entry in entries:
+                if not entry.is_file():
+                    continue
+
+                stem, ext = os.path.splitext(entry.name)
+                ext = ext.lower()
+                type_rank = next(
+                    (i for i, exts in enumerate(LOGO_EXTENSIONS) if ext in exts), None
+                )
+                if type_rank is None:
+                    continue
+
+                if stem.endswith(" Logo"):
+                    client, suffix_rank = stem[:-len(" Logo")], 0
+                else:
+                    client, suffix_rank = stem, 1
+
+                rank = (root_rank, type_rank, suffix_rank)
+                key = client.lower()
+                if key not in ranked or rank < ranked[key][0]:
+                    ranked[key] = (rank, entry.path)
+
+    logos = {}
+    for key, (_, path) in sorted(ranked.items()):
+        with open(path, "rb") as f:
+            data = f.read()
+        logos[key] = {
+            "path": os.path.abspath(path),
+            "sha256": hashlib.sha256(data).hexdigest(),
+            "size": len(data),
+        }
+
+    manifest = {
+        "version": 1,
+        "built_at": datetime.now().isoformat(timespec="seconds"),
+        "roots": [os.path.abspath(d) for d in logo_dirs],
+        "logos": logos,
+    }
+
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+
+    logger.info("✓ Logo manifest written: %s (%d clients)", manifest_path, len(logos))
+    return manifest
+
+
+def load_logo_manifest(manifest_path: str) -> dict:
+    """
+    Load a logo manifest once per process (call at worker startup to
+    take the read out of the first request).
+
+    Returns:
+        Dict mapping lower-case client name to its manifest entry
+    """
+    logos = _MANIFESTS.get(manifest_path)
+    if logos is None:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            logos = json.load(f)["logos"]
+        _MANIFESTS[manifest_path] = logos
+        for entry in logos.values():
+            _MANIFEST_HASHES[entry["path"]] = entry["sha256"]
+    return logos
+
+
+_LOGO_BYTES_CACHE = {}
+
+
+def _load_logo_bytes(logo_path: str) -> bytes:
+    """Read a PDF logo once per (path, mtime, size) and reuse the bytes."""
+    stat = os.stat(logo_path)
+    key = (logo_path, stat.st_mtime_ns, stat.st_size)
+
+    data = _LOGO_BYTES_CACHE.get(key)
+    if data is not None:
+        METRICS.count("logo_cache_hits")
+        return data
+
+    METRICS.count("logo_cache_misses")
+    with open(logo_path, "rb") as f:
+        data = f.read()
+    _LOGO_BYTES_CACHE[key] = data
+    return data
+
+
+_LOGO_HASH_CACHE = {}
+_IMAGE_VARIANT_CACHE = {}
+
+
+def _logo_content_hash(logo_path: str) -> str:
+    """SHA-256 of a logo file, recomputed only when its mtime or size changes."""
+    if logo_path in _MANIFEST_HASHES:
+        return _MANIFEST_HASHES[logo_path]
+
+    stat = os.stat(logo_path)
+    key = (logo_path, stat.st_mtime_ns, stat.st_size)
+
+    digest = _LOGO_HASH_CACHE.get(key)
+    if digest is None:
+        with open(logo_path, "rb") as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        _LOGO_HASH_CACHE[key] = digest
+    return digest
+
+
+def _prepare_image_logo(logo_path: str, cfg: dict) -> dict:
+    """
+    Decide what gets embedded for an image logo.
+
+    Returns insert_image arguments plus an "xref" slot, so the image is
+    embedded once per document and every later page reuses that xref.
+    """
+    dpi = cfg.get("image_logo_dpi")
+    if not dpi:
+        return {"filename": logo_path, "rotate": IMAGE_LOGO_ROTATION, "xref": 0}
+
+    stream = _image_logo_variant(logo_path, dpi, cfg.get("logo_cache_dir"))
+    return {"stream": stream, "rotate": 0, "xref": 0}
+
+
+def _image_logo_variant(logo_path: str, dpi: int, cache_dir: str | None) -> bytes:
+    """
+    PNG of the logo already rotated and sized for the stamp box at `dpi`.
+
+    Keyed by the source content hash and render settings; kept in memory
+    and, when cache_dir is set, on disk so other workers can reuse it.
+    """
+    key = f"{_logo_content_hash(logo_path)}-{dpi}dpi-{IMAGE_LOGO_SIZE}in-r{IMAGE_LOGO_ROTATION}"
+
+    data = _IMAGE_VARIANT_CACHE.get(key)
+    if data is not None:
+        METRICS.count("logo_cache_hits")
+        return data
+
+    cache_path = os.path.join(cache_dir, f"{key}.png") if cache_dir else None
+    if cache_path and os.path.exists(cache_path):
+        METRICS.count("logo_cache_hits")
+        with open(cache_path, "rb") as f:
+            data = f.read()
+        _IMAGE_VARIANT_CACHE[key] = data
+        return data
+
+    METRICS.count("logo_cache_misses")
+
+    # Render the logo into a box-sized page exactly as it would be stamped,
+    # then rasterize that page at the target DPI with a transparent background
+    box = IMAGE_LOGO_SIZE * POINTS_PER_INCH
+    scratch = fitz.open()
+    page = scratch.new_page(width=box, height=box)
+    page.insert_image(page.rect, filename=logo_path, rotate=IMAGE_LOGO_ROTATION,
+                      keep_proportion=True)
+    data = page.get_pixmap(dpi=dpi, alpha=True).tobytes("png")
+    scratch.close()
+
+    _IMAGE_VARIANT_CACHE[key] = data
+    if cache_path:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, cache_path)
+
+    logger.debug("  Rendered image logo variant %s (%d bytes)", key, len(data))
+    return data
+
+
+def _parse_page_ranges(pages, page_count: int) -> list[int]:
+    """
+    Turn a 1-based page spec into sorted 0-based indexes.
+
+    Accepts "1-3,7,10-" style strings (open-ended ranges run to the last
+    page) or an iterable of 1-based page numbers. Out-of-range pages are
+    ignored.
+    """
+    if isinstance(pages, str):
+        selected = set()
+        for part in pages.split(","):
+            part = part.strip()
+            if not part:
+                continue
+            if "-" in part:
+                first, _, last = part.partition("-")
+                first = int(first) if first.strip() else 1
+                last = int(last) if last.strip() else page_count
+                selected.update(range(first, last + 1))
+            else:
+                selected.add(int(part))
+    else:
+        selected = {int(p) for p in pages}
+
+    return sorted(p - 1 for p in selected if 1 <= p <= page_count)
+
+
+def _select_pages(doc, cfg: dict) -> list[int]:
+    """Apply the page selection config to a document, cheapest filter first."""
+    if cfg.get("pages") is not None:
+        indexes = _parse_page_ranges(cfg["pages"], len(doc))
+    else:
+        indexes = list(range(len(doc)))
+
+    orientation = cfg.get("orientation")
+    page_filter = cfg.get("page_filter")
+    text_marker = cfg.get("text_marker")
+
+    if not (orientation or page_filter or text_marker):
+        return indexes
+
+    selected = []
+    for page_index in indexes:
+        page = doc[page_index]
+
+        if orientation:
+            rect = page.rect
+            is_landscape = rect.width > rect.height
+            if is_landscape != (orientation == "landscape"):
+                continue
+
+        if page_filter and not page_filter(page):
+            continue
+
+        if text_marker and not page.search_for(text_marker):
+            continue
+
+        selected.append(page_index)
+
+    return selected
+
+
+def _read_stamp_marker(doc, page_xref: int) -> tuple[str | None, list[int]]:
+    """Logo hash and content stream xrefs recorded on a page, if any."""
+    kind, value = doc.xref_get_key(page_xref, f"{STAMP_MARKER_KEY}/Hash")
+    if kind != "string":
+        return None, []
+
+    kind, streams = doc.xref_get_key(page_xref, f"{STAMP_MARKER_KEY}/Streams")
+    stream_xrefs = [int(x) for x in re.findall(r"(\d+) 0 R", streams)] if kind == "array" else []
+    return value, stream_xrefs
+
+
+def _stamp_page(page, stamp_fn, logo, logo_hash: str, cfg: dict):
+    """
+    Stamp one page and record what was added in its page dictionary.
+
+    PyMuPDF adds each insertion as new content streams on the page, so the
+    streams that appear during stamp_fn are exactly the logo drawing. Their
+    xrefs go into the marker; if the page was stamped with a different logo
+    before, those old streams are emptied first, replacing it in place.
+    """
+    doc = page.parent
+
+    _, old_streams = _read_stamp_marker(doc, page.xref)
+    for xref in old_streams:
+        doc.update_stream(xref, b"")
+
+    before = set(page.get_contents())
+    stamp_fn(page, logo, cfg)
+    added = [xref for xref in page.get_contents() if xref not in before]
+
+    doc.xref_set_key(
+        page.xref,
+        STAMP_MARKER_KEY,
+        f"<</Hash {fitz.get_pdf_str(logo_hash)} /Streams [{' '.join(f'{x} 0 R' for x in added)}]>>",
+    )
+
+
+def _timed_page(stamp_fn, page_times, page, *args):
+    """Run a per-page stamp function, timing it only when page logging is on."""
+    if page_times is None:
+        stamp_fn(page, *args)
+        return
+
+    page_start = time.perf_counter()
+    stamp_fn(page, *args)
+    page_times.append(round(time.perf_counter() - page_start, 6))
+
+
 def _overlay_pdf_logo(page, logo_doc, cfg: dict):
     """
     Overlay entire logo PDF page onto target page.
@@ -162,8 +621,9 @@ def _overlay_pdf_logo(page, logo_doc, cfg: dict):
     """
     page_rect = page.rect
 
-    print(f"  Page {page.number + 1}: {page_rect.width/72:.2f}\" x {page_rect.height/72:.2f}\"")
-    print(f"    Overlaying logo PDF (preserves source positioning)...")
+    if cfg["log_pages"]:
+        logger.debug("  Page %d: %.2f\" x %.2f\" — overlaying logo PDF",
+                     page.number + 1, page_rect.width / 72, page_rect.height / 72)
 
     # Overlay the first page of logo PDF onto target page
     # This is the programmatic equivalent of copy/paste in Adobe Acrobat
@@ -174,10 +634,8 @@ def _overlay_pdf_logo(page, logo_doc, cfg: dict):
         overlay=not cfg["as_background"]  # True=foreground, False=background
     )
 
-    print(f"    ✓ Logo PDF overlaid")
-
 
-def _stamp_image_logo(page, logo_path: str, cfg: dict):
+def _stamp_image_logo(page, logo_image: dict, cfg: dict):
     """
     Insert image logo with calculated positioning.
     Fallback method for when logo is not a PDF.
@@ -187,8 +645,8 @@ def _stamp_image_logo(page, logo_path: str, cfg: dict):
     ph = page_rect.height
 
     # Default positioning (bottom-right for portrait, rotated 270° / -90°)
-    width = 1.30 * POINTS_PER_INCH
-    height = 1.30 * POINTS_PER_INCH
+    width = IMAGE_LOGO_SIZE * POINTS_PER_INCH
+    height = IMAGE_LOGO_SIZE * POINTS_PER_INCH
     right_margin = 0.75 * POINTS_PER_INCH
     bottom_margin = 0.75 * POINTS_PER_INCH
 
@@ -202,20 +660,22 @@ def _stamp_image_logo(page, logo_path: str, cfg: dict):
 
     logo_rect = fitz.Rect(x, y, x + width, y + height)
 
-    print(f"  Page {page.number + 1}: {pw/72:.2f}\" x {ph/72:.2f}\"")
-    print(f"    Image logo at: ({x:.1f}, {y:.1f}) - shifted 0.75\" up, 0.5\" left")
+    if cfg["log_pages"]:
+        logger.debug("  Page %d: %.2f\" x %.2f\" — image logo at (%.1f, %.1f)",
+                     page.number + 1, pw / 72, ph / 72, x, y)
 
-    # Insert logo with rotation (270° = -90°)
-    page.insert_image(
+    # Insert logo (270° = -90°, either at render time or baked into the variant).
+    # After the first page the embedded image is reused by xref.
+    logo_image["xref"] = page.insert_image(
         logo_rect,
-        filename=logo_path,
-        rotate=270,  # 270° (or -90°) - rotated opposite from original 90°
+        filename=logo_image.get("filename"),
+        stream=logo_image.get("stream"),
+        xref=logo_image["xref"],
+        rotate=logo_image["rotate"],
         overlay=not cfg["as_background"],
         keep_proportion=True
     )
 
-    print(f"    ✓ Image logo inserted")
-
 
 # =========================
 # CLI SUPPORT
@@ -224,14 +684,22 @@ def _stamp_image_logo(page, logo_path: str, cfg: dict):
 if __name__ == "__main__":
     import sys
 
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
     # Create backup before running
     create_backup()
 
+    if len(sys.argv) >= 3 and sys.argv[1] == "--build-manifest":
+        build_logo_manifest(sys.argv[3:] or LOGO_DIRS, sys.argv[2])
+        sys.exit(0)
+
     if len(sys.argv) < 3:
-        print("Usage: python logo_inserter.py <pdf_path> <client_name>")
+        print("Usage: python logo_inserter.py <pdf_path> <client_name> [pages, e.g. 1-3,7]")
+        print("       python logo_inserter.py --build-manifest <manifest.json> [logo_dir ...]")
         sys.exit(1)
 
     pdf_path = sys.argv[1]
     client_name = sys.argv[2]
+    page_spec = sys.argv[3] if len(sys.argv) > 3 else None
 
-    add_company_logo(pdf_path, client_name)
+    add_company_logo(pdf_path, client_name, config={"pages": page_spec})
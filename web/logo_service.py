@@ -0,0 +1,326 @@
+"""
+Async logo stamping service for the publish pipeline.
+Wraps logo_inserter.add_company_logo so plansets from many clients can be
+stamped concurrently without blocking the event loop.
+"""
+
+import asyncio
+import logging
+import os
+import pickle
+import shutil
+import time
+import uuid
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+
+from logo_inserter import METRICS, StampMetrics, add_company_logo
+
+logger = logging.getLogger(__name__)
+
+# =========================
+# CONFIGURATION
+# =========================
+
+SERVICE_CONFIG = {
+    # Max plansets stamped at the same time (PyMuPDF is not thread-safe,
+    # so each job runs in its own worker process)
+    "max_workers": min(4, os.cpu_count() or 1),
+
+    # Max jobs waiting for a worker before stamp() callers are made to wait
+    "max_queue": 32,
+
+    # Seconds a single job may run before the caller gets the original path
+    # back; the job's worker process is killed and replaced
+    "job_timeout": 120.0,
+
+    # Number of recent job latencies kept for percentile reporting
+    "latency_window": 1024,
+}
+
+
+# =========================
+# SERVICE
+# =========================
+
+class LogoStampingService:
+    """
+    Bounded async front-end for add_company_logo.
+
+    Jobs are queued on a bounded asyncio.Queue (callers await free space,
+    which is the backpressure) and drained by a fixed set of workers. Each
+    worker owns a single-process executor, so a job only ever goes to an
+    idle process and job_timeout measures the job itself, not time spent
+    queued behind another one. Like add_company_logo, stamp() never raises
+    for a failed or timed-out job; it returns the original path.
+
+    The job stamps a scratch copy next to the PDF, which replaces the
+    original only once the job has finished in time. On timeout the worker
+    process is killed, so a late job can never write the caller's file.
+
+    Per-job stamp metrics come back from the workers and are merged into
+    `metrics` (a logo_inserter.StampMetrics; see stats() and metrics.to_json()).
+
+    `config` is pickled to the worker process: a `page_filter` in it must be
+    a module-level function, not a lambda or closure. The same goes for
+    `stamp_fn`.
+
+    With a caller-supplied executor the service can't kill a hung job; the
+    worker then keeps its slot until the job ends (its result is discarded),
+    so give that executor at least max_workers workers.
+
+    Usage:
+        async with LogoStampingService() as service:
+            await service.stamp(pdf_path, client)
+    """
+
+    def __init__(self, config: dict = None, executor: Executor = None, stamp_fn=add_company_logo):
+        cfg = SERVICE_CONFIG.copy()
+        if config:
+            cfg.update(config)
+        self.cfg = cfg
+
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._slot_executors = []
+        self._stamp_fn = stamp_fn
+        self._queue = None
+        self._workers = []
+        self._in_flight = 0
+        self._latencies = deque(maxlen=cfg["latency_window"])
+        self._counts = {"completed": 0, "failed": 0, "timed_out": 0}
+        self.metrics = StampMetrics()
+
+    # ----- lifecycle -----
+
+    async def __aenter__(self):
+        self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    def start(self):
+        """Create the queue and worker tasks (needs a running loop); executors start on first use."""
+        if self._workers:
+            return
+
+        self._slot_executors = [None] * self.cfg["max_workers"]
+        self._queue = asyncio.Queue(maxsize=self.cfg["max_queue"])
+        self._workers = [
+            asyncio.create_task(self._worker(slot))
+            for slot in range(self.cfg["max_workers"])
+        ]
+
+    async def close(self):
+        """Finish queued jobs, then stop workers and the owned executors."""
+        if not self._workers:
+            return
+
+        await self._queue.join()
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+        for executor in self._slot_executors:
+            if executor is not None:
+                executor.shutdown(wait=True)
+        self._slot_executors = []
+
+    # ----- public API -----
+
+    async def stamp(self, pdf_path: str, client: str, config: dict = None) -> str:
+        """
+        Queue a planset for logo stamping and wait for the result.
+
+        Waits for queue space when the service is saturated.
+
+        Returns:
+            Path to modified PDF (or original path if skipped/failed/timed out)
+
+        Raises:
+            TypeError: config can't be sent to a worker process (e.g. a lambda page_filter)
+        """
+        if config and (self._owns_executor or isinstance(self._executor, ProcessPoolExecutor)):
+            try:
+                pickle.dumps(config)
+            except (pickle.PicklingError, TypeError, AttributeError) as e:
+                raise TypeError(
+                    f"config must be picklable for worker processes "
+                    f"(use a module-level function for page_filter): {e}"
+                ) from e
+
+        self.start()
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((pdf_path, client, config, future))
+        return await future
+
+    @property
+    def queue_depth(self) -> int:
+        """Jobs waiting for a worker."""
+        return self._queue.qsize() if self._queue else 0
+
+    @property
+    def in_flight(self) -> int:
+        """Jobs currently holding a worker (including timed-out jobs still winding down)."""
+        return self._in_flight
+
+    def stats(self) -> dict:
+        """Queue depth, job counts, latency percentiles (seconds) and merged stamp metrics."""
+        latencies = sorted(self._latencies)
+        return {
+            "queue_depth": self.queue_depth,
+            "in_flight": self._in_flight,
+            **self._counts,
+            "latency_p50": _percentile(latencies, 50),
+            "latency_p95": _percentile(latencies, 95),
+            "latency_p99": _percentile(latencies, 99),
+            "latency_max": latencies[-1] if latencies else None,
+            "stamp": self.metrics.snapshot()["totals"],
+        }
+
+    # ----- internals -----
+
+    def _slot_executor(self, slot: int) -> Executor:
+        if not self._owns_executor:
+            return self._executor
+        if self._slot_executors[slot] is None:
+            self._slot_executors[slot] = ProcessPoolExecutor(max_workers=1)
+        return self._slot_executors[slot]
+
+    async def _abandon(self, slot: int, job: asyncio.Future):
+        """Stop a timed-out job: kill its worker process, or wait it out on a shared executor."""
+        if self._owns_executor:
+            _kill_executor(self._slot_executors[slot])
+            self._slot_executors[slot] = None
+        try:
+            await job
+        except BaseException:
+            pass  # killed (BrokenProcessPool) or failed late; the result is discarded either way
+
+    async def _worker(self, slot: int):
+        loop = asyncio.get_running_loop()
+
+        while True:
+            pdf_path, client, config, future = await self._queue.get()
+            self._in_flight += 1
+            start = time.perf_counter()
+            result = pdf_path
+            work_path = f"{pdf_path}.{uuid.uuid4().hex[:12]}.stamping"
+
+            try:
+                job = loop.run_in_executor(
+                    self._slot_executor(slot), _stamp_job,
+                    self._stamp_fn, pdf_path, work_path, client, config,
+                )
+                try:
+                    # shield: on timeout keep the job future so _abandon can wait for it
+                    stamped, metrics = await asyncio.wait_for(
+                        asyncio.shield(job), timeout=self.cfg["job_timeout"]
+                    )
+                    self.metrics.merge(metrics)
+                    if stamped:
+                        os.replace(work_path, pdf_path)
+                    self._counts["completed"] += 1
+                except asyncio.TimeoutError:
+                    self._counts["timed_out"] += 1
+                    logger.warning("✗ Logo insertion timed out for '%s' after %ss",
+                                   client, self.cfg["job_timeout"])
+                    # Unblock the caller now; the slot stays taken until the job is gone
+                    self._finish(future, pdf_path, start)
+                    await self._abandon(slot, job)
+            except Exception as e:
+                self._counts["failed"] += 1
+                logger.error("✗ Logo insertion failed for '%s': %s", client, e)
+            finally:
+                _remove(work_path)
+                self._in_flight -= 1
+                self._queue.task_done()
+
+            self._finish(future, result, start)
+
+    def _finish(self, future: asyncio.Future, result: str, start: float):
+        if not future.done():
+            self._latencies.append(time.perf_counter() - start)
+            future.set_result(result)
+
+
+# =========================
+# WORKER PROCESS
+# =========================
+
+def _stamp_job(stamp_fn, pdf_path: str, work_path: str, client: str, config: dict):
+    """
+    Stamp a copy of pdf_path at work_path (runs in a worker process).
+
+    Returns:
+        (whether the copy was modified, this job's StampMetrics snapshot)
+    """
+    totals_before = METRICS.snapshot()["totals"]
+
+    shutil.copy2(pdf_path, work_path)
+    copied = os.stat(work_path)
+    stamp_fn(work_path, client, True, config)
+    stamped = os.stat(work_path)
+
+    after = METRICS.snapshot()
+    totals = {key: value - totals_before.get(key, 0) for key, value in after["totals"].items()}
+    new_documents = totals.get("documents", 0)
+    documents = after["documents"][-new_documents:] if new_documents else []
+    for record in documents:
+        record["pdf"] = os.path.basename(pdf_path)
+
+    changed = (stamped.st_size, stamped.st_mtime_ns) != (copied.st_size, copied.st_mtime_ns)
+    return changed, {"totals": totals, "documents": documents}
+
+
+# =========================
+# INTERNAL HELPERS
+# =========================
+
+def _kill_executor(executor: Executor):
+    """Kill a ProcessPoolExecutor's workers (there is no public API to stop a running job)."""
+    for process in list((getattr(executor, "_processes", None) or {}).values()):
+        process.kill()
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _remove(path: str):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _percentile(sorted_values: list, pct: float) -> float | None:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+# =========================
+# CLI SUPPORT
+# =========================
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) < 3:
+        print("Usage: python logo_service.py <client_name> <pdf_path> [<pdf_path> ...]")
+        sys.exit(1)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    client_name = sys.argv[1]
+    pdf_paths = sys.argv[2:]
+
+    async def _run():
+        async with LogoStampingService() as service:
+            await asyncio.gather(*(service.stamp(p, client_name) for p in pdf_paths))
+            print(service.stats())
+
+    asyncio.run(_run())
@@ -2,106 +2,367 @@
 """
 Nuclear Spacing Converter
 Converts ALL spacing values to var(--spacing) following the doctrine
+
+Usage:
+    python nuclear_spacing_converter.py <file.css>
+    python nuclear_spacing_converter.py src/ "src/pages/**/*.module.css" [--workers N]
+    python nuclear_spacing_converter.py src/ --dry-run     # unified diff, nothing written
+
+Files are only written when their content actually changes, so unchanged
+files keep their mtime (no dev-server / webpack cache invalidation).
 """
 
+import argparse
+import difflib
+import functools
+import glob
+import os
 import re
 import sys
+import time
+from collections import Counter
+
+from css_discovery import print_slowest, process_files
+from file_transaction import FileTransaction, TransactionError, read_snapshot
+
+# Files picked up when a directory is given on the command line
+DEFAULT_DIR_PATTERN = '*.module.css'
+
+# Bump when the rewrite changes, so cached "already converged" files are re-checked
+TRANSFORM_VERSION = 3
+
+# Values converted to var(--spacing)
+SPACING_VALUES = frozenset({
+    'var(--spacing-wide)', 'var(--spacing-loose)',
+    'var(--spacing-tight)', 'var(--spacing-xs)', 'var(--spacing-2xl)',
+    '2rem', '1.5rem', '1.25rem', '1rem', '0.875rem', '0.75rem', '0.5rem', '0.375rem', '0.25rem', '0.125rem',
+    '32px', '24px', '20px', '18px', '16px', '14px', '12px', '10px', '8px', '6px', '4px', '2px', '1px',
+    '3rem', '2.5rem', '2.25rem', '1.75rem', '1.125rem', '0.625rem',
+    '40px', '36px', '30px', '28px', '26px', '22px', '15px', '5px', '3px'
+})
+
+LONGHAND_PROPERTIES = [
+    'margin-top', 'margin-bottom', 'margin-left', 'margin-right',
+    'padding-top', 'padding-bottom', 'padding-left', 'padding-right',
+]
+
+SPACING_VAR = 'var(--spacing)'
+NEGATIVE_SPACING_VAR = 'calc(var(--spacing) * -1)'
+
+# Functions whose arguments are arithmetic: literal lengths in there are
+# offsets against the other terms, so only spacing tokens are renamed
+MATH_FUNCTIONS = frozenset({'calc', 'min', 'max', 'clamp'})
+
+# One top-level value component: leading whitespace, then !important, a
+# comma, or a word/function with balanced parentheses (3 levels deep)
+_PARENS = r'\((?:[^()]|\((?:[^()]|\([^()]*\))*\))*\)'
+_VALUE_TOKEN_RE = re.compile(
+    rf'(\s*)(?:(!\s*important)|(,)|((?:[^\s()!,]+|{_PARENS})+))', re.IGNORECASE)
+_FUNCTION_RE = re.compile(r'([\w-]+)\((.*)\)\Z', re.DOTALL)
+_VAR_RE = re.compile(rf'var\(\s*(--[\w-]+)\s*(?:,(?:[^()]|{_PARENS})*)?\)')
 
 def convert_spacing_value(value):
     """Convert any spacing value to var(--spacing)"""
-    # Skip if already var(--spacing)
-    if value == 'var(--spacing)':
-        return value
-
-    # List of values to convert
-    spacing_values = [
-        'var(--spacing-wide)', 'var(--spacing-loose)',
-        'var(--spacing-tight)', 'var(--spacing-xs)', 'var(--spacing-2xl)',
-        '2rem', '1.5rem', '1.25rem', '1rem', '0.875rem', '0.75rem', '0.5rem', '0.375rem', '0.25rem', '0.125rem',
-        '32px', '24px', '20px', '18px', '16px', '14px', '12px', '10px', '8px', '6px', '4px', '2px', '1px',
-        '3rem', '2.5rem', '2.25rem', '1.75rem', '1.125rem', '0.625rem',
-        '40px', '36px', '30px', '28px', '26px', '22px', '15px', '5px', '3px'
-    ]
-
-    if value in spacing_values:
-        return 'var(--spacing)'
+    if value in SPACING_VALUES:
+        return SPACING_VAR
 
     return value
 
+def _is_spacing_token(name):
+    return name == '--spacing' or f'var({name})' in SPACING_VALUES
+
+def _convert_var(m):
+    return SPACING_VAR if _is_spacing_token(m.group(1)) else m.group(0)
+
+def _convert_component(part):
+    """Convert one top-level component (a length, token or function call)"""
+    if part in SPACING_VALUES:
+        return SPACING_VAR
+    if part[0] == '-' and part[1:] in SPACING_VALUES:
+        return NEGATIVE_SPACING_VAR
+
+    m = _FUNCTION_RE.match(part)
+    if m is None:
+        return part
+    name, args = m.groups()
+
+    if name.lower() == 'env':
+        # Environment values (safe-area insets, titlebar area) and their
+        # fallbacks size against the device, not the spacing scale
+        return part
+
+    if name.lower() == 'var':
+        head, comma, fallback = args.partition(',')
+        if _is_spacing_token(head.strip()):
+            # A spacing token, fallback included, is just the one token
+            return SPACING_VAR
+        if not comma:
+            return part
+        space = fallback[:len(fallback) - len(fallback.lstrip())]
+        return f'{name}({head},{space}{convert_value(fallback)})'
+
+    if name.lower() in MATH_FUNCTIONS:
+        return f'{name}({_VAR_RE.sub(_convert_var, args)})'
+
+    return part
+
+def convert_value(value):
+    """
+    Convert every spacing component of a declaration value in one scan.
+
+    Components are whitespace-separated at the top level, so functions
+    (calc, var with fallbacks, ...) are handled whole; negative lengths
+    become calc(var(--spacing) * -1) and !important is kept. Values that
+    don't tokenize (unbalanced parentheses) are returned unchanged.
+    """
+    value = value.strip()
+    out = []
+    pos = 0
+    while pos < len(value):
+        m = _VALUE_TOKEN_RE.match(value, pos)
+        if m is None:
+            return value
+        space, important, comma, part = m.groups()
+        out.append(space)
+        out.append(_convert_component(part) if part else important or comma)
+        pos = m.end()
+    return ''.join(out)
+
 def process_padding(padding_value):
     """Process padding values - convert all to var(--spacing) but keep structure"""
-    parts = padding_value.strip().split()
-    if not parts:
-        return padding_value
-
-    # Convert all parts
-    converted = [convert_spacing_value(p) for p in parts]
-    return ' '.join(converted)
+    return convert_value(padding_value)
 
 def process_margin(margin_value):
     """Process margin values - convert all to var(--spacing)"""
-    parts = margin_value.strip().split()
-    if not parts:
-        return margin_value
-
-    # Convert all parts
-    converted = [convert_spacing_value(p) for p in parts]
-    return ' '.join(converted)
+    return convert_value(margin_value)
 
 def process_gap(gap_value):
     """Process gap values - convert to var(--spacing)"""
-    return convert_spacing_value(gap_value.strip())
-
-def convert_file(filepath):
-    """Convert all spacing in a CSS file"""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        content = f.read()
-
-    # Pattern to match padding: value;
-    content = re.sub(
-        r'padding:\s*([^;]+);',
-        lambda m: f'padding: {process_padding(m.group(1))};',
-        content
-    )
+    return convert_value(gap_value)
 
-    # Pattern to match margin: value;
-    content = re.sub(
-        r'margin:\s*([^;]+);',
-        lambda m: f'margin: {process_margin(m.group(1))};',
-        content
-    )
+def process_longhand(value):
+    """Process single-side margin/padding values - convert to var(--spacing)"""
+    return convert_value(value)
 
-    # Pattern to match gap: value;
-    content = re.sub(
-        r'gap:\s*([^;]+);',
-        lambda m: f'gap: {process_gap(m.group(1))};',
-        content
-    )
+# Property -> value handler. Every declaration is matched by one compiled
+# pattern and dispatched through this table.
+PROPERTY_HANDLERS = {
+    'padding': process_padding,
+    'margin': process_margin,
+    'gap': process_gap,
+    **{prop: process_longhand for prop in LONGHAND_PROPERTIES},
+}
+
+# Longest names first so e.g. padding-top is tried before padding
+_PROPERTY_NAMES = '|'.join(sorted(PROPERTY_HANDLERS, key=len, reverse=True))
+DECLARATION_RE = re.compile(rf'({_PROPERTY_NAMES}):\s*([^;]+);')
+PROPERTY_NAME_RE = re.compile(rf'(?:{_PROPERTY_NAMES}):')
+
+# Every property name starts with one of these; str.find on them is much
+# cheaper than letting the regex engine try the alternation at every offset
+_PROPERTY_ROOTS = ('padding', 'margin', 'gap')
 
-    # Pattern to match margin-top, margin-bottom, margin-left, margin-right
-    for prop in ['margin-top', 'margin-bottom', 'margin-left', 'margin-right']:
-        content = re.sub(
-            rf'{prop}:\s*([^;]+);',
-            lambda m: f'{prop}: {convert_spacing_value(m.group(1).strip())};',
-            content
-        )
+class _NestedDeclaration(Exception):
+    """A matched value swallowed another spacing declaration (missing ';')."""
 
-    # Pattern to match padding-top, padding-bottom, padding-left, padding-right
-    for prop in ['padding-top', 'padding-bottom', 'padding-left', 'padding-right']:
-        content = re.sub(
-            rf'{prop}:\s*([^;]+);',
-            lambda m: f'{prop}: {convert_spacing_value(m.group(1).strip())};',
-            content
-        )
+@functools.lru_cache(maxsize=4096)
+def _convert_declaration(prop, value):
+    """Rewritten declaration, or None if the value contains another one"""
+    if ':' in value and PROPERTY_NAME_RE.search(value):
+        return None
+    return f'{prop}: {PROPERTY_HANDLERS[prop](value)};'
 
-    with open(filepath, 'w', encoding='utf-8') as f:
-        f.write(content)
+def _convert_css_legacy(content, changes, skip=frozenset()):
+    """One regex pass per property, in the historical order.
 
-    print(f"Converted {filepath}")
+    Only used when a value runs into another spacing declaration, where
+    the result depends on pass order and a single pass would differ.
+    """
+    for prop in ['padding', 'margin', 'gap'] + LONGHAND_PROPERTIES:
+        if prop in skip:
+            continue
+        handler = PROPERTY_HANDLERS[prop]
+
+        def replace(m):
+            declaration = f'{prop}: {handler(m.group(1))};'
+            if declaration != m.group(0):
+                changes[prop] += 1
+            return declaration
+
+        content = re.sub(rf'{prop}:\s*([^;]+);', replace, content)
+    return content
+
+def _iter_declarations(content):
+    """Yield spacing declaration matches left to right (same spans as re.sub)"""
+    positions = []
+    find = content.find
+    for root in _PROPERTY_ROOTS:
+        i = find(root)
+        while i != -1:
+            positions.append(i)
+            i = find(root, i + 1)
+    positions.sort()
+
+    match = DECLARATION_RE.match
+    end = 0
+    for pos in positions:
+        if pos < end:
+            continue
+        m = match(content, pos)
+        if m is not None:
+            end = m.end()
+            yield m
+
+def convert_css(content, skip=frozenset()):
+    """Convert all spacing in CSS source text (single pass)
+
+    Properties in `skip` are left as they are.
+    Returns (converted content, Counter of rewritten declarations per property)
+    """
+    changes = Counter()
+    out = []
+    last = 0
+    for m in _iter_declarations(content):
+        prop = m.group(1)
+        if prop in skip:
+            continue
+        declaration = _convert_declaration(prop, m.group(2))
+        if declaration is None:
+            changes = Counter()
+            return _convert_css_legacy(content, changes, skip), changes
+        if declaration != m.group(0):
+            changes[prop] += 1
+        out.append(content[last:m.start()])
+        out.append(declaration)
+        last = m.end()
+    out.append(content[last:])
+    return ''.join(out), changes
+
+def _convert_snapshot(filepath, dry_run=False):
+    """(Counter of changes, unified diff (dry_run only), (new content, snapshot) or None)
+
+    Computed only, nothing written; stage the last item on a FileTransaction.
+    """
+    content, snapshot = read_snapshot(filepath)
+    new_content, changes = convert_css(content)
+
+    if new_content == content:
+        return changes, '', None
+    if dry_run:
+        diff = ''.join(difflib.unified_diff(
+            content.splitlines(keepends=True),
+            new_content.splitlines(keepends=True),
+            fromfile=f'a/{filepath}',
+            tofile=f'b/{filepath}',
+        ))
+        return changes, diff, None
+    return changes, '', (new_content, snapshot)
+
+def convert_file(filepath, verbose=True, dry_run=False):
+    """Convert all spacing in a CSS file
+
+    The file is only written if its content changes, and never with dry_run.
+    Returns (Counter of rewritten declarations per property,
+             unified diff of the change - only filled in with dry_run)
+    """
+    changes, diff, staged = _convert_snapshot(filepath, dry_run)
+
+    if staged:
+        with FileTransaction() as transaction:
+            transaction.stage(filepath, *staged)
+
+    if verbose:
+        if staged or diff:
+            print(f"{'Would convert' if dry_run else 'Converted'} {filepath}")
+        else:
+            print(f"Unchanged {filepath}")
+
+    return changes, diff
+
+def collect_files(targets, pattern=DEFAULT_DIR_PATTERN):
+    """Expand files, directories and globs into a sorted, de-duplicated list
+
+    Directories are searched recursively for `pattern`.
+    """
+    files = {}
+    for target in targets:
+        if os.path.isdir(target):
+            matches = glob.glob(os.path.join(target, '**', pattern), recursive=True)
+        elif glob.has_magic(target):
+            matches = glob.glob(target, recursive=True)
+        else:
+            matches = [target]
+
+        for path in matches:
+            if os.path.isfile(path):
+                files.setdefault(os.path.realpath(path), path)
+
+    return sorted(files.values())
+
+def convert_files(filepaths, workers=None, dry_run=False):
+    """Convert many files across a process pool and print a summary
+
+    Every file is converted before any is written; the results are then
+    committed as one FileTransaction (TransactionError if that fails, with
+    no file modified). With dry_run, print a unified diff per file instead.
+    Returns (number of changed files, Counter of rewritten declarations per property)
+    """
+    start = time.perf_counter()
+    changed_files = 0
+    totals = Counter()
+    timings = []
+
+    worker = functools.partial(_convert_snapshot, dry_run=dry_run)
+    transaction = FileTransaction()
+    for filepath, (changes, diff, staged), seconds in process_files(worker, filepaths, workers):
+        timings.append((filepath, seconds))
+        if staged:
+            transaction.stage(filepath, *staged)
+        if changes:
+            changed_files += 1
+            totals.update(changes)
+            if diff:
+                print(diff, end='')
+            else:
+                print(f"Converted {filepath} ({sum(changes.values())} declarations)")
+
+    transaction.commit()
+
+    if len(filepaths) > 1:
+        print_slowest(timings)
+
+    elapsed = time.perf_counter() - start
+    verb = 'Would rewrite' if dry_run else 'Rewrote'
+    print(f"\n{'='*60}")
+    print(f"SUMMARY: {verb} {sum(totals.values())} declarations in {changed_files} of "
+          f"{len(filepaths)} files ({elapsed:.2f}s)")
+    for prop, count in totals.most_common():
+        print(f"  {prop}: {count}")
+    if dry_run:
+        print("  (dry run - no files written)")
+    print(f"{'='*60}")
+    return changed_files, totals
 
 if __name__ == '__main__':
-    if len(sys.argv) < 2:
-        print("Usage: python nuclear_spacing_converter.py <file.css>")
+    parser = argparse.ArgumentParser(
+        description="Convert spacing values to var(--spacing) in CSS files, directories or globs"
+    )
+    parser.add_argument('targets', nargs='+', help="CSS files, directories or glob patterns")
+    parser.add_argument('--pattern', default=DEFAULT_DIR_PATTERN,
+                        help=f"file pattern used inside directories (default: {DEFAULT_DIR_PATTERN})")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="worker processes (default: CPU count)")
+    parser.add_argument('--dry-run', action='store_true',
+                        help="print a unified diff and per-property counts without writing")
+    args = parser.parse_args()
+
+    filepaths = collect_files(args.targets, args.pattern)
+    if not filepaths:
+        print("No CSS files matched")
         sys.exit(1)
 
-    convert_file(sys.argv[1])
+    try:
+        convert_files(filepaths, args.workers, dry_run=args.dry_run)
+    except TransactionError as e:
+        print(f"\nERROR: {e}")
+        sys.exit(1)
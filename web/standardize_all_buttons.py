@@ -5,95 +5,107 @@ Standardize ALL button padding to var(--spacing-xs) var(--spacing)
 
 import re
 import os
-import glob
+import sys
 
-def standardize_button_file(filepath):
-    """Standardize all button padding in a single CSS file"""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        content = f.read()
-
-    original_content = content
-    changes = 0
-
-    # Pattern to match class blocks
-    # This matches .className { ... } including nested content
-    def process_class(match):
-        nonlocal changes
-        class_name = match.group(1)
-        class_body = match.group(2)
-
-        # Check if this is a button-related class
-        if not re.search(r'button|btn', class_name, re.IGNORECASE):
-            return match.group(0)
-
-        original_body = class_body
-
-        # Replace padding
-        class_body = re.sub(
-            r'padding:\s*[^;]+;',
-            'padding: var(--spacing-xs) var(--spacing);',
-            class_body
-        )
-
-        # Update min-height if exists
-        class_body = re.sub(
-            r'min-height:\s*\d+px;',
-            'min-height: 28px;',
-            class_body
-        )
-
-        if original_body != class_body:
-            changes += 1
-            print(f"  Updated .{class_name}")
+from codemod_cache import ConvergedCache
+from css_discovery import discover, print_slowest, process_files
+from css_scanner import rewrite_rules
+from file_transaction import FileTransaction, TransactionError, read_snapshot
+
+# Bump when the rewrite changes, so cached "already converged" files are re-checked
+TRANSFORM_VERSION = 2
+
+BUTTON_CLASS_RE = re.compile(r'button|btn', re.IGNORECASE)
+PADDING_RE = re.compile(r'padding:\s*[^;]+;')
+MIN_HEIGHT_RE = re.compile(r'min-height:\s*\d+px;')
+
+def is_button_class(class_name):
+    """Check if this is a button-related class"""
+    return BUTTON_CLASS_RE.search(class_name) is not None
+
+def standardize_button_rule(class_name, class_body):
+    """Return the standardized body for one class rule (unchanged if not a button)"""
+    if not is_button_class(class_name):
+        return class_body
 
-        return f".{class_name} {{{class_body}}}"
+    # Replace padding
+    class_body = PADDING_RE.sub('padding: var(--spacing-xs) var(--spacing);', class_body)
 
-    # Match class definitions
-    content = re.sub(
-        r'\.([a-zA-Z][\w-]*)\s*\{([^}]*)\}',
-        process_class,
-        content,
-        flags=re.MULTILINE
-    )
+    # Update min-height if exists
+    class_body = MIN_HEIGHT_RE.sub('min-height: 28px;', class_body)
 
-    if original_content != content:
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(content)
-        return changes
-    return 0
+    return class_body
 
-def main():
+def standardize_button_css(content, verbose=False):
+    """Standardize button padding in CSS text; returns (new content, rules changed)"""
+    def process_rule(rule):
+        class_name = rule.find_class(is_button_class)
+        if class_name is None:
+            return None
+
+        class_body = standardize_button_rule(class_name, rule.body)
+        if verbose and class_body != rule.body:
+            print(f"  Updated .{class_name}")
+        return class_body
+
+    # Every style rule, including ones inside @media/@supports and compound selectors
+    content, changed_rules = rewrite_rules(content, process_rule)
+    return content, len(changed_rules)
+
+def standardize_button_file(filepath, verbose=True):
+    """Standardize all button padding in a single CSS file"""
+    content, snapshot = read_snapshot(filepath)
+    content, changes = standardize_button_css(content, verbose)
+    if changes:
+        with FileTransaction() as transaction:
+            transaction.stage(filepath, content, snapshot)
+    return changes
+
+def _standardize_worker(filepath):
+    """(rules changed, (new content, snapshot) or None) - computed only, nothing written"""
+    content, snapshot = read_snapshot(filepath)
+    content, changes = standardize_button_css(content)
+    return changes, (content, snapshot) if changes else None
+
+def main(use_cache=True, workers=None):
     # Files to process (excluding ui/ and dev/ per doctrine)
-    files = [
-        'src/components/common/*.module.css',
-        'src/components/pdf/*.module.css',
-        'src/components/project/*.module.css',
-        'src/components/project/**/*.module.css',
-        'src/pages/*.module.css',
-        'src/styles/*.module.css',
-    ]
+    files = discover()
 
     total_changes = 0
     processed_files = []
-
-    for pattern in files:
-        for filepath in glob.glob(pattern, recursive=True):
-            # Skip ui/ and dev/ directories
-            if '/ui/' in filepath.replace('\\', '/') or '/dev/' in filepath.replace('\\', '/'):
-                continue
-
-            print(f"\nProcessing {filepath}...")
-            changes = standardize_button_file(filepath)
-            if changes > 0:
-                total_changes += changes
-                processed_files.append(filepath)
-                print(f"  OK {changes} button classes updated")
-            else:
-                print(f"  - No button classes found")
+    timings = []
+    cache = ConvergedCache('standardize_all_buttons', TRANSFORM_VERSION) if use_cache else None
+
+    pending = [f for f in files if not (cache and cache.is_converged(f))]
+
+    # Compute every file first; nothing is written until all of them succeeded
+    transaction = FileTransaction()
+    for filepath, (changes, staged), seconds in process_files(_standardize_worker, pending, workers):
+        timings.append((filepath, seconds))
+        if changes > 0:
+            transaction.stage(filepath, *staged)
+            total_changes += changes
+            processed_files.append(filepath)
+            print(f"OK {filepath}: {changes} button classes updated")
+
+    try:
+        transaction.commit()
+    except TransactionError as e:
+        print(f"\nERROR: {e}")
+        sys.exit(1)
+
+    if cache:
+        for filepath in pending:
+            cache.mark_converged(filepath)
+        cache.save()
+
+    print_slowest(timings)
 
     print(f"\n{'='*60}")
+    if len(pending) < len(files):
+        print(f"Skipped {len(files) - len(pending)} unchanged files (cache: {cache.path})")
     print(f"SUMMARY: Updated {total_changes} button classes across {len(processed_files)} files")
     print(f"{'='*60}")
 
 if __name__ == '__main__':
-    main()
+    main(use_cache='--no-cache' not in sys.argv[1:])
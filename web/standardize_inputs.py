@@ -5,126 +5,132 @@ Matches the 28px button height
 """
 
 import re
-import glob
-
-def standardize_input_file(filepath):
-    """Standardize all input/select/dropdown padding in a single CSS file"""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        content = f.read()
-
-    original_content = content
-    changes = 0
-
-    # Keywords that indicate form input classes
-    input_keywords = [
-        'input', 'select', 'filter', 'dropdown', 'search',
-        'picker', 'chooser', 'field', 'textbox'
-    ]
-
-    def process_class(match):
-        nonlocal changes
-        class_name = match.group(1)
-        class_body = match.group(2)
-
-        # Check if this is an input-related class
-        is_input_class = any(keyword in class_name.lower() for keyword in input_keywords)
-
-        # Skip button classes (already handled)
-        if 'button' in class_name.lower() or 'btn' in class_name.lower():
-            return match.group(0)
-
-        # Skip non-input classes
-        if not is_input_class:
-            return match.group(0)
-
-        original_body = class_body
-
-        # Check if it's a textarea (multiline) - preserve vertical, standardize horizontal
-        is_textarea = 'textarea' in class_name.lower()
-
-        if is_textarea:
-            # For textarea, standardize to use spacing tokens but keep larger min-height
-            class_body = re.sub(
-                r'padding:\s*[^;]+;',
-                'padding: var(--spacing-xs) var(--spacing);',
-                class_body
-            )
-            # Ensure min-height is decent for multiline
-            if 'min-height' not in class_body:
-                # Add min-height before the closing brace
-                class_body = class_body.rstrip() + '\n  min-height: 80px;'
-        else:
-            # For single-line inputs/selects, standardize padding
-            class_body = re.sub(
-                r'padding:\s*[^;]+;',
-                'padding: var(--spacing-xs) var(--spacing);',
-                class_body
-            )
-            # Update min-height if exists
-            class_body = re.sub(
-                r'min-height:\s*\d+px;',
-                'min-height: 28px;',
-                class_body
-            )
-            # Update height if exists (remove or set to 28px)
-            class_body = re.sub(
-                r'height:\s*\d+px;',
-                '', # Remove fixed height, let padding define it
-                class_body
-            )
-
-        if original_body != class_body:
-            changes += 1
+import sys
+
+from codemod_cache import ConvergedCache
+from css_discovery import discover, print_slowest, process_files
+from css_scanner import rewrite_rules
+from file_transaction import FileTransaction, TransactionError, read_snapshot
+
+# Bump when the rewrite changes, so cached "already converged" files are re-checked
+TRANSFORM_VERSION = 2
+
+# Keywords that indicate form input classes
+INPUT_KEYWORDS = [
+    'input', 'select', 'filter', 'dropdown', 'search',
+    'picker', 'chooser', 'field', 'textbox'
+]
+
+PADDING_RE = re.compile(r'padding:\s*[^;]+;')
+MIN_HEIGHT_RE = re.compile(r'min-height:\s*\d+px;')
+# Plain height only - must not eat the "height:" inside min-height/max-height/line-height
+HEIGHT_RE = re.compile(r'(?<![\w-])height:\s*\d+px;')
+
+def is_input_class(class_name):
+    """Check if this is an input-related class (button classes are handled elsewhere)"""
+    name = class_name.lower()
+
+    # Skip button classes (already handled)
+    if 'button' in name or 'btn' in name:
+        return False
+
+    return any(keyword in name for keyword in INPUT_KEYWORDS)
+
+def standardize_input_rule(class_name, class_body):
+    """Return the standardized body for one class rule (unchanged if not an input)"""
+    if not is_input_class(class_name):
+        return class_body
+
+    # Check if it's a textarea (multiline) - preserve vertical, standardize horizontal
+    is_textarea = 'textarea' in class_name.lower()
+
+    if is_textarea:
+        # For textarea, standardize to use spacing tokens but keep larger min-height
+        class_body = PADDING_RE.sub('padding: var(--spacing-xs) var(--spacing);', class_body)
+        # Ensure min-height is decent for multiline
+        if 'min-height' not in class_body:
+            # Add min-height before the closing brace
+            class_body = class_body.rstrip() + '\n  min-height: 80px;'
+    else:
+        # For single-line inputs/selects, standardize padding
+        class_body = PADDING_RE.sub('padding: var(--spacing-xs) var(--spacing);', class_body)
+        # Update min-height if exists
+        class_body = MIN_HEIGHT_RE.sub('min-height: 28px;', class_body)
+        # Remove fixed height, let padding define it
+        class_body = HEIGHT_RE.sub('', class_body)
+
+    return class_body
+
+def standardize_input_css(content, verbose=False):
+    """Standardize input/select/dropdown padding in CSS text; returns (new content, rules changed)"""
+    def process_rule(rule):
+        class_name = rule.find_class(is_input_class)
+        if class_name is None:
+            return None
+
+        class_body = standardize_input_rule(class_name, rule.body)
+        if verbose and class_body != rule.body:
             print(f"  Updated .{class_name}")
+        return class_body
 
-        return f".{class_name} {{{class_body}}}"
-
-    # Match class definitions
-    content = re.sub(
-        r'\.([a-zA-Z][\w-]*)\s*\{([^}]*)\}',
-        process_class,
-        content,
-        flags=re.MULTILINE
-    )
+    # Every style rule, including ones inside @media/@supports and compound selectors
+    content, changed_rules = rewrite_rules(content, process_rule)
+    return content, len(changed_rules)
 
-    if original_content != content:
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(content)
-        return changes
-    return 0
-
-def main():
+def standardize_input_file(filepath, verbose=True):
+    """Standardize all input/select/dropdown padding in a single CSS file"""
+    content, snapshot = read_snapshot(filepath)
+    content, changes = standardize_input_css(content, verbose)
+    if changes:
+        with FileTransaction() as transaction:
+            transaction.stage(filepath, content, snapshot)
+    return changes
+
+def _standardize_worker(filepath):
+    """(rules changed, (new content, snapshot) or None) - computed only, nothing written"""
+    content, snapshot = read_snapshot(filepath)
+    content, changes = standardize_input_css(content)
+    return changes, (content, snapshot) if changes else None
+
+def main(use_cache=True, workers=None):
     # Files to process (excluding ui/ and dev/ per doctrine)
-    files = [
-        'src/components/common/*.module.css',
-        'src/components/pdf/*.module.css',
-        'src/components/project/*.module.css',
-        'src/components/project/**/*.module.css',
-        'src/pages/*.module.css',
-        'src/styles/*.module.css',
-    ]
+    files = discover()
 
     total_changes = 0
     processed_files = []
-
-    for pattern in files:
-        for filepath in glob.glob(pattern, recursive=True):
-            # Skip ui/ and dev/ directories
-            if '/ui/' in filepath.replace('\\', '/') or '/dev/' in filepath.replace('\\', '/'):
-                continue
-
-            print(f"\nProcessing {filepath}...")
-            changes = standardize_input_file(filepath)
-            if changes > 0:
-                total_changes += changes
-                processed_files.append(filepath)
-                print(f"  OK {changes} input/select/dropdown classes updated")
-            else:
-                print(f"  - No input classes found")
+    timings = []
+    cache = ConvergedCache('standardize_inputs', TRANSFORM_VERSION) if use_cache else None
+
+    pending = [f for f in files if not (cache and cache.is_converged(f))]
+
+    # Compute every file first; nothing is written until all of them succeeded
+    transaction = FileTransaction()
+    for filepath, (changes, staged), seconds in process_files(_standardize_worker, pending, workers):
+        timings.append((filepath, seconds))
+        if changes > 0:
+            transaction.stage(filepath, *staged)
+            total_changes += changes
+            processed_files.append(filepath)
+            print(f"OK {filepath}: {changes} input/select/dropdown classes updated")
+
+    try:
+        transaction.commit()
+    except TransactionError as e:
+        print(f"\nERROR: {e}")
+        sys.exit(1)
+
+    if cache:
+        for filepath in pending:
+            cache.mark_converged(filepath)
+        cache.save()
+
+    print_slowest(timings)
 
     print(f"\n{'='*60}")
+    if len(pending) < len(files):
+        print(f"Skipped {len(files) - len(pending)} unchanged files (cache: {cache.path})")
     print(f"SUMMARY: Updated {total_changes} input classes across {len(processed_files)} files")
     print(f"{'='*60}")
 
 if __name__ == '__main__':
-    main()
+    main(use_cache='--no-cache' not in sys.argv[1:])
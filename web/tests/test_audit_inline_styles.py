@@ -0,0 +1,38 @@
+import json
+import sys
+
+from audit_inline_styles import main, scan_source
+
+
+def test_scan_source_handles_nested_and_multiline_objects():
+    text = (
+        'const a = <div style={{ color: "red", margin: 0 }} />;\n'
+        'const b = <div\n'
+        '  style={{\n'
+        '    ...base,\n'
+        '    "font-size": 12, // trailing } comment\n'
+        '    [key]: `${x}}`,\n'
+        '    transform: fn({ a: 1 }),\n'
+        '  }}\n'
+        '/>;\n'
+    )
+    assert list(scan_source(text)) == [
+        (1, 'const a = <div style={{ color: "red", margin: 0 }} />;', ['color', 'margin']),
+        (3, 'style={{', ['...', 'font-size', '[computed]', 'transform']),
+    ]
+
+
+def test_output_is_a_list_of_matches_unless_summary(tmp_path, monkeypatch):
+    (tmp_path / 'Card.tsx').write_text('export const C = () => <p style={{ gap: 4 }} />;\n', encoding='utf-8')
+
+    def run(*args):
+        output = tmp_path / 'out.json'
+        argv = ['audit_inline_styles.py', str(tmp_path), '-o', str(output), '--workers', '1', *args]
+        monkeypatch.setattr(sys, 'argv', argv)
+        main()
+        return json.loads(output.read_text(encoding='utf-8'))
+
+    matches = run()
+    assert [(m['line'], m['properties']) for m in matches] == [(1, ['gap'])]
+    summary = run('--summary')
+    assert summary['matches'] == matches and summary['property_counts'] == {'gap': 1}
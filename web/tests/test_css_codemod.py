@@ -0,0 +1,22 @@
+import pytest
+
+from css_codemod import Rule
+from css_scanner import scan_rules
+
+
+def rule(css, live_classes):
+    return Rule(next(scan_rules(css)), live_classes)
+
+
+@pytest.mark.parametrize('css, dead', [
+    ('.card:not(.hidden) { color: red; }', False),
+    ('.ghost:not(.card) { color: red; }', True),
+    ('.ghost, .card .title { color: red; }', False),
+    ('.card .ghost { color: red; }', True),
+])
+def test_dead_ignores_classes_inside_not(css, dead):
+    assert rule(css, {'card', 'title'}).dead is dead
+
+
+def test_no_usage_index_means_nothing_is_dead():
+    assert rule('.ghost { color: red; }', None).dead is False
@@ -0,0 +1,10 @@
+from css_discovery import find_sources
+
+
+def test_find_sources_includes_typescript(tmp_path):
+    for name in ('a.js', 'b.jsx', 'c.ts', 'd.tsx', 'e.css', 'node_modules/f.js'):
+        path = tmp_path / name
+        path.parent.mkdir(exist_ok=True)
+        path.write_text('', encoding='utf-8')
+    found = [path.rsplit('/', 1)[-1] for path in find_sources(str(tmp_path))]
+    assert found == ['a.js', 'b.jsx', 'c.ts', 'd.tsx']
@@ -0,0 +1,93 @@
+import pytest
+
+from css_scanner import (
+    required_classes, rewrite_rules, scan_rules, selector_classes, split_selectors,
+    subject_classes,
+)
+
+
+def test_rules_with_selectors_bodies_and_context():
+    css = (
+        '/* .commented { } */\n'
+        '@import "x.css";\n'
+        '.a, .b > .c { color: red; }\n'
+        '@media (min-width: 600px) {\n'
+        '  @supports (gap: 1px) { .d:hover { gap: 4px; } }\n'
+        '}\n'
+    )
+    rules = list(scan_rules(css))
+    assert [r.selectors for r in rules] == [['.a', '.b > .c'], ['.d:hover']]
+    assert rules[0].body == ' color: red; '
+    assert rules[1].context == ('@media (min-width: 600px)', '@supports (gap: 1px)')
+    assert css[rules[1].start:rules[1].end] == rules[1].body
+
+
+def test_braces_in_strings_and_comments_are_skipped():
+    css = '.a { content: "}"; /* } */ background: url(\'a{b}.png\'); } .b { }'
+    assert [r.selectors for r in scan_rules(css)] == [['.a'], ['.b']]
+
+
+def test_nested_rules_stay_in_the_outer_block():
+    css = '.card { padding: 0; &:hover { color: red; } .title { margin: 0; } } .next {}'
+    rules = list(scan_rules(css))
+    assert [r.selectors for r in rules] == [['.card'], ['.next']]
+    assert '.title { margin: 0; }' in rules[0].body
+
+
+def test_unbalanced_input():
+    assert [r.selectors for r in scan_rules('} .a { x: 1; }')] == [['.a']]
+    assert list(scan_rules('.a { x: 1;')) == []
+
+
+def test_split_selectors_respects_parentheses():
+    assert split_selectors(' .a:is(.b, .c), .d[data-x="1,2"] ') == ['.a:is(.b, .c)', '.d[data-x="1,2"]']
+
+
+@pytest.mark.parametrize('selector, subject', [
+    ('.a .b.c:hover', ['b', 'c']),
+    ('.a > .b', ['b']),
+    ('.b:not(.c)', ['b']),
+    ('.b::placeholder', []),
+    ('.b:before', []),
+    ('.b[data-state="open"]', ['b']),
+])
+def test_subject_classes(selector, subject):
+    assert subject_classes(selector) == subject
+
+
+@pytest.mark.parametrize('selector, classes', [
+    ('.a .b.c:hover', ['a', 'b', 'c']),
+    (':global(.theme-dark) .card', ['card']),
+    ('.card[data-x=".y"]', ['card']),
+    ('.wrap:not(.disabled)', ['wrap', 'disabled']),
+])
+def test_selector_classes(selector, classes):
+    assert selector_classes(selector) == classes
+
+
+@pytest.mark.parametrize('selector, classes', [
+    ('.wrap:not(.disabled)', ['wrap']),
+    ('.a:not(.b, :is(.c)) .d', ['a', 'd']),
+    (':global(.theme-dark) .card:NOT(.hidden)', ['card']),
+])
+def test_required_classes_skip_not(selector, classes):
+    assert required_classes(selector) == classes
+
+
+def test_rule_classes_and_find_class():
+    rule = next(scan_rules('.x .btnPrimary, .x .btnPrimary:hover, .icon::after { }'))
+    assert rule.classes == ['btnPrimary']
+    assert rule.find_class(lambda name: name.startswith('btn')) == 'btnPrimary'
+    assert rule.find_class(lambda name: name == 'x') is None
+
+
+def test_rewrite_rules_splices_changed_bodies_only():
+    css = '.a { padding: 8px; }\n@media print { .b { padding: 8px; } }\n.c { margin: 0; }\n'
+
+    def rewrite(rule):
+        return rule.body.replace('8px', '4px') if 'padding' in rule.body else None
+
+    new_css, changed = rewrite_rules(css, rewrite)
+    assert new_css == '.a { padding: 4px; }\n@media print { .b { padding: 4px; } }\n.c { margin: 0; }\n'
+    assert [r.selectors for r in changed] == [['.a'], ['.b']]
+    assert rewrite_rules(css, lambda rule: None) == (css, [])
@@ -0,0 +1,65 @@
+import textwrap
+
+from css_usage import build_index, dead_report
+
+
+def write(root, relpath, text):
+    path = root / relpath
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(textwrap.dedent(text), encoding='utf-8')
+
+
+def dead_classes(index):
+    return {(d['file'].rsplit('/', 1)[-1], d['class']) for d in dead_report(index)}
+
+
+def test_member_and_literal_key_uses(tmp_path):
+    write(tmp_path, 'Card.module.css', '.card { padding: 8px; } .title {} .unused { color: red; }')
+    write(tmp_path, 'Card.jsx', '''
+        import styles from './Card.module.css';
+        export const Card = () => <div className={styles.card}><h2 className={styles['title']} /></div>;
+    ''')
+    index = build_index(str(tmp_path))
+    assert dead_classes(index) == {('Card.module.css', 'unused')}
+
+
+def test_dynamic_prefix_keeps_matching_classes(tmp_path):
+    write(tmp_path, 'Grid.module.css', '.grid-2 {} .grid-3 {} .other {}')
+    write(tmp_path, 'Grid.tsx', '''
+        import s from './Grid.module.css';
+        export const Grid = ({ n }) => <div className={s[`grid-${n}`]} />;
+    ''')
+    assert dead_classes(build_index(str(tmp_path))) == {('Grid.module.css', 'other')}
+
+
+def test_composes_from_other_module_credits_that_module(tmp_path):
+    write(tmp_path, 'shared/Base.module.css', '.base { padding: 8px; } .spare {}')
+    write(tmp_path, 'components/Button.module.css', '''
+        .button { composes: base from '../shared/Base.module.css'; }
+        .local { composes: text from global; }
+    ''')
+    write(tmp_path, 'components/Button.jsx', '''
+        import styles from './Button.module.css';
+        export const Button = () => <button className={styles.button} />;
+    ''')
+    index = build_index(str(tmp_path))
+    assert 'base' in index[f'{tmp_path}/shared/Base.module.css'.replace('\\', '/')].composed
+    # Button.module.css itself doesn't gain a `base` class use
+    assert 'base' not in index[f'{tmp_path}/components/Button.module.css'.replace('\\', '/')].composed
+    assert dead_classes(index) == {('Base.module.css', 'spare'), ('Button.module.css', 'local')}
+
+
+def test_not_argument_is_not_a_definition(tmp_path):
+    write(tmp_path, 'Toggle.module.css', '''
+        .toggle { padding: 8px; }
+        .toggle:hover:not(.disabled) { background: #eee; }
+    ''')
+    write(tmp_path, 'Toggle.jsx', '''
+        import styles from './Toggle.module.css';
+        export const Toggle = () => <button className={styles.toggle} />;
+    ''')
+    index = build_index(str(tmp_path))
+    module = next(iter(index.values()))
+    assert 'disabled' not in module.classes
+    assert module.dead_rules() == []
+    assert dead_classes(index) == set()
@@ -0,0 +1,63 @@
+import os
+import sys
+
+import pytest
+
+import css_watch
+from css_watch import IN_Q_OVERFLOW, InotifyWatcher, PollingWatcher, open_watcher
+
+
+@pytest.fixture
+def tree(tmp_path, monkeypatch):
+    """A web/-shaped directory with one doctrine file and one excluded file"""
+    monkeypatch.chdir(tmp_path)
+    for rel in ('src/pages', 'src/components/common/ui'):
+        os.makedirs(rel)
+    for rel in ('src/pages/Home.module.css', 'src/components/common/ui/Button.module.css'):
+        with open(rel, 'w', encoding='utf-8') as f:
+            f.write('a {}')
+    return tmp_path
+
+
+def touch(path, content):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+
+
+def test_open_watcher_polls_the_given_root(tree):
+    watcher = open_watcher('src', force_poll=True)
+    assert isinstance(watcher, PollingWatcher)
+    assert watcher.root == 'src'
+    assert set(watcher.seen) == {os.path.join('src', 'pages', 'Home.module.css')}
+
+
+def test_polling_watcher_reports_doctrine_changes_only(tree):
+    watcher = PollingWatcher('src', interval=0.01)
+    touch('src/pages/Home.module.css', 'a { color: red; }')
+    touch('src/components/common/ui/Button.module.css', 'b {}')
+    touch('src/pages/New.module.css', 'c {}')
+    assert watcher.wait(timeout=0.05) == {
+        os.path.join('src', 'pages', 'Home.module.css'),
+        os.path.join('src', 'pages', 'New.module.css'),
+    }
+    assert watcher.wait(timeout=0.02) == set()
+
+
+@pytest.mark.skipif(not sys.platform.startswith('linux'), reason="inotify is Linux-only")
+def test_queue_overflow_rescans_the_tree(tree, monkeypatch):
+    watcher = InotifyWatcher('src')
+    try:
+        # Directory created while events were being dropped: no watch yet
+        os.makedirs('src/styles')
+        touch('src/styles/theme.module.css', 'd {}')
+        overflow = css_watch._EVENT_HEADER.pack(-1, IN_Q_OVERFLOW, 0, 0)
+        monkeypatch.setattr(css_watch.select, 'select', lambda r, w, x, timeout: (r, w, x))
+        monkeypatch.setattr(css_watch.os, 'read', lambda fd, size: overflow)
+        changed = watcher.wait(timeout=0)
+        monkeypatch.undo()
+
+        assert os.path.join('src', 'pages', 'Home.module.css') in changed
+        assert os.path.join('src', 'styles', 'theme.module.css') in changed
+        assert os.path.join('src', 'styles') in watcher.dirs.values()
+    finally:
+        watcher.close()
@@ -0,0 +1,104 @@
+import os
+import stat
+
+import pytest
+
+import file_transaction
+import standardize_all_buttons
+import standardize_inputs
+from file_transaction import FileTransaction, TransactionError, read_snapshot, write_atomic
+
+
+def make(tmp_path, name, content):
+    path = tmp_path / name
+    path.write_text(content, encoding='utf-8')
+    return str(path)
+
+
+def test_commit_writes_every_file(tmp_path):
+    a, b = make(tmp_path, 'a.css', 'a {}'), make(tmp_path, 'b.css', 'b {}')
+    with FileTransaction() as tx:
+        for path in (a, b):
+            content, snapshot = read_snapshot(path)
+            tx.stage(path, content.upper(), snapshot)
+    assert open(a).read() == 'A {}' and open(b).read() == 'B {}'
+    assert sorted(os.listdir(tmp_path)) == ['a.css', 'b.css']
+
+
+def test_change_after_read_refuses_commit(tmp_path):
+    path = make(tmp_path, 'a.css', 'a {}')
+    content, snapshot = read_snapshot(path)
+    # Someone saves the file while the worker is still transforming it
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('\n.b { color: red; }')
+
+    tx = FileTransaction()
+    tx.stage(path, content.upper(), snapshot)
+    with pytest.raises(TransactionError, match='changed since it was read'):
+        tx.commit()
+    assert open(path).read() == 'a {}\n.b { color: red; }'
+
+
+def test_failed_rename_rolls_back(tmp_path, monkeypatch):
+    a, b = make(tmp_path, 'a.css', 'a {}'), make(tmp_path, 'b.css', 'b {}')
+    tx = FileTransaction()
+    tx.stage(a, 'new a')
+    tx.stage(b, 'new b')
+
+    real_replace = os.replace
+    def replace(src, dst):
+        if dst == os.path.realpath(b):
+            raise OSError('disk full')
+        real_replace(src, dst)
+    monkeypatch.setattr(file_transaction.os, 'replace', replace)
+
+    with pytest.raises(TransactionError, match='rolled back'):
+        tx.commit()
+    monkeypatch.undo()
+    assert open(a).read() == 'a {}' and open(b).read() == 'b {}'
+    assert sorted(os.listdir(tmp_path)) == ['a.css', 'b.css']
+
+
+def test_keeps_mode_and_symlinks(tmp_path):
+    target = make(tmp_path, 'real.css', 'a {}')
+    os.chmod(target, 0o640)
+    link = tmp_path / 'link.css'
+    link.symlink_to(target)
+
+    with FileTransaction() as tx:
+        tx.stage(str(link), 'b {}')
+    assert link.is_symlink()
+    assert open(target).read() == 'b {}'
+    assert stat.S_IMODE(os.stat(target).st_mode) == 0o640
+
+    write_atomic(str(link), 'c {}')
+    assert link.is_symlink() and open(target).read() == 'c {}'
+    assert stat.S_IMODE(os.stat(target).st_mode) == 0o640
+
+
+def test_read_snapshot_normalizes_newlines(tmp_path):
+    path = tmp_path / 'a.css'
+    path.write_bytes(b'a {}\r\nb {}\r')
+    content, (original, _, size) = read_snapshot(str(path))
+    assert content == 'a {}\nb {}\n'
+    assert original == b'a {}\r\nb {}\r' and size == len(original)
+
+
+@pytest.mark.parametrize('standardize_file, css', [
+    (standardize_all_buttons.standardize_button_file, '.btnPrimary { padding: 4px; }'),
+    (standardize_inputs.standardize_input_file, '.searchInput { padding: 4px; }'),
+])
+def test_single_file_standardizers_write_through_a_transaction(tmp_path, monkeypatch, standardize_file, css):
+    path = make(tmp_path, 'a.module.css', css)
+
+    def replace(src, dst):
+        raise OSError('disk full')
+    monkeypatch.setattr(file_transaction.os, 'replace', replace)
+    with pytest.raises(TransactionError):
+        standardize_file(path, verbose=False)
+    monkeypatch.undo()
+    assert open(path).read() == css
+    assert os.listdir(tmp_path) == ['a.module.css']
+
+    assert standardize_file(path, verbose=False) == 1
+    assert open(path).read() != css
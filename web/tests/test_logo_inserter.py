@@ -0,0 +1,32 @@
+import fitz  # PyMuPDF
+
+import logo_inserter
+
+
+def test_image_logo_is_embedded_compressed(tmp_path):
+    logo_dir = tmp_path / "logos"
+    logo_dir.mkdir()
+    pix = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 1200, 800), False)
+    pix.set_rect(pix.irect, (255, 0, 0))
+    pix.save(str(logo_dir / "Acme Logo.png"))
+
+    pdf = tmp_path / "plan.pdf"
+    doc = fitz.open()
+    for _ in range(3):
+        doc.new_page(width=11 * 72, height=17 * 72)
+    doc.save(str(pdf))
+    doc.close()
+    size_before = pdf.stat().st_size
+
+    config = {"logo_dirs": [str(logo_dir)], "logo_cache_dir": str(tmp_path / "variants")}
+    assert logo_inserter.add_company_logo(str(pdf), "Acme", config=config) == str(pdf)
+
+    doc = fitz.open(str(pdf))
+    images = doc[0].get_images(full=True)
+    assert images
+    for xref, smask, *_ in images:
+        for image_xref in filter(None, (xref, smask)):
+            assert doc.xref_get_key(image_xref, "Filter")[0] == "name"
+    doc.close()
+    # A 1.3" logo at 300 dpi stored raw is ~480 KB (RGB + SMask)
+    assert pdf.stat().st_size - size_before < 100_000
@@ -0,0 +1,73 @@
+import asyncio
+import time
+
+import pytest
+
+from logo_inserter import METRICS
+from logo_service import LogoStampingService
+
+
+# Stamp functions run in worker processes, so they live at module level
+
+def fake_stamp(pdf_path, client, modify_inplace=True, config=None):
+    if client == "hang":
+        time.sleep(60)
+    with open(pdf_path, "ab") as f:
+        f.write(b"%stamped\n")
+    METRICS.record_document({"client": client, "pdf": pdf_path, "pages": 1,
+                             "seconds": 0.0, "bytes_in": 9, "bytes_out": 18})
+    return pdf_path
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_stamps_in_place_and_merges_worker_metrics(tmp_path):
+    pdf = tmp_path / "plan.pdf"
+    pdf.write_bytes(b"%PDF-1.7\n")
+
+    async def main():
+        async with LogoStampingService({"max_workers": 1}, stamp_fn=fake_stamp) as service:
+            result = await service.stamp(str(pdf), "acme")
+            return result, service.stats()
+
+    result, stats = run(main())
+    assert result == str(pdf)
+    assert pdf.read_bytes() == b"%PDF-1.7\n%stamped\n"
+    assert stats["completed"] == 1
+    assert stats["stamp"]["documents"] == 1
+    assert list(tmp_path.iterdir()) == [pdf]
+
+
+def test_timeout_kills_job_and_frees_slot(tmp_path):
+    hung = tmp_path / "hung.pdf"
+    hung.write_bytes(b"%PDF-1.7\n")
+    ok = tmp_path / "ok.pdf"
+    ok.write_bytes(b"%PDF-1.7\n")
+
+    async def main():
+        config = {"max_workers": 1, "job_timeout": 1.0}
+        async with LogoStampingService(config, stamp_fn=fake_stamp) as service:
+            first = await service.stamp(str(hung), "hang")
+            start = time.perf_counter()
+            second = await service.stamp(str(ok), "acme")
+            return first, second, time.perf_counter() - start, service.stats()
+
+    first, second, elapsed, stats = run(main())
+    assert first == str(hung)
+    assert hung.read_bytes() == b"%PDF-1.7\n"
+    assert ok.read_bytes().endswith(b"%stamped\n")
+    # The killed worker doesn't hold the next job up for the rest of its sleep
+    assert elapsed < 30
+    assert stats["timed_out"] == 1 and stats["completed"] == 1 and stats["in_flight"] == 0
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["hung.pdf", "ok.pdf"]
+
+
+def test_unpicklable_page_filter_is_rejected(tmp_path):
+    async def main():
+        async with LogoStampingService({"max_workers": 1}, stamp_fn=fake_stamp) as service:
+            await service.stamp(str(tmp_path / "plan.pdf"), "acme", {"page_filter": lambda page: True})
+
+    with pytest.raises(TypeError, match="module-level function"):
+        run(main())
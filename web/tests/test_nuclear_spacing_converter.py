@@ -0,0 +1,54 @@
+import pytest
+
+from nuclear_spacing_converter import convert_css, convert_value
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('16px', 'var(--spacing)'),
+    ('8px 16px', 'var(--spacing) var(--spacing)'),
+    ('0 auto 1rem auto', '0 auto var(--spacing) auto'),
+    ('-8px', 'calc(var(--spacing) * -1)'),
+    ('8px !important', 'var(--spacing) !important'),
+    ('7px', '7px'),
+    # Spacing tokens, with or without a fallback, are the one token
+    ('var(--spacing-tight)', 'var(--spacing)'),
+    ('var(--spacing, 16px)', 'var(--spacing)'),
+    ('var(--spacing-tight, 0.5rem) var(--spacing, 1rem)', 'var(--spacing) var(--spacing)'),
+    # Other vars keep their name; only the fallback is converted
+    ('var(--spacing-sm, 8px)', 'var(--spacing-sm, var(--spacing))'),
+    ('var(--header-height)', 'var(--header-height)'),
+    # Math: spacing tokens renamed, literal offsets kept
+    ('calc(var(--spacing-tight) + 8px)', 'calc(var(--spacing) + 8px)'),
+    ('calc(-1 * var(--spacing-xs))', 'calc(-1 * var(--spacing))'),
+    ('calc(100% - 16px)', 'calc(100% - 16px)'),
+    ('max(8px, var(--gutter))', 'max(8px, var(--gutter))'),
+    # env() is sized by the device, not the spacing scale
+    ('env(titlebar-area-height, 40px)', 'env(titlebar-area-height, 40px)'),
+    ('env(safe-area-inset-top, 16px) 8px', 'env(safe-area-inset-top, 16px) var(--spacing)'),
+    # Unbalanced parentheses are left alone
+    ('calc(8px + 2px', 'calc(8px + 2px'),
+])
+def test_convert_value(value, expected):
+    assert convert_value(value) == expected
+
+
+def test_convert_css_only_touches_spacing_properties():
+    css = (
+        '.a { padding: 8px 16px; width: 16px; }\n'
+        '.b {\n  margin-top: -4px;\n  gap: 6px 16px;\n  border-width: 1px;\n}\n'
+        '@media (min-width: 600px) { .c { padding-left: 1rem !important; } }\n'
+    )
+    new_css, changes = convert_css(css)
+    assert new_css == (
+        '.a { padding: var(--spacing) var(--spacing); width: 16px; }\n'
+        '.b {\n  margin-top: calc(var(--spacing) * -1);\n  gap: var(--spacing) var(--spacing);\n'
+        '  border-width: 1px;\n}\n'
+        '@media (min-width: 600px) { .c { padding-left: var(--spacing) !important; } }\n'
+    )
+    assert changes == {'padding': 1, 'margin-top': 1, 'gap': 1, 'padding-left': 1}
+
+
+def test_converted_css_is_a_fixed_point():
+    css = '.a { padding: calc(var(--spacing-tight) + 8px) var(--spacing, 1rem); margin: -2px 0; }'
+    once, _ = convert_css(css)
+    assert convert_css(once) == (once, {})